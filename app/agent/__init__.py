@@ -1,12 +1,48 @@
-from app.agent.base import BaseAgent
-from app.agent.browser import BrowserAgent
-from app.agent.mcp import MCPAgent
-from app.agent.react import ReActAgent
-from app.agent.base_snowflake import BaseSnowflakeAgent
-from app.agent.org_authority import OrgAuthorityAgent
-from app.agent.person_authority import PersonAuthorityAgent
-from app.agent.swe import SWEAgent
-from app.agent.toolcall import ToolCallAgent
+"""Agent package.
+
+Agents are imported on first access (PEP 562), so using one agent does not
+load the tools and clients of all the others.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from app.agent.base import BaseAgent
+    from app.agent.base_snowflake import BaseSnowflakeAgent
+    from app.agent.browser import BrowserAgent
+    from app.agent.mcp import MCPAgent
+    from app.agent.org_authority import OrgAuthorityAgent
+    from app.agent.person_authority import PersonAuthorityAgent
+    from app.agent.react import ReActAgent
+    from app.agent.swe import SWEAgent
+    from app.agent.toolcall import ToolCallAgent
+
+
+_LAZY_IMPORTS = {
+    "BaseAgent": "app.agent.base",
+    "BrowserAgent": "app.agent.browser",
+    "MCPAgent": "app.agent.mcp",
+    "ReActAgent": "app.agent.react",
+    "BaseSnowflakeAgent": "app.agent.base_snowflake",
+    "OrgAuthorityAgent": "app.agent.org_authority",
+    "PersonAuthorityAgent": "app.agent.person_authority",
+    "SWEAgent": "app.agent.swe",
+    "ToolCallAgent": "app.agent.toolcall",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
 
 
 __all__ = [
@@ -193,4 +193,8 @@ class BaseAgent(BaseModel, ABC):
     @messages.setter
     def messages(self, value: List[Message]):
         """Set the list of messages in the agent's memory."""
-        self.memory.messages = value
+        # `self.messages += [...]` extends the list in place and assigns it back,
+        # which keeps the token counts valid
+        if value is not self.memory.messages:
+            self.memory.messages = value
+            self.memory.invalidate_token_counts()
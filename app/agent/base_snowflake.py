@@ -1,28 +1,92 @@
-from typing import Any, Dict, Optional
-import snowflake.connector
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from .base import BaseAgent
 from ..llm import LLM
 from ..config import Config
 from ..logger import logger
 import re
 
+if TYPE_CHECKING:
+    # The warehouse package loads pyarrow and sqlglot, so it is imported only
+    # once an agent is built, keeping start-up of the tool registry cheap
+    from ..warehouse import QueryBackend
+
 
 class BaseSnowflakeAgent(BaseAgent):
     """Base agent for interacting with Snowflake database using LLM for text-to-SQL conversion."""
 
-    def __init__(self, config: Config, name: str, description: str, schema_prompt: str):
+    def __init__(
+        self,
+        config: Config,
+        name: str,
+        description: str,
+        schema_prompt: str,
+        pinned_tables: Optional[List[str]] = None,
+    ):
         super().__init__(
             name=name,
             description=description,
         )
+        from ..warehouse import ResultCache, SchemaCatalog, SQLCache, SQLValidator
+        from ..warehouse.sql_cache import schema_hash
+
         logger.info(f"Initializing {name}")
         self.llm = LLM(config_name="snowflake")
-        self.conn = None
+        # Where queries run: a shared Snowflake pool, or a local stand-in
+        self.backend: Optional["QueryBackend"] = None
         self.config = config
         self.schema_prompt = schema_prompt
+        self.schema_hash = schema_hash(schema_prompt)
+        # Tables in pinned_tables are sent with every pruned schema prompt
+        self.catalog = SchemaCatalog.from_prompt(schema_prompt, pinned_tables)
+        self.validator = SQLValidator(self.catalog)
+        self.sql_cache: Optional[SQLCache] = None
+        self.result_cache: Optional[ResultCache] = None
+        warehouse_config = config.warehouse_config
+        cache_dir = config.workspace_root / (
+            warehouse_config.cache_dir if warehouse_config else ".cache"
+        )
+        if warehouse_config and warehouse_config.sql_cache_enabled:
+            self.sql_cache = SQLCache.get_instance(
+                cache_dir / "sql_cache.db",
+                ttl=warehouse_config.sql_cache_ttl,
+                similarity=warehouse_config.sql_cache_similarity,
+            )
+        if warehouse_config and warehouse_config.result_cache_enabled:
+            self.result_cache = ResultCache.get_instance(
+                cache_dir / "results",
+                ttl=warehouse_config.result_cache_ttl,
+                max_entries=warehouse_config.result_cache_max_entries,
+                max_bytes=warehouse_config.result_cache_max_bytes,
+            )
+
+    @property
+    def agent_type(self) -> str:
+        """Agent type ('org' or 'person'), taken from the agent name."""
+        return self.name.split("_")[0]
 
     async def connect(self, connection_params: Optional[Dict[str, Any]] = None) -> None:
-        """Establish connection to Snowflake database."""
+        """Attach to the shared connection pool of this agent's Snowflake profile.
+
+        With ``backend = "duckdb"`` in the warehouse settings, queries run on a
+        local DuckDB database built from the schema prompt instead.
+        """
+        from ..warehouse import DuckDBBackend, SnowflakeConnectionPool
+
+        warehouse_config = self.config.warehouse_config
+        if (
+            not connection_params
+            and warehouse_config
+            and warehouse_config.backend == "duckdb"
+        ):
+            self.backend = DuckDBBackend.get_backend(
+                self.catalog,
+                name=self.agent_type,
+                rows_per_table=warehouse_config.duckdb_rows_per_table,
+            )
+            logger.info(f"Using local DuckDB backend for {self.agent_type} agent")
+            return
+
         if not connection_params and not self.config.snowflake_config:
             logger.error("No Snowflake configuration found in config.toml")
             raise Exception(
@@ -30,12 +94,11 @@ class BaseSnowflakeAgent(BaseAgent):
             )
 
         # Get the appropriate configuration based on agent type
-        agent_type = self.name.split("_")[
-            0
-        ]  # Extract 'org' or 'person' from agent name
-        snowflake_config = self.config.snowflake_config.get(
-            agent_type
-        ) or self.config.snowflake_config.get("default")
+        agent_type = self.agent_type
+        profile = (
+            agent_type if agent_type in self.config.snowflake_config else "default"
+        )
+        snowflake_config = self.config.snowflake_config.get(profile)
 
         if not snowflake_config:
             raise Exception(f"No Snowflake configuration found for {agent_type} agent")
@@ -51,17 +114,37 @@ class BaseSnowflakeAgent(BaseAgent):
 
         try:
             logger.info(f"Connecting to Snowflake account: {params['account']}")
-            self.conn = snowflake.connector.connect(**params)
+            pool = SnowflakeConnectionPool.get_pool(profile, params, snowflake_config)
+            await pool.ping()
+            self.backend = pool
             logger.info("Successfully connected to Snowflake")
         except Exception as e:
             logger.error(f"Failed to connect to Snowflake: {str(e)}")
             raise
 
-    async def text_to_sql(self, text_query: str) -> str:
-        """Convert natural language query to SQL using LLM."""
+    async def text_to_sql(
+        self,
+        text_query: str,
+        use_cache: bool = True,
+        schema_question: Optional[str] = None,
+    ) -> str:
+        """Convert natural language query to SQL using LLM.
+
+        Questions answered before are served from the SQL cache without an
+        LLM round-trip, unless ``use_cache`` is False. The schema is pruned
+        against ``schema_question`` when given, else against ``text_query``.
+        """
         logger.info(f"Converting natural language to SQL: {text_query}")
+        if use_cache and self.sql_cache:
+            cached_sql = await asyncio.to_thread(
+                self.sql_cache.get, text_query, self.agent_type, self.schema_hash
+            )
+            if cached_sql:
+                logger.info(f"Using cached SQL query: {cached_sql}")
+                return cached_sql
+
         prompt = f"""
-{self.schema_prompt}
+{self.build_schema_prompt(schema_question or text_query)}
 
 
 #Query: {text_query}
@@ -80,45 +163,69 @@ class BaseSnowflakeAgent(BaseAgent):
         logger.info(f"Generated SQL query: {sql_query}")
         return sql_query
 
-    async def execute_query(self, sql_query: str, max_retries: int = 3) -> Any:
-        """Execute SQL query and return results."""
-        if not self.conn:
+    def build_schema_prompt(self, text_query: str) -> str:
+        """Schema prompt for a question, pruned to its relevant tables and examples."""
+        warehouse_config = self.config.warehouse_config
+        if not warehouse_config or not warehouse_config.schema_pruning:
+            return self.schema_prompt
+        prompt = self.catalog.build_prompt(
+            text_query,
+            top_k_tables=warehouse_config.schema_top_k_tables,
+            top_k_examples=warehouse_config.schema_top_k_examples,
+        )
+        logger.info(
+            f"Schema prompt pruned to {len(prompt)} of {len(self.schema_prompt)} characters"
+        )
+        return prompt
+
+    async def execute_query(
+        self,
+        sql_query: str,
+        max_retries: int = 3,
+        use_cache: bool = True,
+        question: Optional[str] = None,
+    ) -> Any:
+        """Execute SQL query and return results.
+
+        Results of recently executed queries are served from the result cache
+        unless ``use_cache`` is False; fresh results always refresh the cache.
+        Every statement is validated locally first, so broken SQL is repaired
+        without a warehouse round trip and writes are refused. Repairs see the
+        schema pruned for ``question``, or for the failing SQL without one.
+        """
+        from ..warehouse import SQLValidationError
+
+        if not self.backend:
             logger.warning("Not connected to Snowflake, attempting to connect")
             await self.connect()
 
-        # Check for DML/DDL commands
-        ddl_dml_commands = [
-            "CREATE ",
-            "ALTER ",
-            "DROP ",
-            "TRUNCATE ",
-            "INSERT ",
-            "DELETE ",
-            "UPDATE ",
-        ]
-        if any(command in sql_query.upper() for command in ddl_dml_commands):
-            error_msg = "SQL statement is a DDL/DML which may modify database schema, so we will not be executing the statement at this time"
-            logger.error(error_msg)
-            raise Exception(error_msg)
-
+        warehouse_config = self.config.warehouse_config
+        check_schema = bool(warehouse_config and warehouse_config.sql_validation)
         current_retry = 0
         while current_retry < max_retries:
             try:
+                self.validator.validate(sql_query, check_schema=check_schema)
+                if use_cache and self.result_cache:
+                    cached = await asyncio.to_thread(
+                        self.result_cache.get, self.backend.key, sql_query
+                    )
+                    if cached is not None:
+                        return cached
+
                 logger.info(
                     f"Executing SQL query (attempt {current_retry + 1}/{max_retries}): {sql_query}"
                 )
-                cursor = self.conn.cursor()
-                cursor.execute(sql_query)
-                results = cursor.fetchall()
-                columns = (
-                    [col[0] for col in cursor.description] if cursor.description else []
-                )
-                cursor.close()
+                results = await self.backend.execute(sql_query)
                 logger.info(
-                    f"Query executed successfully, returned {len(results)} rows"
+                    f"Query executed successfully, returned {results.total_rows} rows"
                 )
-                return {"columns": columns, "data": results}
+                if self.result_cache:
+                    await self._cache_result(results)
+                return results
             except Exception as e:
+                if isinstance(e, SQLValidationError) and e.fatal:
+                    logger.error(str(e))
+                    raise
                 current_retry += 1
                 error_msg = f"Failed to execute query (attempt {current_retry}/{max_retries}): {str(e)}"
                 logger.error(error_msg)
@@ -135,28 +242,49 @@ class BaseSnowflakeAgent(BaseAgent):
                     3. Ensure the query is valid Snowflake SQL
                     4. Wrap the response in ```sql ... ``` blocks
                     """
-                    new_sql = await self.text_to_sql(retry_prompt)
+                    # The retry prompt's wording would prune away the tables the
+                    # question needs, so prune against the question instead
+                    new_sql = await self.text_to_sql(
+                        retry_prompt,
+                        use_cache=False,
+                        schema_question=question or sql_query,
+                    )
                     sql_query = new_sql
                 else:
                     raise Exception(
                         f"Failed to execute query after {max_retries} attempts: {str(e)}"
                     )
 
-    async def process_query(self, text_query: str) -> Any:
+    async def _cache_result(self, results: Any) -> None:
+        try:
+            await asyncio.to_thread(self.result_cache.put, self.backend.key, results)
+        except Exception as e:
+            logger.warning(f"Failed to cache query result: {e}")
+
+    async def process_query(self, text_query: str, use_cache: bool = True) -> Any:
         """Process natural language query through text-to-SQL conversion and execution."""
         logger.info(f"Processing natural language query: {text_query}")
         sql_query = await self.text_to_sql(text_query)
-        results = await self.execute_query(sql_query)
+        cache_args = (text_query, self.agent_type, self.schema_hash)
+        try:
+            results = await self.execute_query(
+                sql_query, use_cache=use_cache, question=text_query
+            )
+        except Exception:
+            if self.sql_cache:
+                await asyncio.to_thread(self.sql_cache.invalidate, *cache_args)
+            raise
 
+        # Remember the SQL that finally worked, which may be a retried version
+        if self.sql_cache:
+            await asyncio.to_thread(self.sql_cache.put, *cache_args, results.sql)
         return results
 
     async def close(self) -> None:
-        """Close the Snowflake connection."""
-        if self.conn:
-            logger.info("Closing Snowflake connection")
-            self.conn.close()
-            self.conn = None
-            logger.info("Snowflake connection closed")
+        """Detach from the query backend, which stays open for other agents."""
+        if self.backend:
+            logger.info("Releasing query backend")
+            self.backend = None
 
     async def step(self) -> str:
         """Execute a single step in the agent's workflow."""
@@ -169,7 +297,7 @@ class BaseSnowflakeAgent(BaseAgent):
 
         try:
             # Ensure we're connected to Snowflake
-            if not self.conn:
+            if not self.backend:
                 logger.info("No active connection, attempting to connect")
                 await self.connect()
 
@@ -8,6 +8,7 @@ from app.logger import logger
 from app.prompt.browser import NEXT_STEP_PROMPT, SYSTEM_PROMPT
 from app.schema import Message, ToolChoice
 from app.tool import BrowserUseTool, Terminate, ToolCollection
+from app.tool.lazy import LazyTool
 
 
 # Avoid circular import if BrowserAgent needs BrowserContextHelper
@@ -20,8 +21,17 @@ class BrowserContextHelper:
         self.agent = agent
         self._current_base64_image: Optional[str] = None
 
+    def _get_browser_tool(self) -> Optional[BrowserUseTool]:
+        browser_tool = self.agent.available_tools.get_tool(
+            BrowserUseTool.model_fields["name"].default
+        )
+        # A lazily registered browser that was never used has no state yet
+        if isinstance(browser_tool, LazyTool):
+            return browser_tool.tool
+        return browser_tool
+
     async def get_browser_state(self) -> Optional[dict]:
-        browser_tool = self.agent.available_tools.get_tool(BrowserUseTool().name)
+        browser_tool = self._get_browser_tool()
         if not browser_tool or not hasattr(browser_tool, "get_current_state"):
             logger.warning("BrowserUseTool not found or doesn't have get_current_state")
             return None
@@ -74,7 +84,7 @@ class BrowserContextHelper:
         )
 
     async def cleanup_browser(self):
-        browser_tool = self.agent.available_tools.get_tool(BrowserUseTool().name)
+        browser_tool = self._get_browser_tool()
         if browser_tool and hasattr(browser_tool, "cleanup"):
             await browser_tool.cleanup()
 
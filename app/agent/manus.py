@@ -1,20 +1,22 @@
+import asyncio
 from typing import Dict, List, Optional
 
 from pydantic import Field, model_validator
 
 from app.agent.browser import BrowserContextHelper
 from app.agent.toolcall import ToolCallAgent
-from app.config import config
+from app.config import MCPServerConfig, config
 from app.logger import logger
 from app.prompt.manus import NEXT_STEP_PROMPT, SYSTEM_PROMPT
+from app.sandbox.client import SANDBOX_CLIENT
 from app.tool import Terminate, ToolCollection
 from app.tool.ask_human import AskHuman
 from app.tool.browser_use_tool import BrowserUseTool
+from app.tool.lazy import LazyTool
 from app.tool.mcp import MCPClients, MCPClientTool
 from app.tool.python_execute import PythonExecute
 from app.tool.snowflake_tool import SnowflakeTool
 from app.tool.str_replace_editor import StrReplaceEditor
-from app.tool.chart_visualization.data_visualization import DataVisualization
 from app.tool.planning import PlanningTool
 
 
@@ -35,14 +37,15 @@ class Manus(ToolCallAgent):
     # MCP clients for remote tool access
     mcp_clients: MCPClients = Field(default_factory=MCPClients)
 
-    # Add general-purpose tools to the tool collection
+    # Add general-purpose tools to the tool collection; heavy tools are only
+    # built when first called
     available_tools: ToolCollection = Field(
         default_factory=lambda: ToolCollection(
             PlanningTool(),
             # DataVisualization(),
-            SnowflakeTool(),
+            LazyTool.of(SnowflakeTool),
             PythonExecute(),
-            BrowserUseTool(),
+            LazyTool.of(BrowserUseTool),
             StrReplaceEditor(),
             AskHuman(),
             Terminate(),
@@ -68,33 +71,61 @@ class Manus(ToolCallAgent):
     async def create(cls, **kwargs) -> "Manus":
         """Factory method to create and properly initialize a Manus instance."""
         instance = cls(**kwargs)
+        if config.sandbox.use_sandbox:
+            # Warm sandboxes start while the MCP servers connect
+            await SANDBOX_CLIENT.start(config.sandbox)
         await instance.initialize_mcp_servers()
         instance._initialized = True
         return instance
 
     async def initialize_mcp_servers(self) -> None:
-        """Initialize connections to configured MCP servers."""
-        for server_id, server_config in config.mcp_config.servers.items():
-            try:
-                if server_config.type == "sse":
-                    if server_config.url:
-                        await self.connect_mcp_server(server_config.url, server_id)
-                        logger.info(
-                            f"Connected to MCP server {server_id} at {server_config.url}"
-                        )
-                elif server_config.type == "stdio":
-                    if server_config.command:
-                        await self.connect_mcp_server(
-                            server_config.command,
-                            server_id,
-                            use_stdio=True,
-                            stdio_args=server_config.args,
-                        )
-                        logger.info(
-                            f"Connected to MCP server {server_id} using command {server_config.command}"
-                        )
-            except Exception as e:
-                logger.error(f"Failed to connect to MCP server {server_id}: {e}")
+        """Initialize connections to configured MCP servers.
+
+        Servers are connected concurrently, each under its own timeout, and the
+        tools of a server are added as soon as it is ready. A server that fails
+        or times out is logged and skipped without holding up the others.
+        """
+        await asyncio.gather(
+            *(
+                self._connect_configured_server(server_id, server_config)
+                for server_id, server_config in config.mcp_config.servers.items()
+            )
+        )
+
+    async def _connect_configured_server(
+        self, server_id: str, server_config: MCPServerConfig
+    ) -> None:
+        """Connect to one configured MCP server, logging instead of raising."""
+        timeout = server_config.timeout
+        if timeout is None:
+            timeout = config.mcp_config.connect_timeout
+        try:
+            if server_config.type == "sse":
+                if server_config.url:
+                    await self.connect_mcp_server(
+                        server_config.url, server_id, timeout=timeout
+                    )
+                    logger.info(
+                        f"Connected to MCP server {server_id} at {server_config.url}"
+                    )
+            elif server_config.type == "stdio":
+                if server_config.command:
+                    await self.connect_mcp_server(
+                        server_config.command,
+                        server_id,
+                        use_stdio=True,
+                        stdio_args=server_config.args,
+                        timeout=timeout,
+                    )
+                    logger.info(
+                        f"Connected to MCP server {server_id} using command {server_config.command}"
+                    )
+        except asyncio.TimeoutError:
+            logger.error(
+                f"Timed out after {timeout}s connecting to MCP server {server_id}"
+            )
+        except Exception as e:
+            logger.error(f"Failed to connect to MCP server {server_id}: {e}")
 
     async def connect_mcp_server(
         self,
@@ -102,15 +133,16 @@ class Manus(ToolCallAgent):
         server_id: str = "",
         use_stdio: bool = False,
         stdio_args: List[str] = None,
+        timeout: Optional[float] = None,
     ) -> None:
         """Connect to an MCP server and add its tools."""
         if use_stdio:
             await self.mcp_clients.connect_stdio(
-                server_url, stdio_args or [], server_id
+                server_url, stdio_args or [], server_id, timeout=timeout
             )
             self.connected_servers[server_id or server_url] = server_url
         else:
-            await self.mcp_clients.connect_sse(server_url, server_id)
+            await self.mcp_clients.connect_sse(server_url, server_id, timeout=timeout)
             self.connected_servers[server_id or server_url] = server_url
 
         # Update available tools with only the new tools from this server
@@ -144,6 +176,8 @@ class Manus(ToolCallAgent):
         if self._initialized:
             await self.disconnect_mcp_server()
             self._initialized = False
+        if config.sandbox.use_sandbox:
+            await SANDBOX_CLIENT.shutdown()
 
     async def think(self) -> bool:
         """Process current state and decide next actions with appropriate context."""
@@ -154,7 +188,7 @@ class Manus(ToolCallAgent):
         original_prompt = self.next_step_prompt
         recent_messages = self.memory.messages[-3:] if self.memory.messages else []
         browser_in_use = any(
-            tc.function.name == BrowserUseTool().name
+            tc.function.name == BrowserUseTool.model_fields["name"].default
             for msg in recent_messages
             if msg.tool_calls
             for tc in msg.tool_calls
@@ -32,7 +32,7 @@ class MCPAgent(ToolCallAgent):
 
     # Track tool schemas to detect changes
     tool_schemas: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
-    _refresh_tools_interval: int = 5  # Refresh tools every N steps
+    _tools_digest: str = ""  # Digest of the listings behind tool_schemas
 
     # Special tool names that should trigger termination
     special_tool_names: List[str] = Field(default_factory=lambda: ["terminate"])
@@ -87,14 +87,21 @@ class MCPAgent(ToolCallAgent):
     async def _refresh_tools(self) -> Tuple[List[str], List[str]]:
         """Refresh the list of available tools from the MCP server.
 
+        Listings are cached by the MCP clients, so this only reaches a server
+        whose tools changed or whose cached listing expired.
+
         Returns:
             A tuple of (added_tools, removed_tools)
         """
         if not self.mcp_clients.sessions:
             return [], []
 
-        # Get current tool schemas directly from the server
         response = await self.mcp_clients.list_tools()
+        digest = self.mcp_clients.digest
+        if digest == self._tools_digest:
+            return [], []
+        self._tools_digest = digest
+
         current_tools = {tool.name: tool.inputSchema for tool in response.tools}
 
         # Determine added, removed, and changed tools
@@ -139,14 +146,13 @@ class MCPAgent(ToolCallAgent):
             self.state = AgentState.FINISHED
             return False
 
-        # Refresh tools periodically
-        if self.current_step % self._refresh_tools_interval == 0:
-            await self._refresh_tools()
-            # All tools removed indicates shutdown
-            if not self.mcp_clients.tool_map:
-                logger.info("MCP service has shut down, ending interaction")
-                self.state = AgentState.FINISHED
-                return False
+        # Pick up tool changes, free unless a listing changed or expired
+        await self._refresh_tools()
+        # All tools removed indicates shutdown
+        if not self.mcp_clients.tool_map:
+            logger.info("MCP service has shut down, ending interaction")
+            self.state = AgentState.FINISHED
+            return False
 
         # Use the parent class's think method
         return await super().think()
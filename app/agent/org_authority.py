@@ -439,4 +439,5 @@ DO NOT include chat history title in the beginning of response such as "DataMagi
             name="org_authority",
             description="Organization authority agent with text-to-SQL capabilities",
             schema_prompt=schema_prompt,
+            pinned_tables=["organization_name_latest"],
         )
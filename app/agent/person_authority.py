@@ -599,4 +599,5 @@ Now to get started please briefly introduce yourself. No need to sound like a ma
             name="person_authority",
             description="Person authority agent with text-to-SQL capabilities",
             schema_prompt=schema_prompt,
+            pinned_tables=["PERSON_NAME"],
         )
@@ -1,6 +1,6 @@
 import asyncio
 import json
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
 from pydantic import Field
 
@@ -36,11 +36,15 @@ class ToolCallAgent(ReActAgent):
     max_steps: int = 30
     max_observe: Optional[Union[int, bool]] = None
 
+    # Run consecutive parallel-safe tool calls of one turn concurrently
+    parallel_tool_calls: bool = False
+    max_parallel_tool_calls: int = 4
+
     async def think(self) -> bool:
         """Process current state and decide next actions using tools"""
         if self.next_step_prompt:
             user_msg = Message.user_message(self.next_step_prompt)
-            self.messages += [user_msg]
+            self.memory.add_message(user_msg)
 
         try:
             # Get response with tool options
@@ -53,6 +57,7 @@ class ToolCallAgent(ReActAgent):
                 ),
                 tools=self.available_tools.to_params(),
                 tool_choice=self.tool_choices,
+                token_cache=self.memory,
             )
         except ValueError:
             raise
@@ -137,40 +142,83 @@ class ToolCallAgent(ReActAgent):
             # Return last message content if no tool calls
             return self.messages[-1].content or "No content or commands to execute"
 
-        results = []
-        for command in self.tool_calls:
-            # Reset base64_image for each tool call
-            self._current_base64_image = None
+        semaphore = asyncio.Semaphore(max(1, self.max_parallel_tool_calls))
 
-            result = await self.execute_tool(command)
+        async def run_limited(command: ToolCall) -> Tuple[str, Optional[str]]:
+            async with semaphore:
+                return await self._execute_tool(command)
 
-            if self.max_observe:
-                result = result[: self.max_observe]
+        results = []
+        for batch in self._batch_tool_calls(self.tool_calls):
+            if len(batch) > 1:
+                logger.info(
+                    f"⚡ Running {len(batch)} tool calls concurrently: {[c.function.name for c in batch]}"
+                )
+                outcomes = await asyncio.gather(*(run_limited(c) for c in batch))
+            else:
+                outcomes = [await self._execute_tool(batch[0])]
 
-            logger.info(
-                f"🎯 Tool '{command.function.name}' completed its mission! Result: {result}"
-            )
+            # Record results in the original call order to keep the transcript deterministic
+            for command, (result, base64_image) in zip(batch, outcomes):
+                if self.max_observe:
+                    result = result[: self.max_observe]
 
-            # Add tool response to memory
-            tool_msg = Message.tool_message(
-                content=result,
-                tool_call_id=command.id,
-                name=command.function.name,
-                base64_image=self._current_base64_image,
-            )
-            self.memory.add_message(tool_msg)
-            results.append(result)
+                logger.info(
+                    f"🎯 Tool '{command.function.name}' completed its mission! Result: {result}"
+                )
+
+                # Add tool response to memory
+                tool_msg = Message.tool_message(
+                    content=result,
+                    tool_call_id=command.id,
+                    name=command.function.name,
+                    base64_image=base64_image,
+                )
+                self.memory.add_message(tool_msg)
+                results.append(result)
 
         return "\n\n".join(results)
 
+    def _batch_tool_calls(self, tool_calls: List[ToolCall]) -> List[List[ToolCall]]:
+        """Group consecutive parallel-safe calls; every other call runs on its own"""
+        if not self.parallel_tool_calls:
+            return [[command] for command in tool_calls]
+
+        batches: List[List[ToolCall]] = []
+        previous_safe = False
+        for command in tool_calls:
+            safe = self._is_parallel_safe(command)
+            if safe and previous_safe:
+                batches[-1].append(command)
+            else:
+                batches.append([command])
+            previous_safe = safe
+        return batches
+
+    def _is_parallel_safe(self, command: ToolCall) -> bool:
+        """Check if a tool call may run concurrently with other calls"""
+        name = command.function.name if command and command.function else None
+        tool = self.available_tools.get_tool(name) if name else None
+        return bool(
+            tool and tool.parallel_safe and not self._is_special_tool(tool.name)
+        )
+
     async def execute_tool(self, command: ToolCall) -> str:
         """Execute a single tool call with robust error handling"""
+        result, self._current_base64_image = await self._execute_tool(command)
+        return result
+
+    async def _execute_tool(self, command: ToolCall) -> Tuple[str, Optional[str]]:
+        """Execute a tool call and return its observation with any produced image.
+
+        Does not touch shared agent state, so calls can safely run concurrently.
+        """
         if not command or not command.function or not command.function.name:
-            return "Error: Invalid command format"
+            return "Error: Invalid command format", None
 
         name = command.function.name
         if name not in self.available_tools.tool_map:
-            return f"Error: Unknown tool '{name}'"
+            return f"Error: Unknown tool '{name}'", None
 
         try:
             # Parse arguments
@@ -184,9 +232,10 @@ class ToolCallAgent(ReActAgent):
             await self._handle_special_tool(name=name, result=result)
 
             # Check if result is a ToolResult with base64_image
+            base64_image = None
             if hasattr(result, "base64_image") and result.base64_image:
-                # Store the base64_image for later use in tool_message
-                self._current_base64_image = result.base64_image
+                # Keep the base64_image for later use in tool_message
+                base64_image = result.base64_image
 
             # Format result for display (standard case)
             observation = (
@@ -195,17 +244,17 @@ class ToolCallAgent(ReActAgent):
                 else f"Cmd `{name}` completed with no output"
             )
 
-            return observation
+            return observation, base64_image
         except json.JSONDecodeError:
             error_msg = f"Error parsing arguments for {name}: Invalid JSON format"
             logger.error(
                 f"📝 Oops! The arguments for '{name}' don't make sense - invalid JSON, arguments:{command.function.arguments}"
             )
-            return f"Error: {error_msg}"
+            return f"Error: {error_msg}", None
         except Exception as e:
             error_msg = f"⚠️ Tool '{name}' encountered a problem: {str(e)}"
             logger.exception(error_msg)
-            return f"Error: {error_msg}"
+            return f"Error: {error_msg}", None
 
     async def _handle_special_tool(self, name: str, result: Any, **kwargs):
         """Handle special tool execution and state changes"""
@@ -2,7 +2,7 @@ import json
 import threading
 import tomllib
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 from app.logger import logger
@@ -99,6 +99,74 @@ class SandboxSettings(BaseModel):
     network_enabled: bool = Field(
         False, description="Whether network access is allowed"
     )
+    pool_size: int = Field(
+        0, description="Number of pre-started containers kept warm by the manager"
+    )
+    pool_policy: Literal["reset", "destroy"] = Field(
+        "reset",
+        description="What happens to a pooled sandbox when it is deleted: "
+        "'reset' wipes work_dir and returns it to the pool, 'destroy' removes it",
+    )
+    templates: Dict[str, List[str]] = Field(
+        default_factory=dict,
+        description="Named environments: pip requirements baked once into a "
+        "cached image derived from the base image",
+    )
+    template: Optional[str] = Field(
+        None, description="Name of the template in templates that sandboxes start from"
+    )
+
+
+class PythonExecuteSettings(BaseModel):
+    """Configuration for the python_execute worker pool"""
+
+    pool_size: int = Field(2, description="Number of warm worker processes")
+    recycle_after: int = Field(
+        50, description="Replace a worker after it has run this many snippets"
+    )
+    preload_modules: List[str] = Field(
+        default_factory=lambda: ["numpy", "pandas"],
+        description="Modules imported once by the fork server and inherited by workers",
+    )
+    start_method: str = Field(
+        "forkserver", description="Multiprocessing start method for workers"
+    )
+    acquire_timeout: float = Field(
+        60.0, description="Seconds to wait for a free worker before giving up"
+    )
+    max_sessions: int = Field(
+        8, description="Maximum number of stateful sessions kept alive at once"
+    )
+    session_idle_timeout: int = Field(
+        1800, description="Close a stateful session after this many idle seconds"
+    )
+    session_memory_limit_mb: int = Field(
+        2048,
+        description="Reset a stateful session once its worker exceeds this memory (0 disables)",
+    )
+
+
+class BashSettings(BaseModel):
+    """Configuration for the bash tool's output capture"""
+
+    output_head_bytes: int = Field(
+        8192, description="Leading bytes of each output stream returned to the agent"
+    )
+    output_tail_bytes: int = Field(
+        8192, description="Trailing bytes of each output stream returned to the agent"
+    )
+    spill_to_file: bool = Field(
+        True, description="Write the full output of longer commands to the workspace"
+    )
+    spill_dir: str = Field(
+        "bash_output", description="Workspace subdirectory for full command output"
+    )
+    spill_max_files: int = Field(
+        50, description="Output files kept in spill_dir, oldest removed first"
+    )
+    spill_max_bytes: int = Field(
+        512 * 1024 * 1024, description="Total size of output files kept in spill_dir"
+    )
 
 
 class MCPServerConfig(BaseModel):
@@ -110,6 +178,13 @@ class MCPServerConfig(BaseModel):
     args: List[str] = Field(
         default_factory=list, description="Arguments for stdio command"
     )
+    timeout: Optional[float] = Field(
+        None, description="Connection timeout in seconds, overrides connect_timeout"
+    )
+    idempotent_tools: List[str] = Field(
+        default_factory=list,
+        description="Tools whose calls are retried after a reconnect",
+    )
 
 
 class MCPSettings(BaseModel):
@@ -118,6 +193,38 @@ class MCPSettings(BaseModel):
     server_reference: str = Field(
         "app.mcp.server", description="Module reference for the MCP server"
     )
+    connect_timeout: float = Field(
+        30.0, description="Seconds to wait for each MCP server handshake"
+    )
+    tool_list_ttl: float = Field(
+        300.0,
+        description="Seconds a cached tool listing is reused for servers that do not send tools/list_changed",
+    )
+    health_check_interval: float = Field(
+        30.0, description="Seconds between pings of a connected MCP server"
+    )
+    ping_timeout: float = Field(
+        10.0, description="Seconds a ping may take before the server is reconnected"
+    )
+    reconnect_delay: float = Field(
+        1.0, description="Delay before the first reconnect, doubled per attempt"
+    )
+    max_reconnect_delay: float = Field(
+        30.0, description="Upper bound of the reconnect delay"
+    )
+    max_reconnect_attempts: int = Field(
+        0, description="Reconnect attempts before giving up on a server (0 = no limit)"
+    )
+    max_clients: int = Field(
+        16, description="Clients the OpenManus MCP server keeps tool instances for"
+    )
+    client_idle_timeout: int = Field(
+        1800, description="Close a client's tool instances after this many idle seconds"
+    )
+    tool_concurrency: Dict[str, int] = Field(
+        default_factory=lambda: {"browser_use": 2},
+        description="Concurrent calls allowed per tool across all clients of the OpenManus MCP server",
+    )
     servers: Dict[str, MCPServerConfig] = Field(
         default_factory=dict, description="MCP server configurations"
     )
@@ -142,6 +249,8 @@ class MCPSettings(BaseModel):
                         url=server_config.get("url"),
                         command=server_config.get("command"),
                         args=server_config.get("args", []),
+                        timeout=server_config.get("timeout"),
+                        idempotent_tools=server_config.get("idempotentTools", []),
                     )
                 return servers
         except Exception as e:
@@ -157,6 +266,87 @@ class SnowflakeSettings(BaseModel):
     warehouse: str = Field(..., description="Snowflake warehouse name")
     database: str = Field(..., description="Snowflake database name")
     schema: str = Field(..., description="Snowflake schema name")
+    pool_size: int = Field(4, description="Maximum open connections for this profile")
+    health_check_interval: int = Field(
+        300, description="Idle seconds after which a connection is checked before reuse"
+    )
+    pool_timeout: float = Field(
+        60, description="Seconds to wait for a free connection before failing"
+    )
+
+
+class WarehouseSettings(BaseModel):
+    """Configuration for warehouse query results"""
+
+    max_rows: int = Field(
+        1_000_000, description="Stop fetching a query result after this many rows"
+    )
+    max_memory_bytes: int = Field(
+        64 * 1024 * 1024,
+        description="Rows of a result kept in memory; the rest only go to Parquet",
+    )
+    summary_rows: int = Field(
+        10, description="Sample rows shown to the LLM in a result summary"
+    )
+    spill_to_parquet: bool = Field(
+        True,
+        description="Write results that outgrow max_memory_bytes to Parquet files in the workspace",
+    )
+    spill_dir: str = Field(
+        "query_results", description="Workspace subdirectory for Parquet results"
+    )
+    spill_max_files: int = Field(
+        20, description="Parquet results kept in spill_dir, oldest removed first"
+    )
+    spill_max_bytes: int = Field(
+        2 * 1024 * 1024 * 1024,
+        description="Total size of Parquet results kept in spill_dir",
+    )
+    cache_dir: str = Field(
+        ".cache", description="Workspace subdirectory for warehouse caches"
+    )
+    sql_cache_enabled: bool = Field(
+        True, description="Reuse SQL generated for previously asked questions"
+    )
+    sql_cache_ttl: int = Field(
+        7 * 24 * 3600, description="Seconds a cached question→SQL entry stays valid"
+    )
+    sql_cache_similarity: float = Field(
+        1.0,
+        description="Token-set similarity needed for a fuzzy cache hit (1 disables fuzzy matching)",
+    )
+    schema_pruning: bool = Field(
+        True, description="Send only the tables and examples relevant to a question"
+    )
+    schema_top_k_tables: int = Field(
+        6, description="Tables picked per question when pruning the schema prompt"
+    )
+    schema_top_k_examples: int = Field(
+        1, description="Example queries picked per question when pruning"
+    )
+    sql_validation: bool = Field(
+        True,
+        description="Check tables and columns of generated SQL against the schema before running it",
+    )
+    result_cache_enabled: bool = Field(
+        True, description="Reuse results of recently executed queries"
+    )
+    result_cache_ttl: int = Field(
+        3600, description="Seconds a cached query result stays valid"
+    )
+    result_cache_max_entries: int = Field(
+        256, description="Maximum number of cached query results"
+    )
+    result_cache_max_bytes: int = Field(
+        512 * 1024 * 1024, description="Maximum disk size of cached query results"
+    )
+    backend: str = Field(
+        "snowflake",
+        description="Where queries run: 'snowflake', or 'duckdb' for a local stand-in with synthetic data",
+    )
+    duckdb_rows_per_table: int = Field(
+        1000, description="Synthetic rows loaded into each table of the DuckDB backend"
+    )
 
 
 class AppConfig(BaseModel):
@@ -171,9 +361,18 @@ class AppConfig(BaseModel):
         None, description="Search configuration"
     )
     mcp_config: Optional[MCPSettings] = Field(None, description="MCP configuration")
+    python_execute_config: Optional[PythonExecuteSettings] = Field(
+        None, description="Python execution worker pool configuration"
+    )
+    bash_config: Optional[BashSettings] = Field(
+        None, description="Bash tool output configuration"
+    )
     snowflake_config: Optional[Dict[str, SnowflakeSettings]] = Field(
         None, description="Snowflake configurations for different agents"
     )
+    warehouse_config: Optional[WarehouseSettings] = Field(
+        None, description="Warehouse query result configuration"
+    )
 
     class Config:
         arbitrary_types_allowed = True
@@ -245,7 +444,26 @@ class Config:
             search_settings = SearchSettings(**raw_config["search"])
 
         # Load MCP settings
-        mcp_settings = MCPSettings(servers=MCPSettings.load_server_config())
+        mcp_config = raw_config.get("mcp", {})
+        if not isinstance(mcp_config, dict):
+            mcp_config = {}
+        mcp_settings = MCPSettings(
+            **{**mcp_config, "servers": MCPSettings.load_server_config()}
+        )
+
+        # Load python_execute worker pool settings
+        python_execute_settings = PythonExecuteSettings()
+        if "python_execute" in raw_config and isinstance(
+            raw_config["python_execute"], dict
+        ):
+            python_execute_settings = PythonExecuteSettings(
+                **raw_config["python_execute"]
+            )
+
+        # Load bash tool settings
+        bash_settings = BashSettings()
+        if "bash" in raw_config and isinstance(raw_config["bash"], dict):
+            bash_settings = BashSettings(**raw_config["bash"])
 
         # Load Snowflake settings
         snowflake_settings = {}
@@ -259,19 +477,37 @@ class Config:
                             snowflake_settings[agent_type] = SnowflakeSettings(
                                 **settings
                             )
+                    # Top-level keys next to the profiles form the default profile
+                    default_settings = {
+                        key: value
+                        for key, value in raw_config["snowflake"].items()
+                        if not isinstance(value, dict)
+                    }
+                    if "account" in default_settings:
+                        snowflake_settings["default"] = SnowflakeSettings(
+                            **default_settings
+                        )
                 else:
                     # Old format - single configuration
                     snowflake_settings["default"] = SnowflakeSettings(
                         **raw_config["snowflake"]
                     )
 
+        # Load warehouse result settings
+        warehouse_settings = WarehouseSettings()
+        if "warehouse" in raw_config and isinstance(raw_config["warehouse"], dict):
+            warehouse_settings = WarehouseSettings(**raw_config["warehouse"])
+
         config_dict = {
             "llm": llm_settings,
             "sandbox": sandbox_settings,
             "browser_config": browser_settings,
             "search_config": search_settings,
             "mcp_config": mcp_settings,
+            "python_execute_config": python_execute_settings,
+            "bash_config": bash_settings,
             "snowflake_config": snowflake_settings,
+            "warehouse_config": warehouse_settings,
         }
 
         self._config = AppConfig(**config_dict)
@@ -297,11 +533,26 @@ class Config:
         """Get the MCP configuration"""
         return self._config.mcp_config
 
+    @property
+    def python_execute_config(self) -> PythonExecuteSettings:
+        """Get the python_execute worker pool configuration"""
+        return self._config.python_execute_config
+
+    @property
+    def bash_config(self) -> BashSettings:
+        """Get the bash tool output configuration"""
+        return self._config.bash_config
+
     @property
     def snowflake_config(self) -> Optional[Dict[str, SnowflakeSettings]]:
         """Get Snowflake configurations"""
         return self._config.snowflake_config
 
+    @property
+    def warehouse_config(self) -> WarehouseSettings:
+        """Get the warehouse query result configuration"""
+        return self._config.warehouse_config
+
     @property
     def workspace_root(self) -> Path:
         """Get the workspace root directory"""
@@ -18,7 +18,6 @@ from tenacity import (
     wait_random_exponential,
 )
 
-from app.bedrock import BedrockClient
 from app.config import LLMSettings, config
 from app.exceptions import TokenLimitExceeded
 from app.logger import logger  # Assuming a logger is set up in your app
@@ -26,6 +25,7 @@ from app.schema import (
     ROLE_VALUES,
     TOOL_CHOICE_TYPE,
     TOOL_CHOICE_VALUES,
+    Memory,
     Message,
     ToolChoice,
 )
@@ -144,29 +144,33 @@ class TokenCounter:
                 token_count += self.count_text(function.get("arguments", ""))
         return token_count
 
-    def count_message_tokens(self, messages: List[dict]) -> int:
-        """Calculate the total number of tokens in a message list"""
-        total_tokens = self.FORMAT_TOKENS  # Base format tokens
+    def count_message(self, message: dict) -> int:
+        """Calculate the number of tokens in a single formatted message"""
+        tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
 
-        for message in messages:
-            tokens = self.BASE_MESSAGE_TOKENS  # Base tokens per message
+        # Add role tokens
+        tokens += self.count_text(message.get("role", ""))
 
-            # Add role tokens
-            tokens += self.count_text(message.get("role", ""))
+        # Add content tokens
+        if "content" in message:
+            tokens += self.count_content(message["content"])
 
-            # Add content tokens
-            if "content" in message:
-                tokens += self.count_content(message["content"])
+        # Add tool calls tokens
+        if "tool_calls" in message:
+            tokens += self.count_tool_calls(message["tool_calls"])
 
-            # Add tool calls tokens
-            if "tool_calls" in message:
-                tokens += self.count_tool_calls(message["tool_calls"])
+        # Add name and tool_call_id tokens
+        tokens += self.count_text(message.get("name", ""))
+        tokens += self.count_text(message.get("tool_call_id", ""))
 
-            # Add name and tool_call_id tokens
-            tokens += self.count_text(message.get("name", ""))
-            tokens += self.count_text(message.get("tool_call_id", ""))
+        return tokens
+
+    def count_message_tokens(self, messages: List[dict]) -> int:
+        """Calculate the total number of tokens in a message list"""
+        total_tokens = self.FORMAT_TOKENS  # Base format tokens
 
-            total_tokens += tokens
+        for message in messages:
+            total_tokens += self.count_message(message)
 
         return total_tokens
 
@@ -220,6 +224,8 @@ class LLM:
                     api_version=self.api_version,
                 )
             elif self.api_type == "aws":
+                from app.bedrock import BedrockClient
+
                 self.client = BedrockClient()
             else:
                 self.client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
@@ -235,6 +241,44 @@ class LLM:
     def count_message_tokens(self, messages: List[dict]) -> int:
         return self.token_counter.count_message_tokens(messages)
 
+    def count_cached_message_tokens(
+        self,
+        messages: List[Union[dict, Message]],
+        token_cache: Memory,
+        system_msgs: Optional[List[Union[dict, Message]]] = None,
+        supports_images: bool = False,
+    ) -> int:
+        """
+        Calculate input tokens for unformatted messages, reusing per-message counts.
+
+        When ``messages`` are the memory's own messages, only those appended since
+        the last call are formatted and encoded. System messages are not part of
+        the memory and are always counted.
+
+        Args:
+            messages: List of messages that can be either dict or Message objects
+            token_cache: Memory holding the per-message token counts
+            system_msgs: Optional system messages to prepend
+            supports_images: Flag indicating if the target model supports image inputs
+
+        Returns:
+            int: Total token count, including the base format tokens
+        """
+
+        def count(message: Union[dict, Message]) -> int:
+            return sum(
+                self.token_counter.count_message(msg)
+                for msg in self.format_messages([message], supports_images)
+            )
+
+        total_tokens = self.token_counter.FORMAT_TOKENS
+        total_tokens += sum(count(message) for message in system_msgs or [])
+        if messages is token_cache.messages:
+            total_tokens += token_cache.count_tokens(count)
+        else:
+            total_tokens += sum(count(message) for message in messages)
+        return total_tokens
+
     def update_token_count(self, input_tokens: int, completion_tokens: int = 0) -> None:
         """Update token counts"""
         # Only track tokens if max_input_tokens is set
@@ -539,7 +583,9 @@ class LLM:
             multimodal_content = (
                 [{"type": "text", "text": content}]
                 if isinstance(content, str)
-                else content if isinstance(content, list) else []
+                else content
+                if isinstance(content, list)
+                else []
             )
 
             # Add images to content
@@ -649,6 +695,7 @@ class LLM:
         tools: Optional[List[dict]] = None,
         tool_choice: TOOL_CHOICE_TYPE = ToolChoice.AUTO,  # type: ignore
         temperature: Optional[float] = None,
+        token_cache: Optional[Memory] = None,
         **kwargs,
     ) -> ChatCompletionMessage | None:
         """
@@ -661,6 +708,7 @@ class LLM:
             tools: List of tools to use
             tool_choice: Tool choice strategy
             temperature: Sampling temperature for the response
+            token_cache: Optional memory caching per-message token counts
             **kwargs: Additional completion arguments
 
         Returns:
@@ -680,6 +728,12 @@ class LLM:
             # Check if the model supports images
             supports_images = self.model in MULTIMODAL_MODELS
 
+            # Calculate input token count, only encoding messages not yet cached
+            if token_cache is not None:
+                input_tokens = self.count_cached_message_tokens(
+                    messages, token_cache, system_msgs, supports_images
+                )
+
             # Format messages
             if system_msgs:
                 system_msgs = self.format_messages(system_msgs, supports_images)
@@ -689,8 +743,8 @@ class LLM:
 
             # logger.info(f"Input Messages: {messages}")
 
-            # Calculate input token count
-            input_tokens = self.count_message_tokens(messages)
+            if token_cache is None:
+                input_tokens = self.count_message_tokens(messages)
 
             # If there are tools, calculate token count for tool descriptions
             tools_tokens = 0
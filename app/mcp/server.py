@@ -7,12 +7,15 @@ logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler(sys.stde
 import argparse
 import asyncio
 import atexit
+import contextlib
 import json
+import time
 from inspect import Parameter, Signature
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Set
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 
+from app.config import config
 from app.logger import logger
 from app.tool.base import BaseTool
 from app.tool.bash import Bash
@@ -21,29 +24,70 @@ from app.tool.str_replace_editor import StrReplaceEditor
 from app.tool.terminate import Terminate
 
 
+class _ClientTools:
+    """Tool instances owned by one connected client."""
+
+    def __init__(self):
+        self.tools: Dict[str, BaseTool] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.active = 0
+        self.last_used = time.monotonic()
+
+    def lock(self, tool_name: str) -> asyncio.Lock:
+        return self.locks.setdefault(tool_name, asyncio.Lock())
+
+    async def cleanup(self) -> None:
+        for tool in self.tools.values():
+            if hasattr(tool, "cleanup"):
+                await tool.cleanup()
+
+
 class MCPServer:
-    """MCP Server implementation with tool registration and management."""
+    """MCP Server implementation with tool registration and management.
+
+    Tools that keep state between calls (the shell, the browser, the editor's
+    undo history) are registered as session-scoped: each connected client
+    gets its own instance, which runs one call at a time. Concurrency across
+    clients can be capped per tool with ``[mcp] tool_concurrency``.
+    """
 
     def __init__(self, name: str = "openmanus"):
         self.server = FastMCP(name)
         self.tools: Dict[str, BaseTool] = {}
+        self.session_scoped: Set[str] = set()
+        self.clients: Dict[Any, _ClientTools] = {}
+        self.limits: Dict[str, asyncio.Semaphore] = {
+            tool_name: asyncio.Semaphore(limit)
+            for tool_name, limit in config.mcp_config.tool_concurrency.items()
+            if limit > 0
+        }
 
         # Initialize standard tools
         self.tools["bash"] = Bash()
         self.tools["browser"] = BrowserUseTool()
         self.tools["editor"] = StrReplaceEditor()
         self.tools["terminate"] = Terminate()
+        self.session_scoped.update(
+            self.tools[key].name for key in ("bash", "browser", "editor")
+        )
 
     def register_tool(self, tool: BaseTool, method_name: Optional[str] = None) -> None:
         """Register a tool with parameter validation and documentation."""
         tool_name = method_name or tool.name
         tool_param = tool.to_param()
         tool_function = tool_param["function"]
+        session_scoped = tool_name in self.session_scoped
 
         # Define the async function to be registered
-        async def tool_method(**kwargs):
+        async def tool_method(ctx: Context, **kwargs):
             logger.info(f"Executing {tool_name}: {kwargs}")
-            result = await tool.execute(**kwargs)
+            if session_scoped:
+                result = await self._execute_for_client(
+                    ctx.session, tool_name, tool, kwargs
+                )
+            else:
+                async with self._limit(tool_name):
+                    result = await tool.execute(**kwargs)
 
             logger.info(f"Result of {tool_name}: {result}")
 
@@ -54,10 +98,16 @@ class MCPServer:
                 return json.dumps(result)
             return result
 
-        # Set method metadata
+        # Set method metadata; FastMCP fills the Context parameter per request
         tool_method.__name__ = tool_name
         tool_method.__doc__ = self._build_docstring(tool_function)
-        tool_method.__signature__ = self._build_signature(tool_function)
+        signature = self._build_signature(tool_function)
+        tool_method.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                Parameter("ctx", Parameter.KEYWORD_ONLY, annotation=Context),
+            ]
+        )
 
         # Store parameter schema (important for tools that access it programmatically)
         param_props = tool_function.get("parameters", {}).get("properties", {})
@@ -75,6 +125,73 @@ class MCPServer:
         self.server.tool()(tool_method)
         logger.info(f"Registered tool: {tool_name}")
 
+    def _limit(self, tool_name: str):
+        """Context manager bounding concurrent calls of a tool across clients."""
+        return self.limits.get(tool_name) or contextlib.nullcontext()
+
+    async def _execute_for_client(
+        self, session: Any, tool_name: str, prototype: BaseTool, kwargs: dict
+    ) -> Any:
+        """Run a session-scoped tool on the instance owned by the calling client."""
+        await self._evict_idle_clients()
+        client = self.clients.get(session)
+        if client is None:
+            if len(self.clients) >= config.mcp_config.max_clients:
+                await self._evict_least_recent_client()
+            if len(self.clients) >= config.mcp_config.max_clients:
+                raise RuntimeError(
+                    f"Maximum number of MCP clients ({config.mcp_config.max_clients}) reached"
+                )
+            client = self.clients[session] = _ClientTools()
+            logger.info(f"New MCP client, {len(self.clients)} connected")
+
+        client.active += 1
+        try:
+            # Wait for the client's own previous call before taking a shared slot
+            async with client.lock(tool_name), self._limit(tool_name):
+                tool = client.tools.get(tool_name)
+                if tool is None:
+                    tool = client.tools[tool_name] = type(prototype)()
+                return await tool.execute(**kwargs)
+        finally:
+            client.active -= 1
+            client.last_used = time.monotonic()
+
+    async def _evict_idle_clients(self) -> None:
+        timeout = config.mcp_config.client_idle_timeout
+        now = time.monotonic()
+        idle = [
+            (session, client)
+            for session, client in self.clients.items()
+            if not client.active and now - client.last_used > timeout
+        ]
+        for session, client in idle:
+            # Earlier cleanups yield, so another call may have used the client
+            if time.monotonic() - client.last_used > timeout and self._detach(
+                session, client
+            ):
+                logger.info("Closing the tools of an idle MCP client")
+                await client.cleanup()
+
+    async def _evict_least_recent_client(self) -> None:
+        idle = [
+            (client.last_used, session, client)
+            for session, client in self.clients.items()
+            if not client.active
+        ]
+        if idle:
+            _, session, client = min(idle, key=lambda item: item[0])
+            if self._detach(session, client):
+                logger.info("Closing the tools of the least recently used MCP client")
+                await client.cleanup()
+
+    def _detach(self, session: Any, client: _ClientTools) -> bool:
+        """Remove an inactive client, unless a concurrent call already evicted it."""
+        if self.clients.get(session) is not client or client.active:
+            return False
+        del self.clients[session]
+        return True
+
     def _build_docstring(self, tool_function: dict) -> str:
         """Build a formatted docstring from tool function metadata."""
         description = tool_function.get("description", "")
@@ -141,14 +258,34 @@ class MCPServer:
         # Follow original cleanup logic - only clean browser tool
         if "browser" in self.tools and hasattr(self.tools["browser"], "cleanup"):
             await self.tools["browser"].cleanup()
+        clients, self.clients = list(self.clients.values()), {}
+        for client in clients:
+            await client.cleanup()
 
     def register_all_tools(self) -> None:
         """Register all tools with the server."""
         for tool in self.tools.values():
             self.register_tool(tool)
 
-    def run(self, transport: str = "stdio") -> None:
-        """Run the MCP server."""
+    def run(
+        self,
+        transport: str = "stdio",
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+    ) -> None:
+        """Run the MCP server.
+
+        Args:
+            transport: "stdio" for a single client, or "sse" to serve many
+                clients over HTTP from this process.
+            host: Address the SSE server binds to.
+            port: Port the SSE server listens on.
+        """
+        if host:
+            self.server.settings.host = host
+        if port:
+            self.server.settings.port = port
+
         # Register all tools
         self.register_all_tools()
 
@@ -165,9 +302,13 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="OpenManus MCP Server")
     parser.add_argument(
         "--transport",
-        choices=["stdio"],
+        choices=["stdio", "sse"],
         default="stdio",
-        help="Communication method: stdio or http (default: stdio)",
+        help="Communication method: stdio or sse (default: stdio)",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Bind address in sse mode")
+    parser.add_argument(
+        "--port", type=int, default=8000, help="Listen port in sse mode"
     )
     return parser.parse_args()
 
@@ -177,4 +318,4 @@ if __name__ == "__main__":
 
     # Create and run server (maintaining original flow)
     server = MCPServer()
-    server.run(transport=args.transport)
+    server.run(transport=args.transport, host=args.host, port=args.port)
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, Protocol
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Protocol
 
 from app.config import SandboxSettings
+from app.sandbox.core.manager import SandboxManager
 from app.sandbox.core.sandbox import DockerSandbox
 
 
@@ -78,17 +80,51 @@ class BaseSandboxClient(ABC):
     async def write_file(self, path: str, content: str) -> None:
         """Writes file."""
 
+    @abstractmethod
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads several files in one round trip."""
+
+    @abstractmethod
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files in one round trip."""
+
+    @abstractmethod
+    async def stat_files(self, paths: List[str]) -> Dict[str, Optional[str]]:
+        """Checks several paths in one round trip."""
+
     @abstractmethod
     async def cleanup(self) -> None:
         """Cleans up resources."""
 
 
 class LocalSandboxClient(BaseSandboxClient):
-    """Local sandbox client implementation."""
+    """Local sandbox client implementation.
+
+    Sandboxes come from a ``SandboxManager``, so a configuration with
+    ``pool_size`` > 0 is served from its warm pool, and a sandbox cleaned up
+    by the client goes back to the manager to be reset or destroyed.
+    """
 
-    def __init__(self):
-        """Initializes local sandbox client."""
+    def __init__(self, manager: Optional[SandboxManager] = None):
+        """Initializes local sandbox client.
+
+        Args:
+            manager: Sandbox manager; one is created on first use if None.
+        """
+        self.manager = manager
         self.sandbox: Optional[DockerSandbox] = None
+        self.sandbox_id: Optional[str] = None
+
+    async def start(self, config: Optional[SandboxSettings] = None) -> None:
+        """Starts the sandbox manager and fills its warm pool in the background.
+
+        Args:
+            config: Sandbox configuration whose pool is filled.
+        """
+        if self.manager is None:
+            self.manager = SandboxManager(config=config)
+        elif config is not None:
+            self.manager.warm_pool(config)
 
     async def create(
         self,
@@ -104,8 +140,25 @@ class LocalSandboxClient(BaseSandboxClient):
         Raises:
             RuntimeError: If sandbox creation fails.
         """
-        self.sandbox = DockerSandbox(config, volume_bindings)
-        await self.sandbox.create()
+        await self.start(config)
+        self.sandbox_id = await self.manager.create_sandbox(config, volume_bindings)
+        self.sandbox = await self.manager.get_sandbox(self.sandbox_id)
+
+    @asynccontextmanager
+    async def _operation(self) -> AsyncIterator[DockerSandbox]:
+        """Uses the sandbox as a manager operation.
+
+        The manager then counts the sandbox as in use, so it is not closed
+        as idle while the client keeps calling it.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+            KeyError: If the manager has closed the sandbox.
+        """
+        if not self.sandbox:
+            raise RuntimeError("Sandbox not initialized")
+        async with self.manager.sandbox_operation(self.sandbox_id) as sandbox:
+            yield sandbox
 
     async def run_command(self, command: str, timeout: Optional[int] = None) -> str:
         """Runs command in sandbox.
@@ -120,9 +173,8 @@ class LocalSandboxClient(BaseSandboxClient):
         Raises:
             RuntimeError: If sandbox not initialized.
         """
-        if not self.sandbox:
-            raise RuntimeError("Sandbox not initialized")
-        return await self.sandbox.run_command(command, timeout)
+        async with self._operation() as sandbox:
+            return await sandbox.run_command(command, timeout)
 
     async def copy_from(self, container_path: str, local_path: str) -> None:
         """Copies file from container to local.
@@ -134,9 +186,8 @@ class LocalSandboxClient(BaseSandboxClient):
         Raises:
             RuntimeError: If sandbox not initialized.
         """
-        if not self.sandbox:
-            raise RuntimeError("Sandbox not initialized")
-        await self.sandbox.copy_from(container_path, local_path)
+        async with self._operation() as sandbox:
+            await sandbox.copy_from(container_path, local_path)
 
     async def copy_to(self, local_path: str, container_path: str) -> None:
         """Copies file from local to container.
@@ -148,9 +199,8 @@ class LocalSandboxClient(BaseSandboxClient):
         Raises:
             RuntimeError: If sandbox not initialized.
         """
-        if not self.sandbox:
-            raise RuntimeError("Sandbox not initialized")
-        await self.sandbox.copy_to(local_path, container_path)
+        async with self._operation() as sandbox:
+            await sandbox.copy_to(local_path, container_path)
 
     async def read_file(self, path: str) -> str:
         """Reads file from container.
@@ -164,9 +214,8 @@ class LocalSandboxClient(BaseSandboxClient):
         Raises:
             RuntimeError: If sandbox not initialized.
         """
-        if not self.sandbox:
-            raise RuntimeError("Sandbox not initialized")
-        return await self.sandbox.read_file(path)
+        async with self._operation() as sandbox:
+            return await sandbox.read_file(path)
 
     async def write_file(self, path: str, content: str) -> None:
         """Writes file to container.
@@ -178,15 +227,68 @@ class LocalSandboxClient(BaseSandboxClient):
         Raises:
             RuntimeError: If sandbox not initialized.
         """
-        if not self.sandbox:
-            raise RuntimeError("Sandbox not initialized")
-        await self.sandbox.write_file(path, content)
+        async with self._operation() as sandbox:
+            await sandbox.write_file(path, content)
+
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads several files from container in one round trip.
+
+        Args:
+            paths: File paths in container.
+
+        Returns:
+            File contents keyed by path.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        async with self._operation() as sandbox:
+            return await sandbox.read_files(paths)
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files to container in one round trip.
+
+        Args:
+            files: File contents keyed by path in container.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        async with self._operation() as sandbox:
+            await sandbox.write_files(files)
+
+    async def stat_files(self, paths: List[str]) -> Dict[str, Optional[str]]:
+        """Checks several paths in container in one round trip.
+
+        Args:
+            paths: Paths in container.
+
+        Returns:
+            "directory", "file" or None (missing) keyed by path.
+
+        Raises:
+            RuntimeError: If sandbox not initialized.
+        """
+        async with self._operation() as sandbox:
+            return await sandbox.stat_files(paths)
 
     async def cleanup(self) -> None:
-        """Cleans up resources."""
-        if self.sandbox:
-            await self.sandbox.cleanup()
-            self.sandbox = None
+        """Cleans up resources.
+
+        The sandbox is handed back to the manager, which resets pooled
+        sandboxes for reuse and destroys the rest.
+        """
+        if self.sandbox_id:
+            await self.manager.delete_sandbox(self.sandbox_id)
+        self.sandbox = None
+        self.sandbox_id = None
+
+    async def shutdown(self) -> None:
+        """Cleans up the sandbox and every container the manager keeps."""
+        await self.cleanup()
+        if self.manager:
+            await self.manager.cleanup()
+            self.manager = None
 
 
 def create_sandbox_client() -> LocalSandboxClient:
@@ -1,7 +1,9 @@
 import asyncio
+import hashlib
+import json
 import uuid
 from contextlib import asynccontextmanager
-from typing import Dict, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import docker
 from docker.errors import APIError, ImageNotFound
@@ -18,19 +20,39 @@ class SandboxManager:
     monitoring, and cleanup. Provides concurrent access control and automatic
     cleanup mechanisms for sandbox resources.
 
+    When a configuration asks for ``pool_size`` > 0, the manager keeps that
+    many containers of the same image and limits created and started ahead of
+    time, from construction on when the configuration is passed to it.
+    ``create_sandbox`` hands one out without waiting and a background task
+    starts a replacement. Warm containers count against ``max_sandboxes``.
+    On deletion a pooled sandbox is either reset (work_dir wiped, terminal
+    reopened) and put back, or destroyed, following the configuration's
+    ``pool_policy``.
+
+    Sandboxes can also start from a named template of ``config.templates``,
+    chosen per call or by ``config.template``.
+    Its requirements are installed once into a container that is committed
+    to a local image tagged by a hash of the base image and requirements, so
+    later sandboxes of the template start without installing anything.
+
     Attributes:
         max_sandboxes: Maximum allowed number of sandboxes.
         idle_timeout: Sandbox idle timeout in seconds.
         cleanup_interval: Cleanup check interval in seconds.
         _sandboxes: Active sandbox instance mapping.
         _last_used: Last used time record for sandboxes.
+        _pools: Warm, unassigned sandboxes per pool key.
     """
 
+    # Repository of the images built for environment templates
+    template_repository = "openmanus-sandbox"
+
     def __init__(
         self,
         max_sandboxes: int = 100,
         idle_timeout: int = 3600,
         cleanup_interval: int = 300,
+        config: Optional[SandboxSettings] = None,
     ):
         """Initializes sandbox manager.
 
@@ -38,6 +60,7 @@ class SandboxManager:
             max_sandboxes: Maximum sandbox count limit.
             idle_timeout: Idle timeout in seconds.
             cleanup_interval: Cleanup check interval in seconds.
+            config: Sandbox configuration whose warm pool starts filling at once.
         """
         self.max_sandboxes = max_sandboxes
         self.idle_timeout = idle_timeout
@@ -55,6 +78,16 @@ class SandboxManager:
         self._global_lock = asyncio.Lock()
         self._active_operations: Set[str] = set()
 
+        # Warm pools, keyed by the settings that fix a container at creation
+        self._pools: Dict[Tuple, List[DockerSandbox]] = {}
+        self._pool_configs: Dict[Tuple, SandboxSettings] = {}
+        self._pool_keys: Dict[str, Tuple] = {}
+        self._refill_tasks: Dict[Tuple, asyncio.Task] = {}
+        self._warming = 0
+
+        # Environment template images being built, one lock per image tag
+        self._template_locks: Dict[str, asyncio.Lock] = {}
+
         # Cleanup task
         self._cleanup_task: Optional[asyncio.Task] = None
         self._is_shutting_down = False
@@ -62,6 +95,10 @@ class SandboxManager:
         # Start automatic cleanup
         self.start_cleanup_task()
 
+        # Fill the warm pool before the first sandbox is asked for
+        if config is not None:
+            self.warm_pool(config)
+
     async def ensure_image(self, image: str) -> bool:
         """Ensures Docker image is available.
 
@@ -85,6 +122,221 @@ class SandboxManager:
                 logger.error(f"Failed to pull image {image}: {e}")
                 return False
 
+    def _template_tag(self, base_image: str, requirements: List[str]) -> str:
+        """Gets the cached image name for a base image and requirements.
+
+        Args:
+            base_image: Image the template is built on.
+            requirements: pip requirement specifiers.
+
+        Returns:
+            str: Image name, tagged by a hash of both inputs.
+        """
+        key = json.dumps(
+            {"image": base_image, "requirements": sorted(set(requirements))}
+        )
+        digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+        return f"{self.template_repository}:{digest}"
+
+    async def ensure_template(self, base_image: str, requirements: List[str]) -> str:
+        """Ensures an image with the requirements installed exists.
+
+        The image is built on first use by running ``pip install`` in a
+        container of the base image and committing it. Later calls find
+        the image locally and return at once.
+
+        Args:
+            base_image: Image the template is built on.
+            requirements: pip requirement specifiers.
+
+        Returns:
+            str: Name of the template image.
+
+        Raises:
+            RuntimeError: If the base image is unavailable or install fails.
+        """
+        if not requirements:
+            return base_image
+
+        tag = self._template_tag(base_image, requirements)
+        lock = self._template_locks.setdefault(tag, asyncio.Lock())
+        async with lock:
+            try:
+                await asyncio.to_thread(self._client.images.get, tag)
+                return tag
+            except ImageNotFound:
+                pass
+
+            if not await self.ensure_image(base_image):
+                raise RuntimeError(f"Failed to ensure Docker image: {base_image}")
+
+            logger.info(
+                f"Building sandbox template {tag} from {base_image}: "
+                f"{' '.join(requirements)}"
+            )
+            container = await asyncio.to_thread(
+                self._client.containers.run,
+                base_image,
+                ["pip", "install", "--no-cache-dir", *requirements],
+                detach=True,
+            )
+            try:
+                result = await asyncio.to_thread(container.wait)
+                if result.get("StatusCode") != 0:
+                    logs = await asyncio.to_thread(container.logs, tail=20)
+                    raise RuntimeError(
+                        f"Failed to install template requirements: "
+                        f"{logs.decode('utf-8', errors='replace')}"
+                    )
+
+                repository, _, digest = tag.partition(":")
+                await asyncio.to_thread(
+                    container.commit,
+                    repository=repository,
+                    tag=digest,
+                    changes=[
+                        f"LABEL openmanus.template.base={json.dumps(base_image)}",
+                        'CMD ["tail", "-f", "/dev/null"]',
+                    ],
+                )
+            finally:
+                await asyncio.to_thread(container.remove, force=True)
+
+            logger.info(f"Built sandbox template {tag}")
+            return tag
+
+    @staticmethod
+    def _pool_key(config: SandboxSettings) -> Tuple:
+        """Gets the pool a configuration draws from.
+
+        Only settings that are fixed when a container is created take part;
+        per-command settings such as ``timeout`` do not split the pool.
+        """
+        return (
+            config.image,
+            config.work_dir,
+            config.memory_limit,
+            config.cpu_limit,
+            config.network_enabled,
+        )
+
+    def _pooled_count(self) -> int:
+        """Counts warm sandboxes, including those still starting."""
+        return sum(len(pool) for pool in self._pools.values()) + self._warming
+
+    def warm_pool(self, config: SandboxSettings) -> None:
+        """Starts filling the pool for a configuration in the background.
+
+        Args:
+            config: Sandbox configuration with ``pool_size`` > 0.
+        """
+        if config.pool_size <= 0 or self._is_shutting_down:
+            return
+
+        # A template's pool is keyed by its image, which is built on refill
+        requirements = (
+            config.templates.get(config.template) if config.template else None
+        )
+        if requirements:
+            image = self._template_tag(config.image, requirements)
+            key = self._pool_key(config.model_copy(update={"image": image}))
+        else:
+            key = self._pool_key(config)
+        self._pools.setdefault(key, [])
+        self._pool_configs[key] = config
+
+        task = self._refill_tasks.get(key)
+        if task is None or task.done():
+            self._refill_tasks[key] = asyncio.create_task(self._refill_pool(key))
+
+    async def _refill_pool(self, key: Tuple) -> None:
+        """Creates sandboxes until the pool is full or capacity runs out.
+
+        Args:
+            key: Pool key.
+        """
+        config = self._pool_configs[key]
+        if config.template in config.templates:
+            try:
+                image = await self.ensure_template(
+                    config.image, config.templates[config.template]
+                )
+            except RuntimeError as e:
+                logger.error(f"Cannot warm sandbox pool, template unavailable: {e}")
+                return
+            config = config.model_copy(update={"image": image, "template": None})
+            self._pool_configs[key] = config
+
+        if not await self.ensure_image(config.image):
+            logger.error(f"Cannot warm sandbox pool, image unavailable: {config.image}")
+            return
+
+        while not self._is_shutting_down:
+            async with self._global_lock:
+                if len(self._pools[key]) >= config.pool_size:
+                    return
+                if len(self._sandboxes) + self._pooled_count() >= self.max_sandboxes:
+                    return
+                self._warming += 1
+
+            try:
+                sandbox = await DockerSandbox(config).create()
+            except Exception as e:
+                logger.error(f"Failed to warm sandbox for {config.image}: {e}")
+                return
+            finally:
+                self._warming -= 1
+
+            if self._is_shutting_down:
+                await sandbox.cleanup()
+                return
+            self._pools[key].append(sandbox)
+            logger.info(
+                f"Warmed sandbox for {config.image} "
+                f"({len(self._pools[key])}/{config.pool_size})"
+            )
+
+    def _pop_warm_sandbox(self) -> Optional[DockerSandbox]:
+        """Takes a ready sandbox out of the fullest pool, if any is ready.
+
+        Returns:
+            Optional[DockerSandbox]: The sandbox, or None if all pools are empty.
+        """
+        pool = max(self._pools.values(), key=len, default=None)
+        return pool.pop() if pool else None
+
+    async def _release(self, sandbox_id: str, sandbox: DockerSandbox) -> None:
+        """Returns a deleted sandbox to its pool, or destroys it.
+
+        Args:
+            sandbox_id: Sandbox ID being deleted.
+            sandbox: Sandbox instance.
+        """
+        key = self._pool_keys.pop(sandbox_id, None)
+        config = self._pool_configs.get(key)
+        if (
+            config is None
+            or config.pool_policy != "reset"
+            or self._is_shutting_down
+            or len(self._pools[key]) >= config.pool_size
+        ):
+            await sandbox.cleanup()
+            if config is not None:
+                self.warm_pool(config)
+            return
+
+        try:
+            await sandbox.reset()
+        except Exception as e:
+            logger.warning(f"Failed to reset sandbox {sandbox_id}, destroying: {e}")
+            await sandbox.cleanup()
+            self.warm_pool(config)
+            return
+
+        sandbox.config = config
+        self._pools[key].append(sandbox)
+        logger.info(f"Returned sandbox {sandbox_id} to the pool")
+
     @asynccontextmanager
     async def sandbox_operation(self, sandbox_id: str):
         """Context manager for sandbox operations.
@@ -110,35 +362,77 @@ class SandboxManager:
                 yield self._sandboxes[sandbox_id]
             finally:
                 self._active_operations.remove(sandbox_id)
+                # Idle time counts from the end of the last operation
+                if sandbox_id in self._sandboxes:
+                    self._last_used[sandbox_id] = asyncio.get_event_loop().time()
 
     async def create_sandbox(
         self,
         config: Optional[SandboxSettings] = None,
         volume_bindings: Optional[Dict[str, str]] = None,
+        template: Optional[str] = None,
     ) -> str:
         """Creates a new sandbox instance.
 
+        A configuration with ``pool_size`` > 0 and no volume bindings is
+        served from the warm pool when a sandbox is ready there.
+
         Args:
             config: Sandbox configuration.
             volume_bindings: Volume mapping configuration.
+            template: Name of an environment template in ``config.templates``;
+                ``config.template`` if None.
 
         Returns:
             str: Sandbox ID.
 
         Raises:
+            KeyError: If the template is not configured.
             RuntimeError: If max sandbox count reached or creation fails.
         """
+        config = config or SandboxSettings()
+        template = template if template is not None else config.template
+        if template is not None:
+            if template not in config.templates:
+                raise KeyError(f"Sandbox template {template} not found")
+            # Built outside the global lock, as a first build can take minutes
+            image = await self.ensure_template(config.image, config.templates[template])
+            config = config.model_copy(update={"image": image, "template": None})
+
         async with self._global_lock:
-            if len(self._sandboxes) >= self.max_sandboxes:
-                raise RuntimeError(
-                    f"Maximum number of sandboxes ({self.max_sandboxes}) reached"
-                )
+            pooled = config.pool_size > 0 and not volume_bindings
+            key = self._pool_key(config)
+            sandbox_id = str(uuid.uuid4())
+            hit = pooled and bool(self._pools.get(key))
+
+            # Warm containers count against the limit; an idle one is given up
+            # to make room for a container that no pool can serve
+            if not hit and len(self._sandboxes) + self._pooled_count() >= (
+                self.max_sandboxes
+            ):
+                evicted = self._pop_warm_sandbox()
+                if evicted is None:
+                    raise RuntimeError(
+                        f"Maximum number of sandboxes ({self.max_sandboxes}) reached"
+                    )
+                await evicted.cleanup()
+
+            if hit:
+                sandbox = self._pools[key].pop()
+                # Pooled containers share fixed settings; per-run ones follow the caller
+                sandbox.config = config
+                self._sandboxes[sandbox_id] = sandbox
+                self._last_used[sandbox_id] = asyncio.get_event_loop().time()
+                self._locks[sandbox_id] = asyncio.Lock()
+                self._pool_keys[sandbox_id] = key
+                self.warm_pool(config)
+
+                logger.info(f"Handed out warm sandbox {sandbox_id}")
+                return sandbox_id
 
-            config = config or SandboxSettings()
             if not await self.ensure_image(config.image):
                 raise RuntimeError(f"Failed to ensure Docker image: {config.image}")
 
-            sandbox_id = str(uuid.uuid4())
             try:
                 sandbox = DockerSandbox(config, volume_bindings)
                 await sandbox.create()
@@ -146,6 +440,9 @@ class SandboxManager:
                 self._sandboxes[sandbox_id] = sandbox
                 self._last_used[sandbox_id] = asyncio.get_event_loop().time()
                 self._locks[sandbox_id] = asyncio.Lock()
+                if pooled:
+                    self._pool_keys[sandbox_id] = key
+                    self.warm_pool(config)
 
                 logger.info(f"Created sandbox {sandbox_id}")
                 return sandbox_id
@@ -216,6 +513,14 @@ class SandboxManager:
             except (asyncio.CancelledError, asyncio.TimeoutError):
                 pass
 
+        # Stop refilling pools
+        refill_tasks = list(self._refill_tasks.values())
+        for task in refill_tasks:
+            task.cancel()
+        if refill_tasks:
+            await asyncio.gather(*refill_tasks, return_exceptions=True)
+        self._refill_tasks.clear()
+
         # Get all sandbox IDs to clean up
         async with self._global_lock:
             sandbox_ids = list(self._sandboxes.keys())
@@ -225,6 +530,10 @@ class SandboxManager:
         for sandbox_id in sandbox_ids:
             task = asyncio.create_task(self._safe_delete_sandbox(sandbox_id))
             cleanup_tasks.append(task)
+        for pool in self._pools.values():
+            for sandbox in pool:
+                cleanup_tasks.append(asyncio.create_task(sandbox.cleanup()))
+            pool.clear()
 
         if cleanup_tasks:
             # Wait for all cleanup tasks to complete, with timeout to avoid infinite waiting
@@ -238,6 +547,9 @@ class SandboxManager:
         self._last_used.clear()
         self._locks.clear()
         self._active_operations.clear()
+        self._pools.clear()
+        self._pool_configs.clear()
+        self._pool_keys.clear()
 
         logger.info("Manager cleanup completed")
 
@@ -264,14 +576,15 @@ class SandboxManager:
             # Get reference to sandbox object
             sandbox = self._sandboxes.get(sandbox_id)
             if sandbox:
-                await sandbox.cleanup()
-
                 # Remove sandbox record from manager
                 async with self._global_lock:
                     self._sandboxes.pop(sandbox_id, None)
                     self._last_used.pop(sandbox_id, None)
                     self._locks.pop(sandbox_id, None)
-                    logger.info(f"Deleted sandbox {sandbox_id}")
+
+                # Reset pooled sandboxes for reuse, destroy the rest
+                await self._release(sandbox_id, sandbox)
+                logger.info(f"Deleted sandbox {sandbox_id}")
         except Exception as e:
             logger.error(f"Error during cleanup of sandbox {sandbox_id}: {e}")
 
@@ -309,5 +622,14 @@ class SandboxManager:
             "max_sandboxes": self.max_sandboxes,
             "idle_timeout": self.idle_timeout,
             "cleanup_interval": self.cleanup_interval,
+            "warm_sandboxes": [
+                {
+                    "image": config.image,
+                    "ready": len(self._pools[key]),
+                    "pool_size": config.pool_size,
+                }
+                for key, config in self._pool_configs.items()
+            ],
+            "warming_sandboxes": self._warming,
             "is_shutting_down": self._is_shutting_down,
         }
@@ -1,10 +1,13 @@
 import asyncio
 import io
 import os
+import shlex
+import shutil
+import stat
 import tarfile
 import tempfile
 import uuid
-from typing import Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import docker
 from docker.errors import NotFound
@@ -15,6 +18,82 @@ from app.sandbox.core.exceptions import SandboxTimeoutError
 from app.sandbox.core.terminal import AsyncDockerizedTerminal
 
 
+class _ChunkReader(io.RawIOBase):
+    """Readable file object over an iterator of byte chunks.
+
+    Lets ``tarfile`` consume a ``get_archive`` stream as it arrives.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = chunk
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _stream_tar(entries: List[Tuple[str, str]], chunk_size: int) -> Iterator[bytes]:
+    """Generates a tar archive of host files chunk by chunk.
+
+    Symbolic links are archived as links, without following them, so a link
+    pointing outside the copied tree or to nothing is copied as it is.
+
+    Args:
+        entries: (host_path, arcname) pairs to archive.
+        chunk_size: Bytes read from a file at a time.
+
+    Yields:
+        Successive pieces of the archive.
+
+    Raises:
+        RuntimeError: If a file shrinks while it is being archived.
+    """
+    for path, arcname in entries:
+        link_stat = os.lstat(path)
+        if stat.S_ISLNK(link_stat.st_mode):
+            info = tarfile.TarInfo(name=arcname)
+            info.type = tarfile.SYMTYPE
+            info.linkname = os.readlink(path)
+            info.mtime = int(link_stat.st_mtime)
+            info.mode = link_stat.st_mode & 0o7777
+            yield info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+            continue
+
+        with open(path, "rb") as f:
+            file_stat = os.fstat(f.fileno())
+            info = tarfile.TarInfo(name=arcname)
+            info.size = file_stat.st_size
+            info.mtime = int(file_stat.st_mtime)
+            info.mode = file_stat.st_mode & 0o7777
+            yield info.tobuf(tarfile.PAX_FORMAT, "utf-8", "surrogateescape")
+
+            remaining = info.size
+            while remaining:
+                chunk = f.read(min(chunk_size, remaining))
+                if not chunk:
+                    raise RuntimeError(f"File changed while copying: {path}")
+                remaining -= len(chunk)
+                yield chunk
+
+            padding = -info.size % tarfile.BLOCKSIZE
+            if padding:
+                yield tarfile.NUL * padding
+
+    # End-of-archive marker
+    yield tarfile.NUL * (2 * tarfile.BLOCKSIZE)
+
+
 class DockerSandbox:
     """Docker sandbox environment.
 
@@ -29,6 +108,9 @@ class DockerSandbox:
         terminal: Container terminal interface.
     """
 
+    # Bytes read from a host file at a time when copying into the container
+    _copy_chunk_size = 1024 * 1024
+
     def __init__(
         self,
         config: Optional[SandboxSettings] = None,
@@ -87,14 +169,7 @@ class DockerSandbox:
             # Start container
             await asyncio.to_thread(self.container.start)
 
-            # Initialize terminal
-            self.terminal = AsyncDockerizedTerminal(
-                container["Id"],
-                self.config.work_dir,
-                env_vars={"PYTHONUNBUFFERED": "1"}
-                # Ensure Python output is not buffered
-            )
-            await self.terminal.init()
+            await self._start_terminal()
 
             return self
 
@@ -102,6 +177,44 @@ class DockerSandbox:
             await self.cleanup()  # Ensure resources are cleaned up
             raise RuntimeError(f"Failed to create sandbox: {e}") from e
 
+    async def _start_terminal(self) -> None:
+        """Opens a fresh terminal session in the running container."""
+        self.terminal = AsyncDockerizedTerminal(
+            self.container.id,
+            self.config.work_dir,
+            env_vars={"PYTHONUNBUFFERED": "1"}
+            # Ensure Python output is not buffered
+        )
+        await self.terminal.init()
+
+    async def reset(self) -> None:
+        """Returns a running sandbox to a clean state for reuse.
+
+        Closes the terminal session, wipes the working directory and opens a
+        new session, so shell state and files do not leak to the next user.
+
+        Raises:
+            RuntimeError: If sandbox not initialized or reset fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        if self.terminal:
+            await self.terminal.close()
+            self.terminal = None
+
+        result = await asyncio.to_thread(
+            self.container.exec_run,
+            ["find", self.config.work_dir, "-mindepth", "1", "-delete"],
+        )
+        if result.exit_code != 0:
+            raise RuntimeError(
+                f"Failed to wipe {self.config.work_dir}: "
+                f"{result.output.decode('utf-8', errors='replace')}"
+            )
+
+        await self._start_terminal()
+
     def _prepare_volume_bindings(self) -> Dict[str, Dict[str, str]]:
         """Prepares volume binding configuration.
 
@@ -229,6 +342,107 @@ class DockerSandbox:
         except Exception as e:
             raise RuntimeError(f"Failed to write file: {e}")
 
+    async def read_files(self, paths: List[str]) -> Dict[str, str]:
+        """Reads several files from the container in one exec.
+
+        Args:
+            paths: File paths.
+
+        Returns:
+            File contents keyed by the paths as given.
+
+        Raises:
+            FileNotFoundError: If any file does not exist or is not a file.
+            RuntimeError: If read operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        resolved = {
+            os.path.normpath(self._safe_resolve_path(path)): path for path in paths
+        }
+        try:
+            result = await asyncio.to_thread(
+                self.container.exec_run,
+                ["tar", "-chPf", "-", "--no-recursion", "--", *resolved],
+                demux=True,
+            )
+            stdout, _ = result.output
+            contents = {}
+            if stdout:
+                # Random access, so hard links between requested files resolve
+                with tarfile.open(fileobj=io.BytesIO(stdout), mode="r") as tar:
+                    for member in tar:
+                        path = resolved.get(os.path.normpath(member.name))
+                        if path is not None and (member.isfile() or member.islnk()):
+                            data = tar.extractfile(member).read()
+                            contents[path] = data.decode("utf-8")
+        except Exception as e:
+            raise RuntimeError(f"Failed to read files: {e}")
+
+        missing = [path for path in paths if path not in contents]
+        if missing:
+            raise FileNotFoundError(f"File not found: {', '.join(missing)}")
+        return contents
+
+    async def write_files(self, files: Dict[str, str]) -> None:
+        """Writes several files to the container in one archive upload.
+
+        Missing parent directories are created by Docker when the archive
+        is extracted.
+
+        Args:
+            files: File contents keyed by target path.
+
+        Raises:
+            RuntimeError: If write operation fails.
+        """
+        if not self.container:
+            raise RuntimeError("Sandbox not initialized")
+
+        try:
+            tar_stream = io.BytesIO()
+            with tarfile.open(fileobj=tar_stream, mode="w") as tar:
+                for path, content in files.items():
+                    data = content.encode("utf-8")
+                    tarinfo = tarfile.TarInfo(
+                        name=self._safe_resolve_path(path).lstrip("/")
+                    )
+                    tarinfo.size = len(data)
+                    tar.addfile(tarinfo, io.BytesIO(data))
+            tar_stream.seek(0)
+
+            await asyncio.to_thread(self.container.put_archive, "/", tar_stream)
+
+        except Exception as e:
+            raise RuntimeError(f"Failed to write files: {e}")
+
+    async def stat_files(self, paths: List[str]) -> Dict[str, Optional[str]]:
+        """Checks several paths in the container with one command.
+
+        Args:
+            paths: Paths to check.
+
+        Returns:
+            "directory", "file" or None (missing) keyed by the paths as given.
+        """
+        if not paths:
+            return {}
+
+        quoted = " ".join(shlex.quote(self._safe_resolve_path(p)) for p in paths)
+        output = await self.run_command(
+            f"for p in {quoted}; do "
+            'if [ -d "$p" ]; then echo d; elif [ -e "$p" ]; then echo f; '
+            "else echo -; fi; done"
+        )
+        kinds = {"d": "directory", "f": "file"}
+        lines = output.splitlines()
+        # A path without an answer line, e.g. from cut-off output, counts as missing
+        return {
+            path: kinds.get(lines[index].strip()) if index < len(lines) else None
+            for index, path in enumerate(paths)
+        }
+
     def _safe_resolve_path(self, path: str) -> str:
         """Safely resolves container path, preventing path traversal.
 
@@ -269,49 +483,51 @@ class DockerSandbox:
             if parent_dir:
                 os.makedirs(parent_dir, exist_ok=True)
 
-            # Get file stream
+            # Get file stream and extract it as it arrives
             resolved_src = self._safe_resolve_path(src_path)
-            stream, stat = await asyncio.to_thread(
-                self.container.get_archive, resolved_src
+            await asyncio.to_thread(
+                self._extract_archive, resolved_src, src_path, dst_path
             )
 
-            # Create temporary directory to extract file
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                # Write stream to temporary file
-                tar_path = os.path.join(tmp_dir, "temp.tar")
-                with open(tar_path, "wb") as f:
-                    for chunk in stream:
-                        f.write(chunk)
-
-                # Extract file
-                with tarfile.open(tar_path) as tar:
-                    members = tar.getmembers()
-                    if not members:
-                        raise FileNotFoundError(f"Source file is empty: {src_path}")
-
-                    # If destination is a directory, we should preserve relative path structure
-                    if os.path.isdir(dst_path):
-                        tar.extractall(dst_path)
-                    else:
-                        # If destination is a file, we only extract the source file's content
-                        if len(members) > 1:
-                            raise RuntimeError(
-                                f"Source path is a directory but destination is a file: {src_path}"
-                            )
-
-                        with open(dst_path, "wb") as dst:
-                            src_file = tar.extractfile(members[0])
-                            if src_file is None:
-                                raise RuntimeError(
-                                    f"Failed to extract file: {src_path}"
-                                )
-                            dst.write(src_file.read())
-
         except docker.errors.NotFound:
             raise FileNotFoundError(f"Source file not found: {src_path}")
         except Exception as e:
             raise RuntimeError(f"Failed to copy file: {e}")
 
+    def _extract_archive(self, resolved_src: str, src_path: str, dst_path: str) -> None:
+        """Streams a container path to the host without a temporary archive.
+
+        Runs in a worker thread, since the archive is read from the Docker
+        API while it is extracted.
+
+        Args:
+            resolved_src: Resolved source path (container).
+            src_path: Source path as given, for error messages.
+            dst_path: Destination path (host).
+        """
+        stream, _ = self.container.get_archive(resolved_src)
+        with tarfile.open(fileobj=_ChunkReader(stream), mode="r|") as tar:
+            # If destination is a directory, we should preserve relative path structure
+            if os.path.isdir(dst_path):
+                tar.extractall(dst_path)
+                return
+
+            member = tar.next()
+            if member is None:
+                raise FileNotFoundError(f"Source file is empty: {src_path}")
+
+            # If destination is a file, we only extract the source file's content
+            if member.isdir():
+                raise RuntimeError(
+                    f"Source path is a directory but destination is a file: {src_path}"
+                )
+
+            src_file = tar.extractfile(member)
+            if src_file is None:
+                raise RuntimeError(f"Failed to extract file: {src_path}")
+            with open(dst_path, "wb") as dst:
+                shutil.copyfileobj(src_file, dst, self._copy_chunk_size)
+
     async def copy_to(self, src_path: str, dst_path: str) -> None:
         """Copies a file to the container.
 
@@ -333,41 +549,34 @@ class DockerSandbox:
             if container_dir:
                 await self.run_command(f"mkdir -p {container_dir}")
 
-            # Create tar file to upload
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                tar_path = os.path.join(tmp_dir, "temp.tar")
-                with tarfile.open(tar_path, "w") as tar:
-                    # Handle directory source path
-                    if os.path.isdir(src_path):
-                        os.path.basename(src_path.rstrip("/"))
-                        for root, _, files in os.walk(src_path):
-                            for file in files:
-                                file_path = os.path.join(root, file)
-                                arcname = os.path.join(
-                                    os.path.basename(dst_path),
-                                    os.path.relpath(file_path, src_path),
-                                )
-                                tar.add(file_path, arcname=arcname)
-                    else:
-                        # Add single file to tar
-                        tar.add(src_path, arcname=os.path.basename(dst_path))
-
-                # Read tar file content
-                with open(tar_path, "rb") as f:
-                    data = f.read()
-
-                # Upload to container
-                await asyncio.to_thread(
-                    self.container.put_archive,
-                    os.path.dirname(resolved_dst) or "/",
-                    data,
-                )
+            # Collect files to upload
+            if os.path.isdir(src_path):
+                entries = [
+                    (
+                        os.path.join(root, file),
+                        os.path.join(
+                            os.path.basename(dst_path),
+                            os.path.relpath(os.path.join(root, file), src_path),
+                        ),
+                    )
+                    for root, _, files in os.walk(src_path)
+                    for file in files
+                ]
+            else:
+                entries = [(src_path, os.path.basename(dst_path))]
+
+            # Stream the archive to the container as it is generated
+            await asyncio.to_thread(
+                self.container.put_archive,
+                os.path.dirname(resolved_dst) or "/",
+                _stream_tar(entries, self._copy_chunk_size),
+            )
 
-                # Verify file was created successfully
-                try:
-                    await self.run_command(f"test -e {resolved_dst}")
-                except Exception:
-                    raise RuntimeError(f"Failed to verify file creation: {dst_path}")
+            # Verify file was created successfully
+            try:
+                await self.run_command(f"test -e {resolved_dst}")
+            except Exception:
+                raise RuntimeError(f"Failed to verify file creation: {dst_path}")
 
         except FileNotFoundError:
             raise
@@ -406,12 +615,9 @@ class DockerSandbox:
         Raises:
             RuntimeError: If read operation fails.
         """
-        with tempfile.NamedTemporaryFile() as tmp:
-            for chunk in tar_stream:
-                tmp.write(chunk)
-            tmp.seek(0)
 
-            with tarfile.open(fileobj=tmp) as tar:
+        def read() -> bytes:
+            with tarfile.open(fileobj=_ChunkReader(tar_stream), mode="r|") as tar:
                 member = tar.next()
                 if not member:
                     raise RuntimeError("Empty tar archive")
@@ -422,6 +628,8 @@ class DockerSandbox:
 
                 return file_content.read()
 
+        return await asyncio.to_thread(read)
+
     async def cleanup(self) -> None:
         """Cleans up sandbox resources."""
         errors = []
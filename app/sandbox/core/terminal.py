@@ -6,7 +6,7 @@ allowing interactive command execution with timeout control.
 """
 
 import asyncio
-import re
+import secrets
 import socket
 from typing import Dict, Optional, Tuple, Union
 
@@ -17,6 +17,9 @@ from docker.models.containers import Container
 
 
 class DockerSession:
+    # Bytes requested per read from the exec socket
+    _read_size = 64 * 1024
+
     def __init__(self, container_id: str) -> None:
         """Initializes a Docker session.
 
@@ -27,6 +30,10 @@ class DockerSession:
         self.container_id = container_id
         self.exec_id = None
         self.socket = None
+        # Commands end by printing this prefix plus a sequence number. The
+        # prefix is random per session so command output cannot fake it.
+        self._marker_prefix = f"__cmd_done_{secrets.token_hex(8)}_"
+        self._sequence = 0
 
     async def create(self, working_dir: str, env_vars: Dict[str, str]) -> None:
         """Creates an interactive session with the container.
@@ -42,9 +49,10 @@ class DockerSession:
             "bash",
             "-c",
             f"cd {working_dir} && "
+            "stty -echo 2>/dev/null; "
             "PROMPT_COMMAND='' "
-            "PS1='$ ' "
-            "exec bash --norc --noprofile",
+            "PS1='' PS2='' "
+            "exec bash --norc --noprofile --noediting",
         ]
 
         exec_data = self.api.exec_create(
@@ -56,7 +64,7 @@ class DockerSession:
             stderr=True,
             privileged=True,
             user="root",
-            environment={**env_vars, "TERM": "dumb", "PS1": "$ ", "PROMPT_COMMAND": ""},
+            environment={**env_vars, "TERM": "dumb", "PS1": "", "PROMPT_COMMAND": ""},
         )
         self.exec_id = exec_data["Id"]
 
@@ -70,7 +78,9 @@ class DockerSession:
         else:
             raise RuntimeError("Failed to get socket connection")
 
-        await self._read_until_prompt()
+        # Wait until the shell answers, discarding any start-up output
+        await self._send_marked(":")
+        await self._read_until_marker()
 
     async def close(self) -> None:
         """Cleans up session resources.
@@ -114,27 +124,66 @@ class DockerSession:
             # Log error but don't raise, ensure cleanup continues
             print(f"Warning: Error during session cleanup: {e}")
 
-    async def _read_until_prompt(self) -> str:
-        """Reads output until prompt is found.
+    async def _send_marked(self, command: str) -> bytes:
+        """Sends a command followed by a fresh end-of-command marker.
+
+        The marker is printed in two pieces, so neither the command text nor
+        an echo of it contains the marker that ``_read_until_marker`` waits
+        for.
+
+        Args:
+            command: Shell command to send.
 
         Returns:
-            String containing output up to the prompt.
+            The marker that ends this command's output.
+        """
+        self._sequence += 1
+        marker = f"{self._marker_prefix}{self._sequence}__"
+        full_command = (
+            f"{command}\n"
+            f"printf '\\n%s%s\\n' '{self._marker_prefix}' '{self._sequence}__'\n"
+        )
+        await asyncio.get_running_loop().sock_sendall(
+            self.socket, full_command.encode()
+        )
+        return marker.encode()
+
+    async def _read_until_marker(self, marker: Optional[bytes] = None) -> bytes:
+        """Reads from the exec socket until the end-of-command marker.
+
+        The socket is awaited through the event loop, so output is handled
+        as soon as it arrives.
+
+        Args:
+            marker: Marker to wait for, the one sent last if None.
+
+        Returns:
+            Output written before the marker.
 
         Raises:
-            socket.error: If socket communication fails.
+            RuntimeError: If the session closes before the marker arrives.
         """
-        buffer = b""
-        while b"$ " not in buffer:
-            try:
-                chunk = self.socket.recv(4096)
-                if chunk:
-                    buffer += chunk
-            except socket.error as e:
-                if e.errno == socket.EWOULDBLOCK:
-                    await asyncio.sleep(0.1)
-                    continue
-                raise
-        return buffer.decode("utf-8")
+        loop = asyncio.get_running_loop()
+        marker = marker or f"{self._marker_prefix}{self._sequence}__".encode()
+        buffer = bytearray()
+        search_from = 0
+        while True:
+            chunk = await loop.sock_recv(self.socket, self._read_size)
+            if not chunk:
+                raise RuntimeError("Session closed before command completed")
+            buffer += chunk
+
+            index = buffer.find(marker, search_from)
+            if index != -1:
+                output = bytes(buffer[:index])
+                # Drop the tail of an earlier command that timed out
+                previous = output.rfind(self._marker_prefix.encode())
+                if previous != -1:
+                    output = output[output.find(b"\n", previous) + 1 :]
+                return output
+
+            # Keep enough of the tail to match a marker split across reads
+            search_from = max(0, len(buffer) - len(marker) + 1)
 
     async def execute(self, command: str, timeout: Optional[int] = None) -> str:
         """Executes a command and returns cleaned output.
@@ -144,7 +193,7 @@ class DockerSession:
             timeout: Maximum execution time in seconds.
 
         Returns:
-            Command output as string with prompt markers removed.
+            Command output as string with the end-of-command marker removed.
 
         Raises:
             RuntimeError: If session not initialized or execution fails.
@@ -156,59 +205,18 @@ class DockerSession:
         try:
             # Sanitize command to prevent shell injection
             sanitized_command = self._sanitize_command(command)
-            full_command = f"{sanitized_command}\necho $?\n"
-            self.socket.sendall(full_command.encode())
-
-            async def read_output() -> str:
-                buffer = b""
-                result_lines = []
-                command_sent = False
-
-                while True:
-                    try:
-                        chunk = self.socket.recv(4096)
-                        if not chunk:
-                            break
-
-                        buffer += chunk
-                        lines = buffer.split(b"\n")
-
-                        buffer = lines[-1]
-                        lines = lines[:-1]
-
-                        for line in lines:
-                            line = line.rstrip(b"\r")
-
-                            if not command_sent:
-                                command_sent = True
-                                continue
-
-                            if line.strip() == b"echo $?" or line.strip().isdigit():
-                                continue
-
-                            if line.strip():
-                                result_lines.append(line)
-
-                        if buffer.endswith(b"$ "):
-                            break
-
-                    except socket.error as e:
-                        if e.errno == socket.EWOULDBLOCK:
-                            await asyncio.sleep(0.1)
-                            continue
-                        raise
-
-                output = b"\n".join(result_lines).decode("utf-8")
-                output = re.sub(r"\n\$ echo \$\$?.*$", "", output)
-
-                return output
+            marker = await self._send_marked(sanitized_command)
 
             if timeout:
-                result = await asyncio.wait_for(read_output(), timeout)
+                output = await asyncio.wait_for(
+                    self._read_until_marker(marker), timeout
+                )
             else:
-                result = await read_output()
+                output = await self._read_until_marker(marker)
 
-            return result.strip()
+            return (
+                output.decode("utf-8", errors="replace").replace("\r\n", "\n").strip()
+            )
 
         except asyncio.TimeoutError:
             raise TimeoutError(f"Command execution timed out after {timeout} seconds")
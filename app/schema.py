@@ -1,7 +1,7 @@
 from enum import Enum
-from typing import Any, List, Literal, Optional, Union
+from typing import Any, Callable, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Role(str, Enum):
@@ -160,23 +160,58 @@ class Memory(BaseModel):
     messages: List[Message] = Field(default_factory=list)
     max_messages: int = Field(default=100)
 
+    # Token counts of the leading messages, by position. Messages are only
+    # appended at the end and trimmed from the front, so the uncounted ones are
+    # always a suffix. Counts depend on the tokenizer, so a memory should only
+    # be counted by the LLM of its own agent.
+    _token_counts: List[int] = PrivateAttr(default_factory=list)
+    _token_total: int = PrivateAttr(default=0)
+
     def add_message(self, message: Message) -> None:
         """Add a message to memory"""
         self.messages.append(message)
         # Optional: Implement message limit
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+        self._trim()
 
     def add_messages(self, messages: List[Message]) -> None:
         """Add multiple messages to memory"""
         self.messages.extend(messages)
         # Optional: Implement message limit
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+        self._trim()
+
+    def _trim(self) -> None:
+        """Drop the oldest messages beyond max_messages along with their token counts"""
+        evicted = len(self.messages) - self.max_messages
+        if evicted <= 0:
+            return
+        self.messages = self.messages[evicted:]
+        self._token_total -= sum(self._token_counts[:evicted])
+        del self._token_counts[:evicted]
 
     def clear(self) -> None:
         """Clear all messages"""
         self.messages.clear()
+        self.invalidate_token_counts()
+
+    def invalidate_token_counts(self) -> None:
+        """Forget all token counts, after the message list was replaced"""
+        self._token_counts.clear()
+        self._token_total = 0
+
+    def count_tokens(self, count: Callable[[Message], int]) -> int:
+        """Total tokens of the messages in memory.
+
+        Only messages appended since the last call are passed to ``count``;
+        the counts of the others are reused.
+        """
+        if len(self._token_counts) > len(self.messages):
+            # Messages were removed other than by trimming
+            self.invalidate_token_counts()
+        for message in self.messages[len(self._token_counts) :]:
+            tokens = count(message)
+            self._token_counts.append(tokens)
+            self._token_total += tokens
+        return self._token_total
 
     def get_recent_messages(self, n: int) -> List[Message]:
         """Get n most recent messages"""
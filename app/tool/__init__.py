@@ -1,12 +1,49 @@
-from app.tool.base import BaseTool
-from app.tool.bash import Bash
-from app.tool.browser_use_tool import BrowserUseTool
-from app.tool.create_chat_completion import CreateChatCompletion
-from app.tool.planning import PlanningTool
-from app.tool.str_replace_editor import StrReplaceEditor
-from app.tool.terminate import Terminate
-from app.tool.tool_collection import ToolCollection
-from app.tool.web_search import WebSearch
+"""Tool package.
+
+Tools are imported on first access (PEP 562), so importing one tool does not
+load the heavy dependencies of the others, such as browser_use for
+``BrowserUseTool`` or every search engine client for ``WebSearch``.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    from app.tool.base import BaseTool
+    from app.tool.bash import Bash
+    from app.tool.browser_use_tool import BrowserUseTool
+    from app.tool.create_chat_completion import CreateChatCompletion
+    from app.tool.planning import PlanningTool
+    from app.tool.str_replace_editor import StrReplaceEditor
+    from app.tool.terminate import Terminate
+    from app.tool.tool_collection import ToolCollection
+    from app.tool.web_search import WebSearch
+
+
+_LAZY_IMPORTS = {
+    "BaseTool": "app.tool.base",
+    "Bash": "app.tool.bash",
+    "BrowserUseTool": "app.tool.browser_use_tool",
+    "CreateChatCompletion": "app.tool.create_chat_completion",
+    "PlanningTool": "app.tool.planning",
+    "StrReplaceEditor": "app.tool.str_replace_editor",
+    "Terminate": "app.tool.terminate",
+    "ToolCollection": "app.tool.tool_collection",
+    "WebSearch": "app.tool.web_search",
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_IMPORTS))
 
 
 __all__ = [
@@ -8,6 +8,8 @@ class BaseTool(ABC, BaseModel):
     name: str
     description: str
     parameters: Optional[dict] = None
+    # Side-effect-free tools may run concurrently with other such calls in one turn
+    parallel_safe: bool = False
 
     class Config:
         arbitrary_types_allowed = True
@@ -1,7 +1,11 @@
 import asyncio
 import os
-from typing import Optional
+import secrets
+import time
+from pathlib import Path
+from typing import BinaryIO, Callable, List, Optional
 
+from app.config import config
 from app.exceptions import ToolError
 from app.tool.base import BaseTool, CLIResult
 
@@ -13,6 +17,95 @@ _BASH_DESCRIPTION = """Execute a bash command in the terminal.
 """
 
 
+def _prune_spill_dir(
+    directory: Path, max_files: int, max_bytes: int, keep: List[Path]
+) -> None:
+    """Delete the oldest output files beyond a file count or total size.
+
+    The files in ``keep``, just written by the last command, are never deleted.
+    A limit of 0 means no limit.
+    """
+    files = []
+    for path in directory.glob("*.log"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((path in keep, stat.st_mtime, stat.st_size, path))
+    files.sort(reverse=True)
+
+    total_bytes = 0
+    for index, (kept, _, size, path) in enumerate(files):
+        total_bytes += size
+        if not kept and (
+            (max_files and index >= max_files)
+            or (max_bytes and total_bytes > max_bytes)
+        ):
+            path.unlink(missing_ok=True)
+
+
+class _OutputCapture:
+    """Keeps the head and tail of an output stream within a byte budget.
+
+    Once the output outgrows the budget, all of it is written to
+    ``spill_path`` as it arrives, so nothing is lost while memory stays flat.
+    """
+
+    def __init__(self, head_bytes: int, tail_bytes: int, spill_path: Optional[Path]):
+        self.head_bytes = head_bytes
+        self.tail_bytes = tail_bytes
+        self.spill_path = spill_path
+        self.head = bytearray()
+        self.tail = bytearray()
+        self.total = 0
+        self.lines = 0
+        self._spill: Optional[BinaryIO] = None
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self.total += len(data)
+        self.lines += data.count(b"\n")
+        if self._spill:
+            self._spill.write(data)
+
+        room = self.head_bytes - len(self.head)
+        if room > 0:
+            self.head += data[:room]
+            data = data[room:]
+        self.tail += data
+        if len(self.tail) <= self.tail_bytes:
+            return
+
+        if self._spill is None and self.spill_path:
+            # Nothing has been dropped yet, so head and tail hold it all
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill = open(self.spill_path, "wb")
+            self._spill.write(self.head + self.tail)
+        del self.tail[: len(self.tail) - self.tail_bytes]
+
+    def text(self) -> str:
+        """The captured output, with a note in place of what was left out."""
+        head = self.head.decode(errors="replace")
+        tail = self.tail.decode(errors="replace")
+        omitted = self.total - len(self.head) - len(self.tail)
+        if not omitted:
+            return head + tail
+        saved = f"; full output in {self.spill_path}" if self.spilled else ""
+        return (
+            f"{head}\n[... {omitted} bytes omitted of {self.total} bytes, "
+            f"{self.lines} lines{saved} ...]\n{tail}"
+        )
+
+    @property
+    def spilled(self) -> bool:
+        return self._spill is not None
+
+    def close(self) -> None:
+        if self._spill:
+            self._spill.close()
+
+
 class _BashSession:
     """A session of a bash shell."""
 
@@ -20,13 +113,15 @@ class _BashSession:
     _process: asyncio.subprocess.Process
 
     command: str = "/bin/bash"
-    _output_delay: float = 0.2  # seconds
+    _read_size: int = 64 * 1024  # bytes per read from the shell's pipes
     _timeout: float = 120.0  # seconds
     _sentinel: str = "<<exit>>"
 
     def __init__(self):
         self._started = False
         self._timed_out = False
+        # unique per session, so output that prints the marker cannot end a read
+        self._sentinel = f"<<exit-{secrets.token_hex(4)}>>"
 
     async def start(self):
         if self._started:
@@ -71,46 +166,105 @@ class _BashSession:
         assert self._process.stdout
         assert self._process.stderr
 
-        # send command to the process
+        # send the command, then a sentinel on each stream; the one on stdout
+        # carries the command's exit code
         self._process.stdin.write(
-            command.encode() + f"; echo '{self._sentinel}'\n".encode()
+            command.encode()
+            + f'\necho "{self._sentinel}$?"; echo "{self._sentinel}" >&2\n'.encode()
         )
         await self._process.stdin.drain()
 
-        # read output from the process, until the sentinel is found
+        # read both streams as the output arrives, until their sentinels,
+        # keeping only a bounded head and tail of each in memory
+        stdout, stderr = self._capture("stdout"), self._capture("stderr")
         try:
             async with asyncio.timeout(self._timeout):
-                while True:
-                    await asyncio.sleep(self._output_delay)
-                    # if we read directly from stdout/stderr, it will wait forever for
-                    # EOF. use the StreamReader buffer directly instead.
-                    output = (
-                        self._process.stdout._buffer.decode()
-                    )  # pyright: ignore[reportAttributeAccessIssue]
-                    if self._sentinel in output:
-                        # strip the sentinel and break
-                        output = output[: output.index(self._sentinel)]
-                        break
+                exit_code, _ = await asyncio.gather(
+                    self._read_until_sentinel(self._process.stdout, stdout.write),
+                    self._read_until_sentinel(self._process.stderr, stderr.write),
+                )
         except asyncio.TimeoutError:
             self._timed_out = True
             raise ToolError(
                 f"timed out: bash has not returned in {self._timeout} seconds and must be restarted",
             ) from None
+        except EOFError:
+            return CLIResult(
+                system="tool must be restarted",
+                error=f"bash has exited with returncode {await self._process.wait()}",
+            )
+        finally:
+            stdout.close()
+            stderr.close()
+            spilled = [c.spill_path for c in (stdout, stderr) if c.spilled]
+            if spilled:
+                settings = config.bash_config
+                _prune_spill_dir(
+                    spilled[0].parent,
+                    settings.spill_max_files,
+                    settings.spill_max_bytes,
+                    spilled,
+                )
 
+        output = stdout.text()
         if output.endswith("\n"):
             output = output[:-1]
 
-        error = (
-            self._process.stderr._buffer.decode()
-        )  # pyright: ignore[reportAttributeAccessIssue]
+        error = stderr.text()
         if error.endswith("\n"):
             error = error[:-1]
 
-        # clear the buffers so that the next output can be read correctly
-        self._process.stdout._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
-        self._process.stderr._buffer.clear()  # pyright: ignore[reportAttributeAccessIssue]
+        system = None
+        if exit_code and exit_code != "0":
+            system = f"exit code {exit_code}"
+        return CLIResult(output=output, error=error, system=system)
 
-        return CLIResult(output=output, error=error)
+    def _capture(self, stream_name: str) -> _OutputCapture:
+        settings = config.bash_config
+        spill_path = None
+        if settings.spill_to_file:
+            spill_path = (
+                config.workspace_root
+                / settings.spill_dir
+                / f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}.{stream_name}.log"
+            )
+        return _OutputCapture(
+            settings.output_head_bytes, settings.output_tail_bytes, spill_path
+        )
+
+    async def _read_until_sentinel(
+        self, stream: asyncio.StreamReader, sink: Callable[[bytes], None]
+    ) -> str:
+        """Pass a stream to ``sink`` as it arrives, up to the sentinel.
+
+        Only new data is scanned for the sentinel; the few bytes that could be
+        the start of one are held back until the next read.
+
+        Returns:
+            The rest of the sentinel's line, which is the exit code on stdout.
+        """
+        marker = self._sentinel.encode()
+        pending = b""
+        while True:
+            chunk = await stream.read(self._read_size)
+            if not chunk:
+                raise EOFError("bash closed its output")
+            data = pending + chunk
+            index = data.find(marker)
+            if index < 0:
+                keep = len(marker) - 1
+                sink(data[:-keep])
+                pending = data[-keep:]
+                continue
+
+            sink(data[:index])
+            rest = data[index + len(marker) :]
+            while b"\n" not in rest:
+                chunk = await stream.read(self._read_size)
+                if not chunk:
+                    raise EOFError("bash closed its output")
+                rest += chunk
+            return rest.split(b"\n", 1)[0].decode().strip()
 
 
 class Bash(BaseTool):
@@ -151,6 +305,12 @@ class Bash(BaseTool):
 
         raise ToolError("no command provided.")
 
+    async def cleanup(self) -> None:
+        """Stop the shell session, if one was started."""
+        if self._session:
+            self._session.stop()
+            self._session = None
+
 
 if __name__ == "__main__":
     bash = Bash()
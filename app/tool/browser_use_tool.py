@@ -1,19 +1,19 @@
 import asyncio
 import base64
 import json
-from typing import Generic, Optional, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Optional, TypeVar
 
-from browser_use import Browser as BrowserUseBrowser
-from browser_use import BrowserConfig
-from browser_use.browser.context import BrowserContext, BrowserContextConfig
-from browser_use.dom.service import DomService
 from pydantic import Field, field_validator
 from pydantic_core.core_schema import ValidationInfo
 
 from app.config import config
 from app.llm import LLM
 from app.tool.base import BaseTool, ToolResult
-from app.tool.web_search import WebSearch
+
+
+# browser_use takes seconds to import, so it is only loaded with the browser
+if TYPE_CHECKING:
+    from browser_use.browser.context import BrowserContext
 
 
 _BROWSER_DESCRIPTION = """\
@@ -122,10 +122,12 @@ class BrowserUseTool(BaseTool, Generic[Context]):
     }
 
     lock: asyncio.Lock = Field(default_factory=asyncio.Lock)
-    browser: Optional[BrowserUseBrowser] = Field(default=None, exclude=True)
-    context: Optional[BrowserContext] = Field(default=None, exclude=True)
-    dom_service: Optional[DomService] = Field(default=None, exclude=True)
-    web_search_tool: WebSearch = Field(default_factory=WebSearch, exclude=True)
+    # browser_use Browser, BrowserContext and DomService, created on first use
+    browser: Optional[Any] = Field(default=None, exclude=True)
+    context: Optional[Any] = Field(default=None, exclude=True)
+    dom_service: Optional[Any] = Field(default=None, exclude=True)
+    # WebSearch, created by the first 'web_search' action
+    web_search_tool: Optional[Any] = Field(default=None, exclude=True)
 
     # Context for generic functionality
     tool_context: Optional[Context] = Field(default=None, exclude=True)
@@ -138,8 +140,13 @@ class BrowserUseTool(BaseTool, Generic[Context]):
             raise ValueError("Parameters cannot be empty")
         return v
 
-    async def _ensure_browser_initialized(self) -> BrowserContext:
+    async def _ensure_browser_initialized(self) -> "BrowserContext":
         """Ensure browser and context are initialized."""
+        from browser_use import Browser as BrowserUseBrowser
+        from browser_use import BrowserConfig
+        from browser_use.browser.context import BrowserContextConfig
+        from browser_use.dom.service import DomService
+
         if self.browser is None:
             browser_config_kwargs = {"headless": False, "disable_security": True}
 
@@ -253,6 +260,10 @@ class BrowserUseTool(BaseTool, Generic[Context]):
                         return ToolResult(
                             error="Query is required for 'web_search' action"
                         )
+                    if self.web_search_tool is None:
+                        from app.tool.web_search import WebSearch
+
+                        self.web_search_tool = WebSearch()
                     # Execute the web search and return results directly without browser navigation
                     search_response = await self.web_search_tool.execute(
                         query=query, fetch_content=True, num_results=1
@@ -477,7 +488,7 @@ Page content:
                 return ToolResult(error=f"Browser action '{action}' failed: {str(e)}")
 
     async def get_current_state(
-        self, context: Optional[BrowserContext] = None
+        self, context: Optional["BrowserContext"] = None
     ) -> ToolResult:
         """
         Get the current browser state as a ToolResult.
@@ -2,9 +2,9 @@
 
 import asyncio
 from pathlib import Path
-from typing import Optional, Protocol, Tuple, Union, runtime_checkable
+from typing import Dict, List, Optional, Protocol, Tuple, Union, runtime_checkable
 
-from app.config import SandboxSettings
+from app.config import config
 from app.exceptions import ToolError
 from app.sandbox.client import SANDBOX_CLIENT
 
@@ -32,6 +32,18 @@ class FileOperator(Protocol):
         """Check if path exists."""
         ...
 
+    async def read_files(self, paths: List[PathLike]) -> Dict[str, str]:
+        """Read several files, keyed by path."""
+        ...
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several files, given as path -> content."""
+        ...
+
+    async def stat_files(self, paths: List[PathLike]) -> Dict[str, Optional[str]]:
+        """Return "directory", "file" or None (missing) for several paths."""
+        ...
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
@@ -66,6 +78,28 @@ class LocalFileOperator(FileOperator):
         """Check if path exists."""
         return Path(path).exists()
 
+    async def read_files(self, paths: List[PathLike]) -> Dict[str, str]:
+        """Read several local files."""
+        return {str(path): await self.read_file(path) for path in paths}
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several local files."""
+        for path, content in files.items():
+            await self.write_file(path, content)
+
+    async def stat_files(self, paths: List[PathLike]) -> Dict[str, Optional[str]]:
+        """Check several local paths."""
+        return {
+            str(path): (
+                "directory"
+                if Path(path).is_dir()
+                else "file"
+                if Path(path).exists()
+                else None
+            )
+            for path in paths
+        }
+
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
     ) -> Tuple[int, str, str]:
@@ -102,7 +136,7 @@ class SandboxFileOperator(FileOperator):
     async def _ensure_sandbox_initialized(self):
         """Ensure sandbox is initialized."""
         if not self.sandbox_client.sandbox:
-            await self.sandbox_client.create(config=SandboxSettings())
+            await self.sandbox_client.create(config=config.sandbox)
 
     async def read_file(self, path: PathLike) -> str:
         """Read content from a file in sandbox."""
@@ -114,27 +148,41 @@ class SandboxFileOperator(FileOperator):
 
     async def write_file(self, path: PathLike, content: str) -> None:
         """Write content to a file in sandbox."""
-        await self._ensure_sandbox_initialized()
-        try:
-            await self.sandbox_client.write_file(str(path), content)
-        except Exception as e:
-            raise ToolError(f"Failed to write to {path} in sandbox: {str(e)}") from None
+        await self.write_files({path: content})
 
     async def is_directory(self, path: PathLike) -> bool:
         """Check if path points to a directory in sandbox."""
-        await self._ensure_sandbox_initialized()
-        result = await self.sandbox_client.run_command(
-            f"test -d {path} && echo 'true' || echo 'false'"
-        )
-        return result.strip() == "true"
+        return (await self.stat_files([path]))[str(path)] == "directory"
 
     async def exists(self, path: PathLike) -> bool:
         """Check if path exists in sandbox."""
+        return (await self.stat_files([path]))[str(path)] is not None
+
+    async def read_files(self, paths: List[PathLike]) -> Dict[str, str]:
+        """Read several files from sandbox in one round trip."""
         await self._ensure_sandbox_initialized()
-        result = await self.sandbox_client.run_command(
-            f"test -e {path} && echo 'true' || echo 'false'"
-        )
-        return result.strip() == "true"
+        try:
+            return await self.sandbox_client.read_files([str(p) for p in paths])
+        except Exception as e:
+            raise ToolError(f"Failed to read files in sandbox: {str(e)}") from None
+
+    async def write_files(self, files: Dict[PathLike, str]) -> None:
+        """Write several files to sandbox in one round trip."""
+        await self._ensure_sandbox_initialized()
+        try:
+            await self.sandbox_client.write_files(
+                {str(path): content for path, content in files.items()}
+            )
+        except Exception as e:
+            paths = ", ".join(str(path) for path in files)
+            raise ToolError(
+                f"Failed to write to {paths} in sandbox: {str(e)}"
+            ) from None
+
+    async def stat_files(self, paths: List[PathLike]) -> Dict[str, Optional[str]]:
+        """Check several paths in sandbox in one round trip."""
+        await self._ensure_sandbox_initialized()
+        return await self.sandbox_client.stat_files([str(p) for p in paths])
 
     async def run_command(
         self, cmd: str, timeout: Optional[float] = 120.0
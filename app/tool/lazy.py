@@ -0,0 +1,53 @@
+import asyncio
+from functools import partial
+from typing import Any, Callable, Optional, Type
+
+from pydantic import Field
+
+from app.logger import logger
+from app.tool.base import BaseTool
+
+
+class LazyTool(BaseTool):
+    """Registers a tool by its schema and builds it on first use.
+
+    Name, description, parameters and ``parallel_safe`` are read from the
+    field defaults of the tool class, so listing the tool to the LLM does not
+    construct it. The real tool is created on the first ``execute``, which
+    keeps agent creation cheap for tools a run may never call.
+    """
+
+    factory: Callable[[], BaseTool] = Field(..., exclude=True)
+    tool: Optional[BaseTool] = Field(default=None, exclude=True)
+
+    @classmethod
+    def of(cls, tool_cls: Type[BaseTool], *args, **kwargs) -> "LazyTool":
+        """Wrap a tool class; arguments are passed to it when it is built."""
+        fields = tool_cls.model_fields
+        return cls(
+            name=fields["name"].default,
+            description=fields["description"].default,
+            parameters=fields["parameters"].default,
+            parallel_safe=fields["parallel_safe"].default,
+            factory=partial(tool_cls, *args, **kwargs),
+        )
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.tool is not None
+
+    def load(self) -> BaseTool:
+        """Build the wrapped tool, if that has not happened yet."""
+        if self.tool is None:
+            logger.info(f"Loading tool '{self.name}' on first use")
+            self.tool = self.factory()
+        return self.tool
+
+    async def execute(self, **kwargs) -> Any:
+        return await self.load().execute(**kwargs)
+
+    async def cleanup(self) -> None:
+        """Clean up the wrapped tool, if it was ever built."""
+        cleanup = getattr(self.tool, "cleanup", None)
+        if cleanup and asyncio.iscoroutinefunction(cleanup):
+            await cleanup()
@@ -1,175 +1,547 @@
+import asyncio
+import hashlib
+import json
+import time
 from contextlib import AsyncExitStack
-from typing import Dict, List, Optional
+from typing import AsyncContextManager, Callable, Dict, List, Optional, Set
 
+import anyio
+import httpx
 from mcp.client.sse import sse_client
 from mcp.client.stdio import stdio_client
-from mcp.types import ListToolsResult, TextContent
-
+from mcp.types import (
+    ListToolsResult,
+    ServerNotification,
+    TextContent,
+    Tool,
+    ToolListChangedNotification,
+)
+from pydantic import BaseModel, Field
+
+from app.config import config
 from app.logger import logger
 from app.tool.base import BaseTool, ToolResult
 from app.tool.tool_collection import ToolCollection
 from mcp import ClientSession, StdioServerParameters
 
 
+# Runners left closing in the background, referenced so they are not collected
+_closing_runners: Set[asyncio.Task] = set()
+
+# Raised by a call whose session lost its transport, as opposed to a tool error
+_CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    httpx.TransportError,
+)
+
+
+def _tools_digest(tools: List[Tool]) -> str:
+    """Hash a tool listing, independent of the order the server lists it in."""
+    payload = [tool.model_dump(mode="json") for tool in tools]
+    payload.sort(key=lambda tool: tool["name"])
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def _hints_idempotent(tool: Tool) -> bool:
+    """Whether the server annotates a tool as read-only or idempotent."""
+    annotations = (tool.model_extra or {}).get("annotations") or {}
+    return bool(annotations.get("readOnlyHint") or annotations.get("idempotentHint"))
+
+
+class MCPToolListing(BaseModel):
+    """Cached tools/list result of one MCP server."""
+
+    tools: List[Tool] = Field(default_factory=list)
+    digest: str = ""
+    fetched_at: float = 0.0
+    notifies_changes: bool = Field(
+        False, description="Whether the server sends tools/list_changed"
+    )
+    stale: bool = False
+
+
+class MCPConnection:
+    """Connection to one MCP server, kept alive by its runner task.
+
+    The session is replaced whenever the runner reconnects; tools wait on
+    the connection to pick up the new session.
+    """
+
+    def __init__(self, server_id: str):
+        self.server_id = server_id
+        self.session: Optional[ClientSession] = None
+        self.runner: Optional[asyncio.Task] = None
+        self.stop = asyncio.Event()
+        self.closed = False
+        self._changed = asyncio.Condition()
+
+    async def set_session(self, session: Optional[ClientSession]) -> None:
+        async with self._changed:
+            self.session = session
+            self._changed.notify_all()
+
+    async def close(self) -> None:
+        async with self._changed:
+            self.closed = True
+            self._changed.notify_all()
+
+    async def wait_for_new_session(
+        self, previous: Optional[ClientSession], timeout: Optional[float]
+    ) -> Optional[ClientSession]:
+        """Wait until the runner replaces ``previous`` with a live session.
+
+        Returns:
+            The new session, or None if the connection closed or timed out.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait_for(
+                        lambda: self.closed
+                        or (self.session is not None and self.session is not previous)
+                    ),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return None
+            return None if self.closed else self.session
+
+
 class MCPClientTool(BaseTool):
     """Represents a tool proxy that can be called on the MCP server from the client side."""
 
     session: Optional[ClientSession] = None
     server_id: str = ""  # Add server identifier
     original_name: str = ""
+    connection: Optional[MCPConnection] = Field(default=None, exclude=True)
+    idempotent: bool = False  # Safe to call again if the connection drops
 
     async def execute(self, **kwargs) -> ToolResult:
         """Execute the tool by making a remote call to the MCP server."""
         if not self.session:
             return ToolResult(error="Not connected to MCP server")
 
+        session = self.session
         try:
             logger.info(f"Executing tool: {self.original_name}")
-            result = await self.session.call_tool(self.original_name, kwargs)
-            content_str = ", ".join(
-                item.text for item in result.content if isinstance(item, TextContent)
+            return await self._call(session, kwargs)
+        except _CONNECTION_ERRORS as e:
+            # The call may or may not have reached the server
+            if not (self.idempotent and self.connection):
+                return ToolResult(error=f"Error executing tool: {str(e) or repr(e)}")
+            logger.warning(
+                f"Tool {self.original_name} lost its connection, retrying after reconnect: {e!r}"
             )
-            return ToolResult(output=content_str or "No output returned.")
+        except Exception as e:
+            # Tool and server errors are reported at once, never retried
+            return ToolResult(error=f"Error executing tool: {str(e) or repr(e)}")
+
+        session = await self.connection.wait_for_new_session(
+            session, config.mcp_config.connect_timeout
+        )
+        if not session:
+            return ToolResult(error="Error executing tool: MCP server unavailable")
+        try:
+            return await self._call(session, kwargs)
         except Exception as e:
             return ToolResult(error=f"Error executing tool: {str(e)}")
 
+    async def _call(self, session: ClientSession, arguments: Dict) -> ToolResult:
+        result = await session.call_tool(self.original_name, arguments)
+        content_str = ", ".join(
+            item.text for item in result.content if isinstance(item, TextContent)
+        )
+        return ToolResult(output=content_str or "No output returned.")
+
 
 class MCPClients(ToolCollection):
     """
     A collection of tools that connects to multiple MCP servers and manages available tools through the Model Context Protocol.
+
+    Each server connection is owned by its own runner task, which enters and
+    exits the transport and session contexts. Connections to different servers
+    can therefore be opened concurrently and closed from any task.
+
+    Once connected, the runner pings the server every
+    ``health_check_interval`` seconds and reconnects with exponential backoff
+    when the connection drops or a ping fails. Tools marked idempotent retry
+    a call that was cut off by the drop on the new session.
+
+    Tool listings are cached per server with a content hash. A listing is
+    fetched again only after the server sends tools/list_changed or, for
+    servers that do not announce that notification, once it is older than
+    ``tool_list_ttl`` seconds.
     """
 
-    sessions: Dict[str, ClientSession] = {}
-    exit_stacks: Dict[str, AsyncExitStack] = {}
+    sessions: Dict[str, ClientSession]
+    connections: Dict[str, MCPConnection]
+    listings: Dict[str, MCPToolListing]
     description: str = "MCP client tools for server interaction"
 
     def __init__(self):
         super().__init__()  # Initialize with empty tools list
         self.name = "mcp"  # Keep name for backward compatibility
-
-    async def connect_sse(self, server_url: str, server_id: str = "") -> None:
+        self.sessions = {}
+        self.connections = {}
+        self.listings = {}
+        settings = config.mcp_config
+        self.tool_list_ttl = settings.tool_list_ttl
+        self.health_check_interval = settings.health_check_interval
+        self.ping_timeout = settings.ping_timeout
+        self.reconnect_delay = settings.reconnect_delay
+        self.max_reconnect_delay = settings.max_reconnect_delay
+        self.max_reconnect_attempts = settings.max_reconnect_attempts
+
+    async def connect_sse(
+        self, server_url: str, server_id: str = "", timeout: Optional[float] = None
+    ) -> None:
         """Connect to an MCP server using SSE transport."""
         if not server_url:
             raise ValueError("Server URL is required.")
 
         server_id = server_id or server_url
-
-        # Always ensure clean disconnection before new connection
-        if server_id in self.sessions:
-            await self.disconnect(server_id)
-
-        exit_stack = AsyncExitStack()
-        self.exit_stacks[server_id] = exit_stack
-
-        streams_context = sse_client(url=server_url)
-        streams = await exit_stack.enter_async_context(streams_context)
-        session = await exit_stack.enter_async_context(ClientSession(*streams))
-        self.sessions[server_id] = session
-
-        await self._initialize_and_list_tools(server_id)
+        await self._connect(server_id, lambda: sse_client(url=server_url), timeout)
 
     async def connect_stdio(
-        self, command: str, args: List[str], server_id: str = ""
+        self,
+        command: str,
+        args: List[str],
+        server_id: str = "",
+        timeout: Optional[float] = None,
     ) -> None:
         """Connect to an MCP server using stdio transport."""
         if not command:
             raise ValueError("Server command is required.")
 
         server_id = server_id or command
+        server_params = StdioServerParameters(command=command, args=args)
+        await self._connect(server_id, lambda: stdio_client(server_params), timeout)
+
+    async def _connect(
+        self,
+        server_id: str,
+        transport: Callable[[], AsyncContextManager],
+        timeout: Optional[float],
+    ) -> None:
+        """Start the runner task of a server and wait until its tools are listed.
+
+        Args:
+            server_id: Identifier of the server.
+            transport: Factory of the transport context yielding (read, write).
+            timeout: Seconds to wait for the handshake, or None to wait forever.
 
+        Raises:
+            asyncio.TimeoutError: If the server is not ready within the timeout.
+        """
         # Always ensure clean disconnection before new connection
-        if server_id in self.sessions:
+        if server_id in self.connections:
             await self.disconnect(server_id)
 
-        exit_stack = AsyncExitStack()
-        self.exit_stacks[server_id] = exit_stack
-
-        server_params = StdioServerParameters(command=command, args=args)
-        stdio_transport = await exit_stack.enter_async_context(
-            stdio_client(server_params)
+        connection = MCPConnection(server_id)
+        ready = asyncio.get_running_loop().create_future()
+        connection.runner = asyncio.create_task(
+            self._run_session(connection, transport, ready),
+            name=f"mcp-{server_id}",
         )
-        read, write = stdio_transport
-        session = await exit_stack.enter_async_context(ClientSession(read, write))
-        self.sessions[server_id] = session
+        self.connections[server_id] = connection
+
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), timeout)
+        except BaseException:
+            # Timed out, failed or cancelled: drop the half-open connection and
+            # let it close in the background, since a stdio server stuck in its
+            # own start-up only exits once that start-up is over
+            runner = connection.runner
+            self._forget(connection)
+            if not runner.done():
+                runner.cancel()
+                _closing_runners.add(runner)
+                runner.add_done_callback(_closing_runners.discard)
+            raise
+
+    async def _run_session(
+        self,
+        connection: MCPConnection,
+        transport: Callable[[], AsyncContextManager],
+        ready: asyncio.Future,
+    ) -> None:
+        """Own the connection of one server until it is asked to stop.
+
+        The first connection attempt reports to ``ready`` and is not retried;
+        after that, a lost connection is reopened with exponential backoff.
+        """
+        server_id = connection.server_id
+        attempt = 0
+        try:
+            while not connection.stop.is_set():
+                try:
+                    await self._serve_session(connection, transport, ready)
+                    attempt = 0
+                except Exception as e:
+                    if not ready.done():
+                        ready.set_exception(e)
+                        return
+                    logger.warning(f"MCP server {server_id} connection failed: {e}")
+                # The transport's task groups may absorb a cancellation of the runner
+                if asyncio.current_task().cancelling():
+                    raise asyncio.CancelledError()
+                if connection.stop.is_set():
+                    break
+
+                attempt += 1
+                if 0 < self.max_reconnect_attempts < attempt:
+                    logger.error(
+                        f"Giving up on MCP server {server_id} after {attempt - 1} reconnect attempts"
+                    )
+                    break
+                delay = min(
+                    self.reconnect_delay * 2 ** (attempt - 1), self.max_reconnect_delay
+                )
+                logger.info(f"Reconnecting to MCP server {server_id} in {delay:.1f}s")
+                try:
+                    await asyncio.wait_for(connection.stop.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            ready.cancel()
+            raise
+        finally:
+            await connection.close()
+            self._forget(connection)
+
+    async def _serve_session(
+        self,
+        connection: MCPConnection,
+        transport: Callable[[], AsyncContextManager],
+        ready: asyncio.Future,
+    ) -> None:
+        """Open one session and keep it until it is lost or asked to stop."""
+        server_id = connection.server_id
+        async with AsyncExitStack() as exit_stack:
+            read, write = await exit_stack.enter_async_context(transport())
+            session = await exit_stack.enter_async_context(ClientSession(read, write))
+            watcher = asyncio.create_task(self._watch_notifications(server_id, session))
+            try:
+                await self._initialize_and_list_tools(server_id, session)
+                await connection.set_session(session)
+                if not ready.done():
+                    ready.set_result(None)
+                await self._supervise(connection, session, watcher)
+            finally:
+                watcher.cancel()
+
+    async def _supervise(
+        self,
+        connection: MCPConnection,
+        session: ClientSession,
+        watcher: asyncio.Task,
+    ) -> None:
+        """Return once the connection is asked to stop or found to be dead.
 
-        await self._initialize_and_list_tools(server_id)
+        The notification watcher ends when the transport closes; a server that
+        stays connected but stops answering is caught by the periodic ping.
+        """
+        server_id = connection.server_id
+        stopped = asyncio.create_task(connection.stop.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    {stopped, watcher},
+                    timeout=self.health_check_interval,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if stopped in done:
+                    return
+                if watcher in done:
+                    logger.warning(f"Lost connection to MCP server {server_id}")
+                    return
+                try:
+                    await asyncio.wait_for(session.send_ping(), self.ping_timeout)
+                except Exception as e:
+                    logger.warning(
+                        f"MCP server {server_id} failed its health check: {e!r}"
+                    )
+                    return
+        finally:
+            stopped.cancel()
+
+    def _forget(self, connection: MCPConnection) -> None:
+        """Drop the session and tools of a server, if still owned by the connection."""
+        server_id = connection.server_id
+        if self.connections.get(server_id) is not connection:
+            return
+        self.sessions.pop(server_id, None)
+        self.connections.pop(server_id, None)
+        self.listings.pop(server_id, None)
+        self.tool_map = {
+            k: v for k, v in self.tool_map.items() if v.server_id != server_id
+        }
+        self.tools = tuple(self.tool_map.values())
 
-    async def _initialize_and_list_tools(self, server_id: str) -> None:
+    async def _watch_notifications(self, server_id: str, session: ClientSession):
+        """Consume the messages a session delivers outside of responses.
+
+        The session hands server notifications to an unbuffered stream, so
+        reading it also keeps notifications from stalling the session.
+        """
+        async for message in session.incoming_messages:
+            if isinstance(message, ServerNotification) and isinstance(
+                message.root, ToolListChangedNotification
+            ):
+                listing = self.listings.get(server_id)
+                if listing:
+                    listing.stale = True
+                logger.info(f"MCP server {server_id} reported changed tools")
+
+    async def _initialize_and_list_tools(
+        self, server_id: str, session: ClientSession
+    ) -> None:
         """Initialize session and populate tool map."""
-        session = self.sessions.get(server_id)
-        if not session:
-            raise RuntimeError(f"Session not initialized for server {server_id}")
+        result = await session.initialize()
+        reconnected = server_id in self.sessions
+        self.sessions[server_id] = session
 
-        await session.initialize()
-        response = await session.list_tools()
+        # Tools keep their identity across reconnects and follow the new session
+        for tool in self.tool_map.values():
+            if tool.server_id == server_id:
+                tool.session = session
+        capability = result.capabilities.tools
+        listing = self.listings.setdefault(server_id, MCPToolListing())
+        listing.notifies_changes = bool(capability and capability.listChanged)
+        await self._refresh_listing(server_id)
+
+        if reconnected:
+            logger.info(f"Reconnected to MCP server {server_id}")
+        else:
+            logger.info(
+                f"Connected to server {server_id} with tools: {[tool.name for tool in listing.tools]}"
+            )
+
+    async def _refresh_listing(self, server_id: str) -> bool:
+        """Fetch the tools of a server and update its entries if they changed.
 
-        # Create proper tool objects for each server tool
+        Returns:
+            bool: Whether the listing differs from the cached one.
+        """
+        session = self.sessions[server_id]
+        listing = self.listings[server_id]
+        # Cleared before the call, so a change reported meanwhile is kept
+        listing.stale = False
+        try:
+            response = await session.list_tools()
+        except Exception:
+            listing.stale = True
+            raise
+        listing.fetched_at = time.monotonic()
+
+        digest = _tools_digest(response.tools)
+        if digest == listing.digest:
+            return False
+        listing.tools = response.tools
+        listing.digest = digest
+
+        server_config = config.mcp_config.servers.get(server_id)
+        idempotent_tools = server_config.idempotent_tools if server_config else []
+        connection = self.connections.get(server_id)
+
+        # Create proper tool objects for each server tool, updating existing
+        # ones in place so collections holding them see the change
+        tool_map = {k: v for k, v in self.tool_map.items() if v.server_id != server_id}
         for tool in response.tools:
             original_name = tool.name
             # Always prefix with server_id to ensure uniqueness
             tool_name = f"mcp_{server_id}_{original_name}"
 
-            server_tool = MCPClientTool(
-                name=tool_name,
+            fields = dict(
                 description=tool.description,
                 parameters=tool.inputSchema,
                 session=session,
-                server_id=server_id,
-                original_name=original_name,
+                connection=connection,
+                idempotent=original_name in idempotent_tools or _hints_idempotent(tool),
             )
-            self.tool_map[tool_name] = server_tool
+            server_tool = self.tool_map.get(tool_name)
+            if server_tool:
+                for field, value in fields.items():
+                    setattr(server_tool, field, value)
+            else:
+                server_tool = MCPClientTool(
+                    name=tool_name,
+                    server_id=server_id,
+                    original_name=original_name,
+                    **fields,
+                )
+            tool_map[tool_name] = server_tool
 
         # Update tools tuple
+        self.tool_map = tool_map
         self.tools = tuple(self.tool_map.values())
-        logger.info(
-            f"Connected to server {server_id} with tools: {[tool.name for tool in response.tools]}"
+        return True
+
+    def _needs_refresh(self, listing: MCPToolListing) -> bool:
+        if listing.stale:
+            return True
+        if listing.notifies_changes:
+            return False
+        return time.monotonic() - listing.fetched_at >= self.tool_list_ttl
+
+    @property
+    def digest(self) -> str:
+        """Hash of the cached listings of all connected servers."""
+        combined = "".join(
+            f"{server_id}:{self.listings[server_id].digest};"
+            for server_id in sorted(self.sessions)
+            if server_id in self.listings
         )
+        return hashlib.sha256(combined.encode()).hexdigest()
 
     async def list_tools(self) -> ListToolsResult:
-        """List all available tools."""
+        """List all available tools.
+
+        Served from the cached listings; only servers whose listing is stale
+        or expired are asked again, concurrently.
+        """
+        expired = [
+            server_id
+            for server_id, listing in self.listings.items()
+            if server_id in self.sessions and self._needs_refresh(listing)
+        ]
+        results = await asyncio.gather(
+            *(self._refresh_listing(server_id) for server_id in expired),
+            return_exceptions=True,
+        )
+        for server_id, result in zip(expired, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Failed to list tools of MCP server {server_id}: {result}"
+                )
+
         tools_result = ListToolsResult(tools=[])
-        for session in self.sessions.values():
-            response = await session.list_tools()
-            tools_result.tools += response.tools
+        for server_id in self.sessions:
+            listing = self.listings.get(server_id)
+            if listing:
+                tools_result.tools += listing.tools
         return tools_result
 
     async def disconnect(self, server_id: str = "") -> None:
         """Disconnect from a specific MCP server or all servers if no server_id provided."""
         if server_id:
-            if server_id in self.sessions:
+            connection = self.connections.get(server_id)
+            if connection:
                 try:
-                    exit_stack = self.exit_stacks.get(server_id)
-
-                    # Close the exit stack which will handle session cleanup
-                    if exit_stack:
-                        try:
-                            await exit_stack.aclose()
-                        except RuntimeError as e:
-                            if "cancel scope" in str(e).lower():
-                                logger.warning(
-                                    f"Cancel scope error during disconnect from {server_id}, continuing with cleanup: {e}"
-                                )
-                            else:
-                                raise
-
-                    # Clean up references
-                    self.sessions.pop(server_id, None)
-                    self.exit_stacks.pop(server_id, None)
-
-                    # Remove tools associated with this server
-                    self.tool_map = {
-                        k: v
-                        for k, v in self.tool_map.items()
-                        if v.server_id != server_id
-                    }
-                    self.tools = tuple(self.tool_map.values())
+                    # The runner closes the session in the task that opened it
+                    connection.stop.set()
+                    await connection.runner
                     logger.info(f"Disconnected from MCP server {server_id}")
                 except Exception as e:
                     logger.error(f"Error disconnecting from server {server_id}: {e}")
         else:
-            # Disconnect from all servers in a deterministic order
-            for sid in sorted(list(self.sessions.keys())):
-                await self.disconnect(sid)
+            # Disconnect from all servers concurrently
+            await asyncio.gather(
+                *(self.disconnect(sid) for sid in sorted(self.connections))
+            )
             self.tool_map = {}
             self.tools = tuple()
             logger.info("Disconnected from all MCP servers")
@@ -1,11 +1,364 @@
+import asyncio
+import atexit
+import builtins
+import importlib
 import multiprocessing
+import os
+import queue
 import sys
+import threading
+import time
 from io import StringIO
-from typing import Dict
+from typing import Dict, List, Optional
 
+from app.config import PythonExecuteSettings, config
+from app.logger import logger
 from app.tool.base import BaseTool
 
 
+def _rss_mb() -> float:
+    """Resident memory of the current process in megabytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _worker_main(conn, preload_modules: List[str], persistent: bool = False) -> None:
+    """Worker loop: receive code over the pipe, run it, send back the result.
+
+    A persistent worker keeps its globals between snippets, so variables and
+    loaded data survive from one call to the next.
+    """
+    for module in preload_modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            pass
+
+    session_globals = {"__builtins__": builtins.__dict__.copy()}
+    while True:
+        try:
+            code = conn.recv()
+        except EOFError:
+            break
+        if code is None:
+            break
+
+        original_stdout = sys.stdout
+        output_buffer = StringIO()
+        try:
+            sys.stdout = output_buffer
+            safe_globals = (
+                session_globals
+                if persistent
+                else {"__builtins__": builtins.__dict__.copy()}
+            )
+            exec(code, safe_globals, safe_globals)
+            result = {"observation": output_buffer.getvalue(), "success": True}
+        except BaseException as e:
+            result = {"observation": str(e), "success": False}
+        finally:
+            sys.stdout = original_stdout
+        if persistent:
+            result["memory_mb"] = _rss_mb()
+        conn.send(result)
+
+
+class _PythonWorker:
+    """A warm interpreter process that runs code snippets sent over a pipe."""
+
+    def __init__(self, ctx, preload_modules: List[str], persistent: bool = False):
+        self._conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, preload_modules, persistent)
+        )
+        self.process.start()
+        child_conn.close()
+        self.calls = 0
+        self.last_used = time.monotonic()
+        # Serializes calls when the worker backs a stateful session
+        self.lock = threading.Lock()
+
+    def run(self, code: str, timeout: float) -> Optional[Dict]:
+        """Run code in the worker, returning None if it did not answer in time.
+
+        Raises:
+            EOFError: If the worker died while running the code.
+        """
+        self.calls += 1
+        self.last_used = time.monotonic()
+        self._conn.send(code)
+        if not self._conn.poll(timeout):
+            return None
+        return self._conn.recv()
+
+    def kill(self) -> None:
+        """Kill the worker process immediately."""
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        self._conn.close()
+
+    def close(self) -> None:
+        """Ask the worker to exit, killing it if it does not stop."""
+        try:
+            self._conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        self.kill()
+
+
+class PythonWorkerPool:
+    """A pool of pre-started Python worker processes.
+
+    Heavy modules are imported once by the fork server and inherited by every
+    worker. A worker that times out or dies is killed and replaced without
+    touching the others, and workers are recycled after a number of calls to
+    keep their memory bounded.
+    """
+
+    _instance: Optional["PythonWorkerPool"] = None
+    _instance_lock = threading.Lock()
+
+    # How often a caller waiting for a worker re-checks the pool
+    _poll_interval = 0.5
+
+    def __init__(self, settings: Optional[PythonExecuteSettings] = None):
+        self.settings = settings or PythonExecuteSettings()
+        start_method = self.settings.start_method
+        if start_method not in multiprocessing.get_all_start_methods():
+            start_method = "spawn"
+        self._ctx = multiprocessing.get_context(start_method)
+        if start_method == "forkserver":
+            self._ctx.set_forkserver_preload([__name__, *self.settings.preload_modules])
+
+        self._idle: "queue.Queue[_PythonWorker]" = queue.Queue()
+        self._workers: List[_PythonWorker] = []
+        self._sessions: Dict[str, _PythonWorker] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self._closed = False
+        atexit.register(self.shutdown)
+
+    @classmethod
+    def get_instance(cls) -> "PythonWorkerPool":
+        """Get the process-wide pool, creating it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(config.python_execute_config)
+            return cls._instance
+
+    def _reserve_slot(self) -> bool:
+        """Claim room for one more worker, if the pool is not full."""
+        with self._lock:
+            if self._closed or self._size >= max(1, self.settings.pool_size):
+                return False
+            self._size += 1
+            return True
+
+    def _start_worker(self) -> _PythonWorker:
+        try:
+            worker = _PythonWorker(self._ctx, self.settings.preload_modules)
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _acquire(self) -> _PythonWorker:
+        """Take an idle worker, starting one if the pool has room.
+
+        Waiting callers re-check the pool regularly, so a slot freed by a
+        replacement that failed to start is taken over instead of waited on.
+
+        Raises:
+            RuntimeError: If the pool has been shut down.
+            TimeoutError: If no worker became free within acquire_timeout.
+        """
+        deadline = time.monotonic() + self.settings.acquire_timeout
+        while True:
+            if self._closed:
+                raise RuntimeError("Python worker pool has been shut down")
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            if self._reserve_slot():
+                return self._start_worker()
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(
+                    f"No Python worker became available within {self.settings.acquire_timeout} seconds"
+                )
+            try:
+                return self._idle.get(timeout=min(remaining, self._poll_interval))
+            except queue.Empty:
+                pass
+
+    def _release(self, worker: _PythonWorker) -> None:
+        if self._closed:
+            worker.close()
+        elif worker.calls >= self.settings.recycle_after:
+            self._replace(worker, worker.close)
+        else:
+            self._idle.put(worker)
+
+    def _replace(self, worker: _PythonWorker, stop) -> None:
+        """Stop a worker and start a fresh one in its place in the background."""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+                self._size -= 1
+        stop()
+        threading.Thread(target=self._warm_up, daemon=True).start()
+
+    def _warm_up(self) -> None:
+        if not self._reserve_slot():
+            return
+        try:
+            self._idle.put(self._start_worker())
+        except Exception as e:
+            # The slot is free again, so the next caller starts a worker itself
+            logger.error(f"Failed to start replacement Python worker: {e}")
+
+    def run(self, code: str, timeout: float) -> Dict:
+        """Run code on a pooled worker. Blocks, so call it from a thread."""
+        worker = self._acquire()
+        try:
+            result = worker.run(code, timeout)
+        except (EOFError, BrokenPipeError, OSError):
+            self._replace(worker, worker.kill)
+            return {
+                "observation": "Python worker exited unexpectedly",
+                "success": False,
+            }
+
+        if result is None:
+            self._replace(worker, worker.kill)
+            return {
+                "observation": f"Execution timeout after {timeout} seconds",
+                "success": False,
+            }
+
+        self._release(worker)
+        return result
+
+    def run_in_session(self, session_id: str, code: str, timeout: float) -> Dict:
+        """Run code in a stateful session. Blocks, so call it from a thread."""
+        self._evict_idle_sessions()
+        while True:
+            worker = self._get_session(session_id)
+            with worker.lock:
+                # The session may have been evicted before the lock was taken
+                with self._lock:
+                    current = self._sessions.get(session_id) is worker
+                if not current or not worker.process.is_alive():
+                    continue
+                try:
+                    result = worker.run(code, timeout)
+                except (EOFError, BrokenPipeError, OSError):
+                    self.close_session(session_id, kill=True)
+                    return {
+                        "observation": "Python worker exited unexpectedly, session state was reset",
+                        "success": False,
+                    }
+            break
+
+        if result is None:
+            self.close_session(session_id, kill=True)
+            return {
+                "observation": f"Execution timeout after {timeout} seconds, session state was reset",
+                "success": False,
+            }
+
+        memory_mb = result.pop("memory_mb", 0)
+        limit_mb = self.settings.session_memory_limit_mb
+        if limit_mb and memory_mb > limit_mb:
+            self.close_session(session_id)
+            logger.warning(
+                f"Python session {session_id} uses {memory_mb:.0f} MB (limit {limit_mb} MB), resetting it"
+            )
+            result[
+                "observation"
+            ] += f"\n[Session state was reset: memory use exceeded {limit_mb} MB]"
+        return result
+
+    def _get_session(self, session_id: str) -> _PythonWorker:
+        with self._lock:
+            worker = self._sessions.get(session_id)
+            if worker and worker.process.is_alive():
+                worker.last_used = time.monotonic()
+                return worker
+            if self._closed:
+                raise RuntimeError("Python worker pool has been shut down")
+            if len(self._sessions) >= self.settings.max_sessions:
+                raise RuntimeError(
+                    f"Maximum number of Python sessions ({self.settings.max_sessions}) reached"
+                )
+            worker = _PythonWorker(
+                self._ctx, self.settings.preload_modules, persistent=True
+            )
+            self._sessions[session_id] = worker
+        logger.info(f"Started Python session {session_id}")
+        return worker
+
+    def close_session(self, session_id: str, kill: bool = False) -> None:
+        """Close a stateful session and its worker, if it exists."""
+        with self._lock:
+            worker = self._sessions.pop(session_id, None)
+        if not worker:
+            return
+        if kill:
+            worker.kill()
+        else:
+            worker.close()
+
+    def _evict_idle_sessions(self) -> None:
+        timeout = self.settings.session_idle_timeout
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                (session_id, worker)
+                for session_id, worker in self._sessions.items()
+                if now - worker.last_used > timeout
+            ]
+        for session_id, worker in idle:
+            # Skip sessions in use; holding the lock keeps callers from
+            # running code on the worker while it is removed
+            if not worker.lock.acquire(blocking=False):
+                continue
+            try:
+                with self._lock:
+                    if self._sessions.get(session_id) is not worker:
+                        continue
+                    del self._sessions[session_id]
+            finally:
+                worker.lock.release()
+            logger.info(f"Closing idle Python session {session_id}")
+            worker.close()
+
+    def shutdown(self) -> None:
+        """Stop all workers and sessions."""
+        with self._lock:
+            self._closed = True
+            workers, self._workers = self._workers, []
+            sessions, self._sessions = list(self._sessions.values()), {}
+            self._size = 0
+        for worker in workers + sessions:
+            worker.close()
+
+
 class PythonExecute(BaseTool):
     """A tool for executing Python code with timeout and safety restrictions."""
 
@@ -21,20 +374,8 @@ class PythonExecute(BaseTool):
         },
         "required": ["code"],
     }
-
-    def _run_code(self, code: str, result_dict: dict, safe_globals: dict) -> None:
-        original_stdout = sys.stdout
-        try:
-            output_buffer = StringIO()
-            sys.stdout = output_buffer
-            exec(code, safe_globals, safe_globals)
-            result_dict["observation"] = output_buffer.getvalue()
-            result_dict["success"] = True
-        except Exception as e:
-            result_dict["observation"] = str(e)
-            result_dict["success"] = False
-        finally:
-            sys.stdout = original_stdout
+    # When set, globals persist between calls sharing this session id
+    session_id: Optional[str] = None
 
     async def execute(
         self,
@@ -51,25 +392,19 @@ class PythonExecute(BaseTool):
         Returns:
             Dict: Contains 'output' with execution output or error message and 'success' status.
         """
+        pool = PythonWorkerPool.get_instance()
+        try:
+            if self.session_id:
+                return await asyncio.to_thread(
+                    pool.run_in_session, self.session_id, code, timeout
+                )
+            return await asyncio.to_thread(pool.run, code, timeout)
+        except Exception as e:
+            logger.error(f"Failed to run code on python worker pool: {e}")
+            return {"observation": str(e), "success": False}
 
-        with multiprocessing.Manager() as manager:
-            result = manager.dict({"observation": "", "success": False})
-            if isinstance(__builtins__, dict):
-                safe_globals = {"__builtins__": __builtins__}
-            else:
-                safe_globals = {"__builtins__": __builtins__.__dict__.copy()}
-            proc = multiprocessing.Process(
-                target=self._run_code, args=(code, result, safe_globals)
-            )
-            proc.start()
-            proc.join(timeout)
-
-            # timeout process
-            if proc.is_alive():
-                proc.terminate()
-                proc.join(1)
-                return {
-                    "observation": f"Execution timeout after {timeout} seconds",
-                    "success": False,
-                }
-            return dict(result)
+    async def cleanup(self) -> None:
+        """Close the stateful session of this tool, if any."""
+        if self.session_id:
+            pool = PythonWorkerPool.get_instance()
+            await asyncio.to_thread(pool.close_session, self.session_id)
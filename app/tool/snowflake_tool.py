@@ -1,5 +1,7 @@
-from typing import Any, Dict, Optional
+import asyncio
+from typing import Any, Optional
 
+from app.agent.base_snowflake import BaseSnowflakeAgent
 from app.agent.org_authority import OrgAuthorityAgent
 from app.agent.person_authority import PersonAuthorityAgent
 from app.config import config
@@ -12,68 +14,104 @@ class SnowflakeTool(BaseTool):
 
     name: str = "snowflake"
     description: str = "Query Snowflake database using natural language"
+    parallel_safe: bool = True
+    parameters: dict = {
+        "type": "object",
+        "properties": {
+            "query": {
+                "type": "string",
+                "description": "Natural language query to execute on Snowflake",
+            },
+            "agent_type": {
+                "type": "string",
+                "description": "Type of agent to use ('org' or 'person', or 'both' to query both authorities at once)",
+                "enum": ["org", "person", "both"],
+                "default": "org",
+            },
+            "use_cache": {
+                "type": "boolean",
+                "description": "Set to false to bypass cached results and fetch fresh data",
+                "default": True,
+            },
+        },
+        "required": ["query"],
+    }
+    # Authority agents are built the first time a query needs them
     org_agent: Optional[OrgAuthorityAgent] = None
     person_agent: Optional[PersonAuthorityAgent] = None
 
-    def __init__(self):
-        super().__init__()
-        logger.info("Initializing SnowflakeTool")
-        self.org_agent = OrgAuthorityAgent(config=config)
-        self.person_agent = PersonAuthorityAgent(config=config)
-
-    async def execute(self, query: str, agent_type: str = "org") -> Any:
+    async def execute(
+        self, query: str, agent_type: str = "org", use_cache: bool = True
+    ) -> Any:
         """Execute a natural language query on Snowflake.
 
         Args:
             query: The natural language query to execute
-            agent_type: The type of agent to use ("org" or "person")
+            agent_type: The type of agent to use ("org", "person" or "both")
+            use_cache: Whether a recently cached result may be returned
         """
-        if agent_type == "org":
-            if not self.org_agent:
-                logger.info("Creating new OrgAuthorityAgent instance")
-                self.org_agent = OrgAuthorityAgent(config=config)
-            agent = self.org_agent
-        elif agent_type == "person":
-            if not self.person_agent:
-                logger.info("Creating new PersonAuthorityAgent instance")
-                self.person_agent = PersonAuthorityAgent(config=config)
-            agent = self.person_agent
-        else:
-            raise ValueError(
-                f"Invalid agent type: {agent_type}. Must be 'org' or 'person'"
-            )
+        if agent_type == "both":
+            return await self._execute_both(query, use_cache)
 
+        agent = self._get_agent(agent_type)
         try:
             logger.info(f"Executing Snowflake query using {agent_type} agent: {query}")
-            result = await agent.process_query(query)
+            result = await agent.process_query(query, use_cache=use_cache)
             logger.info("Snowflake query executed successfully")
             return result
         except Exception as e:
             logger.error(f"Error executing Snowflake query: {str(e)}")
             raise
 
-    def to_param(self) -> Dict[str, Any]:
-        """Convert tool to parameter format."""
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "query": {
-                            "type": "string",
-                            "description": "Natural language query to execute on Snowflake",
-                        },
-                        "agent_type": {
-                            "type": "string",
-                            "description": "Type of agent to use ('org' or 'person')",
-                            "enum": ["org", "person"],
-                            "default": "org",
-                        },
-                    },
-                    "required": ["query"],
-                },
-            },
+    def _get_agent(self, agent_type: str) -> BaseSnowflakeAgent:
+        if agent_type == "org":
+            if not self.org_agent:
+                logger.info("Creating new OrgAuthorityAgent instance")
+                self.org_agent = OrgAuthorityAgent(config=config)
+            return self.org_agent
+        if agent_type == "person":
+            if not self.person_agent:
+                logger.info("Creating new PersonAuthorityAgent instance")
+                self.person_agent = PersonAuthorityAgent(config=config)
+            return self.person_agent
+        raise ValueError(
+            f"Invalid agent type: {agent_type}. Must be 'org', 'person' or 'both'"
+        )
+
+    async def _execute_both(self, query: str, use_cache: bool) -> str:
+        """Ask both authorities at once and merge their answers.
+
+        Text-to-SQL and execution of the two agents overlap, so the call takes
+        about as long as the slower of the two. A failure of one authority is
+        reported next to the other's results; only a double failure raises.
+        """
+        agents = {
+            "Organization authority": self._get_agent("org"),
+            "Person authority": self._get_agent("person"),
         }
+        logger.info(f"Executing Snowflake query using org and person agents: {query}")
+        results = await asyncio.gather(
+            *(
+                agent.process_query(query, use_cache=use_cache)
+                for agent in agents.values()
+            ),
+            return_exceptions=True,
+        )
+
+        errors = [r for r in results if isinstance(r, Exception)]
+        if len(errors) == len(results):
+            logger.error(f"Error executing Snowflake query: {errors}")
+            raise Exception(
+                "Both authorities failed: "
+                + "; ".join(f"{label}: {e}" for label, e in zip(agents, errors))
+            )
+
+        sections = []
+        for label, result in zip(agents, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error executing Snowflake query ({label}): {result}")
+                sections.append(f"{label} results:\nError: {result}")
+            else:
+                sections.append(f"{label} results:\nSQL: {result.sql}\n{result}")
+        logger.info("Snowflake query executed successfully")
+        return "\n\n".join(sections)
@@ -127,16 +127,29 @@ class StrReplaceEditor(BaseTool):
         # Get the appropriate file operator
         operator = self._get_operator()
 
-        # Validate path and command combination
-        await self.validate_path(command, Path(path), operator)
+        # Commands that read the file do so straight away and only stat the
+        # path when the read fails, so a successful edit costs one read and
+        # one write
+        file_content = None
+        if command in ("view", "str_replace", "insert"):
+            file_content = await self._read_or_validate(command, Path(path), operator)
+            kind = "directory" if file_content is None else "file"
+        else:
+            kind = await self.validate_path(command, Path(path), operator)
 
         # Execute the appropriate command
         if command == "view":
-            result = await self.view(path, view_range, operator)
+            result = await self.view(
+                path,
+                view_range,
+                operator,
+                is_dir=kind == "directory",
+                file_content=file_content,
+            )
         elif command == "create":
             if file_text is None:
                 raise ToolError("Parameter `file_text` is required for command: create")
-            await operator.write_file(path, file_text)
+            await operator.write_files({path: file_text})
             self._file_history[path].append(file_text)
             result = ToolResult(output=f"File created successfully at: {path}")
         elif command == "str_replace":
@@ -144,7 +157,9 @@ class StrReplaceEditor(BaseTool):
                 raise ToolError(
                     "Parameter `old_str` is required for command: str_replace"
                 )
-            result = await self.str_replace(path, old_str, new_str, operator)
+            result = await self.str_replace(
+                path, old_str, new_str, operator, file_content=file_content
+            )
         elif command == "insert":
             if insert_line is None:
                 raise ToolError(
@@ -152,7 +167,9 @@ class StrReplaceEditor(BaseTool):
                 )
             if new_str is None:
                 raise ToolError("Parameter `new_str` is required for command: insert")
-            result = await self.insert(path, insert_line, new_str, operator)
+            result = await self.insert(
+                path, insert_line, new_str, operator, file_content=file_content
+            )
         elif command == "undo_edit":
             result = await self.undo_edit(path, operator)
         else:
@@ -165,43 +182,75 @@ class StrReplaceEditor(BaseTool):
 
     async def validate_path(
         self, command: str, path: Path, operator: FileOperator
-    ) -> None:
-        """Validate path and command combination based on execution environment."""
+    ) -> Optional[str]:
+        """Validate path and command combination based on execution environment.
+
+        Returns the kind of the path ("directory", "file" or None if missing),
+        found with a single stat so callers need not check it again.
+        """
         # Check if path is absolute
         if not path.is_absolute():
             raise ToolError(f"The path {path} is not an absolute path")
 
+        kind = (await operator.stat_files([path]))[str(path)]
+
         # Only check if path exists for non-create commands
         if command != "create":
-            if not await operator.exists(path):
+            if kind is None:
                 raise ToolError(
                     f"The path {path} does not exist. Please provide a valid path."
                 )
 
             # Check if path is a directory
-            is_dir = await operator.is_directory(path)
-            if is_dir and command != "view":
+            if kind == "directory" and command != "view":
                 raise ToolError(
                     f"The path {path} is a directory and only the `view` command can be used on directories"
                 )
 
         # Check if file exists for create command
         elif command == "create":
-            exists = await operator.exists(path)
-            if exists:
+            if kind is not None:
                 raise ToolError(
                     f"File already exists at: {path}. Cannot overwrite files using command `create`."
                 )
 
+        return kind
+
+    async def _read_or_validate(
+        self, command: str, path: Path, operator: FileOperator
+    ) -> Optional[str]:
+        """Read a file for a command, validating the path only if the read fails.
+
+        Returns None when the path is a directory being viewed.
+        """
+        if not path.is_absolute():
+            raise ToolError(f"The path {path} is not an absolute path")
+
+        try:
+            return await self._read(path, operator)
+        except ToolError:
+            # Raises the usual error for missing paths and misused directories
+            if await self.validate_path(command, path, operator) == "directory":
+                return None
+            raise
+
+    @staticmethod
+    async def _read(path: PathLike, operator: FileOperator) -> str:
+        """Read one file through the operator's batch call."""
+        return (await operator.read_files([path]))[str(path)]
+
     async def view(
         self,
         path: PathLike,
         view_range: Optional[List[int]] = None,
         operator: FileOperator = None,
+        is_dir: Optional[bool] = None,
+        file_content: Optional[str] = None,
     ) -> CLIResult:
         """Display file or directory content."""
-        # Determine if path is a directory
-        is_dir = await operator.is_directory(path)
+        # Determine if path is a directory, unless the caller already knows
+        if is_dir is None:
+            is_dir = await operator.is_directory(path)
 
         if is_dir:
             # Directory handling
@@ -213,7 +262,7 @@ class StrReplaceEditor(BaseTool):
             return await self._view_directory(path, operator)
         else:
             # File handling
-            return await self._view_file(path, operator, view_range)
+            return await self._view_file(path, operator, view_range, file_content)
 
     @staticmethod
     async def _view_directory(path: PathLike, operator: FileOperator) -> CLIResult:
@@ -236,10 +285,12 @@ class StrReplaceEditor(BaseTool):
         path: PathLike,
         operator: FileOperator,
         view_range: Optional[List[int]] = None,
+        file_content: Optional[str] = None,
     ) -> CLIResult:
         """Display file content, optionally within a specified line range."""
-        # Read file content
-        file_content = await operator.read_file(path)
+        # Read file content, unless the caller already has it
+        if file_content is None:
+            file_content = await self._read(path, operator)
         init_line = 1
 
         # Apply view range if specified
@@ -287,10 +338,13 @@ class StrReplaceEditor(BaseTool):
         old_str: str,
         new_str: Optional[str] = None,
         operator: FileOperator = None,
+        file_content: Optional[str] = None,
     ) -> CLIResult:
         """Replace a unique string in a file with a new string."""
         # Read file content and expand tabs
-        file_content = (await operator.read_file(path)).expandtabs()
+        if file_content is None:
+            file_content = await self._read(path, operator)
+        file_content = file_content.expandtabs()
         old_str = old_str.expandtabs()
         new_str = new_str.expandtabs() if new_str is not None else ""
 
@@ -317,7 +371,7 @@ class StrReplaceEditor(BaseTool):
         new_file_content = file_content.replace(old_str, new_str)
 
         # Write the new content to the file
-        await operator.write_file(path, new_file_content)
+        await operator.write_files({path: new_file_content})
 
         # Save the original content to history
         self._file_history[path].append(file_content)
@@ -343,10 +397,13 @@ class StrReplaceEditor(BaseTool):
         insert_line: int,
         new_str: str,
         operator: FileOperator = None,
+        file_content: Optional[str] = None,
     ) -> CLIResult:
         """Insert text at a specific line in a file."""
         # Read and prepare content
-        file_text = (await operator.read_file(path)).expandtabs()
+        if file_content is None:
+            file_content = await self._read(path, operator)
+        file_text = file_content.expandtabs()
         new_str = new_str.expandtabs()
         file_text_lines = file_text.split("\n")
         n_lines_file = len(file_text_lines)
@@ -377,7 +434,7 @@ class StrReplaceEditor(BaseTool):
         new_file_text = "\n".join(new_file_text_lines)
         snippet = "\n".join(snippet_lines)
 
-        await operator.write_file(path, new_file_text)
+        await operator.write_files({path: new_file_text})
         self._file_history[path].append(file_text)
 
         # Prepare success message
@@ -399,7 +456,7 @@ class StrReplaceEditor(BaseTool):
             raise ToolError(f"No edit history found for {path}.")
 
         old_text = self._file_history[path].pop()
-        await operator.write_file(path, old_text)
+        await operator.write_files({path: old_text})
 
         return CLIResult(
             output=f"Last edit to {path} undone successfully. {self._make_output(old_text, str(path))}"
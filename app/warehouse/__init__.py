@@ -0,0 +1,31 @@
+"""
+Data Warehouse Module
+
+Shared infrastructure for the Snowflake agents: pooled connections and
+non-blocking query execution streamed into compact columnar results, and
+caches for generated SQL and for query results, and a schema catalog that
+keeps text-to-SQL prompts small and generated SQL checked before it runs.
+Queries go through a pluggable backend; a local DuckDB stand-in with
+synthetic data runs the agents without a Snowflake account.
+"""
+from app.warehouse.backends import DuckDBBackend, QueryBackend
+from app.warehouse.catalog import SchemaCatalog
+from app.warehouse.pool import SnowflakeConnectionPool
+from app.warehouse.result_cache import ResultCache
+from app.warehouse.results import QueryResult, ResultCollector
+from app.warehouse.sql_cache import SQLCache
+from app.warehouse.validation import SQLValidationError, SQLValidator
+
+
+__all__ = [
+    "QueryBackend",
+    "DuckDBBackend",
+    "SnowflakeConnectionPool",
+    "QueryResult",
+    "ResultCollector",
+    "ResultCache",
+    "SQLCache",
+    "SchemaCatalog",
+    "SQLValidator",
+    "SQLValidationError",
+]
@@ -0,0 +1,281 @@
+import asyncio
+import hashlib
+import json
+import random
+import threading
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import pyarrow as pa
+import sqlglot
+from sqlglot import exp
+
+from app.config import WarehouseSettings, config
+from app.logger import logger
+from app.warehouse.catalog import CatalogTable, SchemaCatalog
+from app.warehouse.results import QueryResult, ResultCollector
+
+
+class QueryBackend(ABC):
+    """Somewhere the Snowflake agents can run their SQL.
+
+    ``key`` identifies the data a backend serves, so cached results of one
+    backend are never returned for another.
+    """
+
+    key: str
+
+    @abstractmethod
+    async def execute(
+        self, sql: str, settings: Optional[WarehouseSettings] = None
+    ) -> QueryResult:
+        """Run a query without blocking the event loop."""
+
+    async def ping(self) -> None:
+        """Make sure the backend can run queries."""
+
+    def close(self) -> None:
+        """Release the resources held by the backend."""
+
+
+# Snowflake column type (first word) -> DuckDB column type and Arrow load type
+_TYPES = {
+    "VARCHAR": ("VARCHAR", pa.string()),
+    "BOOLEAN": ("BOOLEAN", pa.bool_()),
+    "INTEGER": ("BIGINT", pa.int64()),
+    "NUMBER": ("BIGINT", pa.int64()),
+    "NUMERIC": ("DOUBLE", pa.float64()),
+    "FLOAT": ("DOUBLE", pa.float64()),
+    "DATE": ("DATE", pa.date32()),
+    "TIMESTAMP_TZ": ("TIMESTAMPTZ", pa.timestamp("us", tz="UTC")),
+    "TIMESTAMPTZ": ("TIMESTAMPTZ", pa.timestamp("us", tz="UTC")),
+    "VARIANT": ("JSON", pa.string()),
+}
+
+# Small vocabularies for columns the schema prompts filter on, so the
+# example questions find rows. Every other text column gets numbered values.
+_VOCABULARY = {
+    "name": [
+        "Goodwill Industries of Greater Detroit",
+        "Arch Coal Stock Price",
+        "Acme Holdings Inc",
+        "Globex Corporation",
+        "Initech LLC",
+    ],
+    "name_type": ["Official", "Alias", "Former"],
+    "first_name": ["John", "Jane", "Maria", "Wei", "Ahmed"],
+    "last_name": ["Doe", "Smith", "Garcia", "Chen", "Khan"],
+    "middle_name": ["A", "B", "Lee", "Marie", ""],
+    "city": ["Detroit", "New York", "Austin", "Chicago", "Denver"],
+    "state_province": ["Michigan", "New York", "Texas", "Illinois", "Colorado"],
+    "country": ["United States", "Canada", "United Kingdom"],
+    "country_name": ["United States", "Canada", "United Kingdom"],
+    "released": ["INGESTED", "RELEASED", "PENDING"],
+    "phone_type": ["Mobile", "Home", "Work"],
+    "address_type": ["Registered", "Mailing", "Headquarters"],
+    "gender": ["F", "M", "U"],
+}
+
+_JSON_LOOKUPS = tuple(
+    getattr(exp, name)
+    for name in ("GetExtract", "JSONExtract", "JSONExtractScalar")
+    if hasattr(exp, name)
+)
+
+
+def _column_key(name: str) -> str:
+    return name.strip('"').lower()
+
+
+def _synthetic_values(
+    column: str, type_name: str, rows: int, rng: random.Random
+) -> List[Any]:
+    """Deterministic values for one column, aligned by row index across tables.
+
+    Row ``i`` of every table describes entity ``i``, so ids, partitions and
+    batch numbers match and joins between tables return rows.
+    """
+    key = _column_key(column)
+    if key == "partition":
+        return [f"P{i % 8}" for i in range(rows)]
+    if key == "partition_id":
+        return [f"{i:08d}" for i in range(rows)]
+    if key == "troaid":
+        return [f"ORG{i:08d}" for i in range(rows)]
+    if key == "trpaid":
+        return [f"PER{i:08d}" for i in range(rows)]
+    if key == "batch_number":
+        return [f"B{i % 10}" for i in range(rows)]
+    if key == "sub_batch_number":
+        return [f"S{i % 3}" for i in range(rows)]
+    if key == "is_deleted":
+        return [i % 10 == 9 for i in range(rows)]
+    if key == "date_of_birth":
+        return [
+            f"{1950 + i % 50}-{1 + i % 12:02d}-{1 + i % 28:02d}" for i in range(rows)
+        ]
+
+    base_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    generators: Dict[str, Callable[[int], Any]] = {
+        "BOOLEAN": lambda i: rng.random() < 0.5,
+        "INTEGER": lambda i: rng.randint(0, 10_000),
+        "NUMBER": lambda i: rng.randint(0, 10),
+        "NUMERIC": lambda i: round(rng.uniform(0, 1_000_000), 2),
+        "FLOAT": lambda i: round(rng.random(), 4),
+        "DATE": lambda i: date(2020, 1, 1) + timedelta(days=rng.randint(0, 1800)),
+        "TIMESTAMP_TZ": lambda i: base_time + timedelta(hours=rng.randint(0, 24 * 730)),
+        "TIMESTAMPTZ": lambda i: base_time + timedelta(hours=rng.randint(0, 24 * 730)),
+        "VARIANT": lambda i: json.dumps({"BESTVALUE": rng.random() < 0.5}),
+    }
+    if type_name in generators:
+        return [generators[type_name](i) for i in range(rows)]
+    vocabulary = _VOCABULARY.get(key)
+    if vocabulary:
+        return [vocabulary[i % len(vocabulary)] for i in range(rows)]
+    return [f"{key}_{i % 97}" for i in range(rows)]
+
+
+class DuckDBBackend(QueryBackend):
+    """In-process DuckDB stand-in for Snowflake, for tests and benchmarks.
+
+    ``from_catalog`` creates every table of a schema catalog and fills it with
+    deterministic synthetic rows. Queries are written for Snowflake, so they
+    are transpiled to DuckDB with sqlglot, after dropping the database and
+    schema qualifiers that only exist in the real warehouse.
+    """
+
+    _backends: Dict[str, "DuckDBBackend"] = {}
+    _backends_lock = threading.Lock()
+
+    def __init__(self, database: str = ":memory:", name: str = "duckdb"):
+        self.name = name
+        import duckdb
+
+        self.key = f"duckdb:{name}"
+        self._conn = duckdb.connect(database)
+        self._tables: Dict[str, str] = {}
+
+    @classmethod
+    def from_catalog(
+        cls,
+        catalog: SchemaCatalog,
+        rows_per_table: int = 1000,
+        seed: int = 0,
+        name: str = "duckdb",
+    ) -> "DuckDBBackend":
+        """Create the tables of a catalog and load synthetic data into them.
+
+        Args:
+            catalog: Catalog parsed from a schema prompt.
+            rows_per_table: Synthetic rows generated for each table.
+            seed: Seed of the value generator, for reproducible data.
+            name: Name used in logs and result file names.
+
+        Returns:
+            DuckDBBackend: Backend holding the loaded tables.
+        """
+        backend = cls(name=name)
+        digest = hashlib.sha256(catalog.prompt.encode()).hexdigest()[:16]
+        backend.key = f"duckdb:{name}:{digest}:{rows_per_table}:{seed}"
+        for table in catalog.tables:
+            backend.load_table(table, rows_per_table, seed)
+        logger.info(
+            f"Loaded {len(catalog.tables)} synthetic tables of {rows_per_table} rows "
+            f"into DuckDB backend '{name}'"
+        )
+        return backend
+
+    @classmethod
+    def get_backend(
+        cls, catalog: SchemaCatalog, name: str = "duckdb", **kwargs
+    ) -> "DuckDBBackend":
+        """Get the shared backend for a catalog, loading it on first use."""
+        digest = hashlib.sha256(catalog.prompt.encode()).hexdigest()[:16]
+        key = f"{name}:{digest}:{sorted(kwargs.items())}"
+        with cls._backends_lock:
+            if key not in cls._backends:
+                cls._backends[key] = cls.from_catalog(catalog, name=name, **kwargs)
+            return cls._backends[key]
+
+    def load_table(self, table: CatalogTable, rows: int, seed: int = 0) -> None:
+        """Create one catalog table and fill it with synthetic rows."""
+        rng = random.Random(f"{seed}:{table.name}")
+        arrays, fields, definitions = [], [], []
+        for column in table.columns:
+            type_name = column.type.split()[0].upper() if column.type else "VARCHAR"
+            duckdb_type, arrow_type = _TYPES.get(type_name, _TYPES["VARCHAR"])
+            name = column.name.strip('"')
+            values = _synthetic_values(name, type_name, rows, rng)
+            arrays.append(pa.array(values, type=arrow_type))
+            fields.append(name)
+            definitions.append(f'CAST("{name}" AS {duckdb_type}) AS "{name}"')
+
+        data = pa.Table.from_arrays(arrays, names=fields)
+        self._conn.register("_synthetic", data)
+        try:
+            self._conn.execute(
+                f'CREATE OR REPLACE TABLE "{table.name}" AS '
+                f"SELECT {', '.join(definitions)} FROM _synthetic"
+            )
+        finally:
+            self._conn.unregister("_synthetic")
+        self._tables[table.name.lower()] = table.name
+
+    def transpile(self, sql: str) -> str:
+        """Rewrite Snowflake SQL into DuckDB SQL over the local tables."""
+        tree = sqlglot.parse_one(sql, read="snowflake")
+        for table in tree.find_all(exp.Table):
+            if table.name.lower() in self._tables:
+                table.set("db", None)
+                table.set("catalog", None)
+        # DuckDB's -> binds looser than comparisons, so keep JSON lookups grouped
+        tree = tree.transform(
+            lambda node: (
+                exp.Paren(this=node.copy())
+                if isinstance(node, _JSON_LOOKUPS)
+                and not isinstance(node.parent, exp.Paren)
+                else node
+            )
+        )
+        return tree.sql(dialect="duckdb")
+
+    def run_query(
+        self, sql: str, settings: Optional[WarehouseSettings] = None
+    ) -> QueryResult:
+        """Run a query. Blocks, so call it from a thread."""
+        collector = ResultCollector(
+            sql, settings or config.warehouse_config, name=self.name
+        )
+        # A cursor is a separate connection to the same database, so
+        # concurrent queries from worker threads do not share state
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute(self.transpile(sql))
+            columns = [col[0] for col in cursor.description or []]
+            reader = cursor.fetch_record_batch(rows_per_batch=10_000)
+            for batch in reader:
+                if not collector.add(batch):
+                    break
+        finally:
+            cursor.close()
+        return collector.finish(columns, schema=reader.schema)
+
+    async def execute(
+        self, sql: str, settings: Optional[WarehouseSettings] = None
+    ) -> QueryResult:
+        """Run a query in a worker thread without blocking the event loop."""
+        return await asyncio.to_thread(self.run_query, sql, settings)
+
+    async def ping(self) -> None:
+        def _check():
+            cursor = self._conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+
+        await asyncio.to_thread(_check)
+
+    def close(self) -> None:
+        self._conn.close()
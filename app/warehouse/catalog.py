@@ -0,0 +1,300 @@
+import math
+import re
+from collections import Counter
+from typing import List, Optional, Sequence, Set
+
+from pydantic import BaseModel, Field
+
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_TABLE_RE = re.compile(r"^\s*\d+\.\s*`([^`]+)`\s*$")
+_COLUMN_RE = re.compile(r'^\s*-\s*("?\w+"?)\s*(.*?),?\s*$')
+_EXAMPLE_RE = re.compile(r"^\s*SQL\d+\s*:\s*(.*)$")
+_LISTED_TABLE_RE = re.compile(r"^\s*--\s*`([^`]+)`")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, with plurals reduced."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower().replace("_", " ")):
+        if token.endswith("sses"):
+            token = token[:-2]
+        elif token.endswith("ies") and len(token) > 4:
+            token = token[:-3] + "y"
+        elif token.endswith("s") and not token.endswith("ss") and len(token) > 3:
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class _BM25Index:
+    """Okapi BM25 ranking over a small, fixed set of token documents."""
+
+    def __init__(self, documents: Sequence[List[str]], k1: float = 1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_counts = [Counter(document) for document in documents]
+        self._lengths = [len(document) for document in documents]
+        self._avg_length = sum(self._lengths) / len(documents) if documents else 0
+        document_frequency = Counter(
+            term for counts in self._term_counts for term in counts
+        )
+        total = len(documents)
+        self._idf = {
+            term: math.log(1 + (total - frequency + 0.5) / (frequency + 0.5))
+            for term, frequency in document_frequency.items()
+        }
+
+    def _expand(self, query: List[str]) -> Set[str]:
+        """Add indexed terms that longer query words are a prefix of."""
+        terms = set(query)
+        for word in query:
+            if len(word) >= 4:
+                terms.update(term for term in self._idf if term.startswith(word))
+        return terms
+
+    def scores(self, query: List[str]) -> List[float]:
+        terms = self._expand(query)
+        results = []
+        for counts, length in zip(self._term_counts, self._lengths):
+            score = 0.0
+            for term in terms:
+                frequency = counts.get(term)
+                if not frequency:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * length / self._avg_length)
+                score += (
+                    self._idf[term] * frequency * (self.k1 + 1) / (frequency + norm)
+                )
+            results.append(score)
+        return results
+
+
+class TableColumn(BaseModel):
+    name: str
+    type: str = ""
+
+
+class CatalogTable(BaseModel):
+    """A table of the schema prompt with its columns and original lines."""
+
+    name: str
+    columns: List[TableColumn] = Field(default_factory=list)
+    lines: List[str] = Field(default_factory=list)
+
+    def tokens(self) -> List[str]:
+        # Table names describe the content best, so they weigh more than columns
+        name_tokens = tokenize(self.name) * 3
+        return name_tokens + [t for c in self.columns for t in tokenize(c.name)]
+
+
+class CatalogRelationship(BaseModel):
+    """A relationship note and the tables it mentions."""
+
+    lines: List[str]
+    tables: Set[str] = Field(default_factory=set)
+
+
+class CatalogExample(BaseModel):
+    """An example question with its SQL and the tables it uses."""
+
+    title: str
+    lines: List[str]
+    tables: Set[str] = Field(default_factory=set)
+
+
+class SchemaCatalog(BaseModel):
+    """Structured view of a text-to-SQL schema prompt.
+
+    The prompt is split into its preamble, tables (with columns),
+    relationships, rules and examples. ``build_prompt`` ranks tables and
+    examples against a question with BM25 and reassembles a prompt holding
+    only the relevant ones. Prompts that cannot be parsed are used whole.
+    """
+
+    prompt: str
+    preamble: List[str] = Field(default_factory=list)
+    tables: List[CatalogTable] = Field(default_factory=list)
+    relationships: List[CatalogRelationship] = Field(default_factory=list)
+    rules: List[str] = Field(default_factory=list)
+    examples_intro: List[str] = Field(default_factory=list)
+    examples: List[CatalogExample] = Field(default_factory=list)
+    epilogue: List[str] = Field(default_factory=list)
+    pinned_tables: List[str] = Field(default_factory=list)
+
+    _table_index: Optional[_BM25Index] = None
+    _example_index: Optional[_BM25Index] = None
+
+    @classmethod
+    def from_prompt(
+        cls, prompt: str, pinned_tables: Optional[List[str]] = None
+    ) -> "SchemaCatalog":
+        """Parse a schema prompt laid out as Tables/Relationships/rules/Examples."""
+        catalog = cls(prompt=prompt, pinned_tables=pinned_tables or [])
+        lines = prompt.splitlines()
+        section = "preamble"
+        for line in lines:
+            stripped = line.strip()
+            if stripped == "Tables:" and section == "preamble":
+                section = "tables"
+                continue
+            if stripped == "Relationships:" and section == "tables":
+                section = "relationships"
+                continue
+            if stripped.startswith("Here are some critical rules") and section in (
+                "tables",
+                "relationships",
+            ):
+                section = "rules"
+            elif stripped == "Examples:" and section == "rules":
+                section = "examples"
+                continue
+            catalog._add_line(section, line)
+
+        if catalog.examples:
+            catalog._split_epilogue()
+        names = [table.name for table in catalog.tables]
+        for item in catalog.relationships + catalog.examples:
+            item.tables = _mentioned_tables("\n".join(item.lines), names)
+        return catalog
+
+    def _add_line(self, section: str, line: str) -> None:
+        if section == "preamble":
+            self.preamble.append(line)
+        elif section == "tables":
+            match = _TABLE_RE.match(line)
+            if match:
+                self.tables.append(CatalogTable(name=match.group(1), lines=[line]))
+            elif self.tables:
+                self.tables[-1].lines.append(line)
+                column = _COLUMN_RE.match(line)
+                if column:
+                    self.tables[-1].columns.append(
+                        TableColumn(name=column.group(1), type=column.group(2))
+                    )
+        elif section == "relationships":
+            # A new note starts at the shallowest bullet, anything deeper continues it
+            if re.match(r"^ {0,4}- ", line) or not self.relationships:
+                self.relationships.append(CatalogRelationship(lines=[line]))
+            else:
+                self.relationships[-1].lines.append(line)
+        elif section == "rules":
+            self.rules.append(line)
+        else:
+            match = _EXAMPLE_RE.match(line)
+            if match:
+                self.examples.append(
+                    CatalogExample(title=match.group(1).strip(), lines=[line])
+                )
+            elif self.examples:
+                self.examples[-1].lines.append(line)
+            else:
+                self.examples_intro.append(line)
+
+    def _split_epilogue(self) -> None:
+        """Move closing instructions written after the last example out of it."""
+        last = self.examples[-1].lines
+        for index, line in enumerate(last[1:], start=1):
+            if line and not line[0].isspace():
+                self.examples[-1].lines, self.epilogue = last[:index], last[index:]
+                return
+
+    @property
+    def is_structured(self) -> bool:
+        return bool(self.tables)
+
+    def _rank(self, index_name: str, documents, question: str) -> List[float]:
+        index = getattr(self, index_name)
+        if index is None:
+            index = _BM25Index(documents)
+            setattr(self, index_name, index)
+        return index.scores(tokenize(question))
+
+    def select_tables(self, question: str, top_k: int) -> List[CatalogTable]:
+        """Pick the pinned tables plus the top-k tables matching the question."""
+        scores = self._rank(
+            "_table_index", [table.tokens() for table in self.tables], question
+        )
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0),
+            key=lambda i: scores[i],
+            reverse=True,
+        )
+        chosen = {self.tables[i].name for i in ranked[:top_k]}
+        chosen.update(self.pinned_tables)
+        return [table for table in self.tables if table.name in chosen]
+
+    def select_examples(self, question: str, top_k: int) -> List[CatalogExample]:
+        """Pick the top-k examples matching the question."""
+        if not self.examples or top_k <= 0:
+            return []
+        scores = self._rank(
+            "_example_index",
+            [tokenize("\n".join(example.lines)) for example in self.examples],
+            question,
+        )
+        ranked = sorted(
+            (i for i, score in enumerate(scores) if score > 0),
+            key=lambda i: scores[i],
+            reverse=True,
+        )[:top_k]
+        return [self.examples[i] for i in sorted(ranked)]
+
+    def build_prompt(
+        self, question: str, top_k_tables: int = 6, top_k_examples: int = 1
+    ) -> str:
+        """Assemble a prompt with only the tables and examples relevant to a question.
+
+        Tables used by the chosen examples are kept too, so the examples stay
+        valid. Falls back to the full prompt when nothing matches.
+        """
+        if not self.is_structured:
+            return self.prompt
+        tables = self.select_tables(question, top_k_tables)
+        if len(tables) <= len(self.pinned_tables):
+            return self.prompt
+
+        examples = self.select_examples(question, top_k_examples)
+        names = {table.name for table in tables}
+        for example in examples:
+            names.update(example.tables)
+        tables = [table for table in self.tables if table.name in names]
+
+        lines = list(self.preamble)
+        lines.append("Tables:")
+        for table in tables:
+            lines.extend(table.lines)
+        relationships = self._render_relationships(names)
+        if relationships:
+            lines.append("Relationships:")
+            lines.extend(relationships)
+        lines.extend(self.rules)
+        if examples:
+            lines.append("Examples:")
+            lines.extend(self.examples_intro)
+            for example in examples:
+                lines.extend(example.lines)
+        lines.extend(self.epilogue)
+        return "\n".join(lines)
+
+    def _render_relationships(self, names: Set[str]) -> List[str]:
+        lines = []
+        lowered = {name.lower() for name in names}
+        for relationship in self.relationships:
+            if relationship.tables and not relationship.tables & names:
+                continue
+            for line in relationship.lines:
+                listed = _LISTED_TABLE_RE.match(line)
+                if listed and listed.group(1).lower() not in lowered:
+                    continue
+                lines.append(line)
+        return lines
+
+
+def _mentioned_tables(text: str, names: List[str]) -> Set[str]:
+    lowered = text.lower()
+    return {
+        name
+        for name in names
+        if re.search(rf"(?<![\w]){re.escape(name.lower())}(?![\w])", lowered)
+    }
@@ -0,0 +1,274 @@
+import asyncio
+import atexit
+import hashlib
+import json
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.config import SnowflakeSettings, WarehouseSettings, config
+from app.logger import logger
+from app.warehouse.backends import QueryBackend
+from app.warehouse.results import QueryResult, ResultCollector
+
+
+class _PooledConnection:
+    """A Snowflake connection together with its bookkeeping."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing Snowflake connection: {e}")
+
+
+class SnowflakeConnectionPool(QueryBackend):
+    """A size-bounded pool of Snowflake connections for one settings profile.
+
+    Connections are opened lazily up to ``max_size`` and checked before reuse
+    once they have been idle longer than ``health_check_interval``. The
+    connector is synchronous, so queries run in a worker thread and never
+    block the event loop. Pools are shared process-wide, one per profile.
+    """
+
+    _pools: Dict[str, "SnowflakeConnectionPool"] = {}
+    _pools_lock = threading.Lock()
+    # Seconds a waiting caller sleeps before checking for a freed slot again
+    _poll_interval = 0.5
+
+    def __init__(
+        self,
+        profile: str,
+        params: Dict[str, Any],
+        max_size: int = 4,
+        health_check_interval: float = 300,
+        acquire_timeout: float = 60,
+    ):
+        self.profile = profile
+        self.params = params
+        # Identifies the profile and connection target without exposing secrets
+        self.key = self._pool_key(profile, params)
+        self.max_size = max(1, max_size)
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        # LIFO keeps the most recently used connections warm
+        self._idle: "queue.LifoQueue[_PooledConnection]" = queue.LifoQueue()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @classmethod
+    def get_pool(
+        cls,
+        profile: str,
+        params: Dict[str, Any],
+        settings: Optional[SnowflakeSettings] = None,
+    ) -> "SnowflakeConnectionPool":
+        """Get the shared pool for a profile, creating it on first use.
+
+        Args:
+            profile: Settings profile name, e.g. "org", "person" or "default".
+            params: Keyword arguments for ``snowflake.connector.connect``.
+            settings: Profile settings providing the pool limits.
+
+        Returns:
+            SnowflakeConnectionPool: Pool shared by every caller of the profile.
+        """
+        key = cls._pool_key(profile, params)
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None or pool._closed:
+                kwargs = {}
+                if settings:
+                    kwargs = {
+                        "max_size": settings.pool_size,
+                        "health_check_interval": settings.health_check_interval,
+                        "acquire_timeout": settings.pool_timeout,
+                    }
+                pool = cls(profile, params, **kwargs)
+                cls._pools[key] = pool
+            return pool
+
+    @staticmethod
+    def _pool_key(profile: str, params: Dict[str, Any]) -> str:
+        digest = hashlib.sha256(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return f"{profile}:{digest}"
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Close every shared pool."""
+        with cls._pools_lock:
+            pools, cls._pools = list(cls._pools.values()), {}
+        for pool in pools:
+            pool.close()
+
+    def _reserve_slot(self) -> bool:
+        """Claim room for one more connection, if the pool is not full."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(
+                    f"Snowflake connection pool '{self.profile}' is closed"
+                )
+            if self._size >= self.max_size:
+                return False
+            self._size += 1
+            return True
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        with self._lock:
+            self._size -= 1
+        pooled.close()
+
+    def _open(self) -> _PooledConnection:
+        try:
+            logger.info(
+                f"Opening Snowflake connection to account {self.params.get('account')} "
+                f"(profile '{self.profile}', {self._size}/{self.max_size})"
+            )
+            # The connector is slow to import, so it is loaded with the first connection
+            import snowflake.connector
+
+            return _PooledConnection(snowflake.connector.connect(**self.params))
+        except Exception:
+            with self._lock:
+                self._size -= 1
+            raise
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        if pooled.conn.is_closed():
+            return False
+        if time.monotonic() - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = pooled.conn.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception as e:
+            logger.warning(
+                f"Dropping unhealthy Snowflake connection (profile '{self.profile}'): {e}"
+            )
+            return False
+
+    def _acquire(self) -> _PooledConnection:
+        """Take an idle connection, opening one if the pool has room.
+
+        Waiting callers re-check the pool regularly, so a slot freed by a
+        discarded connection is taken over instead of waited on.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+            TimeoutError: If no connection became free within acquire_timeout.
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                if self._reserve_slot():
+                    return self._open()
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(
+                        f"Timed out after {self.acquire_timeout}s waiting for a "
+                        f"Snowflake connection (profile '{self.profile}')"
+                    )
+                try:
+                    pooled = self._idle.get(timeout=min(remaining, self._poll_interval))
+                except queue.Empty:
+                    continue
+
+            if self._is_healthy(pooled):
+                return pooled
+            self._discard(pooled)
+
+    def _release(self, pooled: _PooledConnection) -> None:
+        if self._closed or pooled.conn.is_closed():
+            self._discard(pooled)
+            return
+        pooled.last_used = time.monotonic()
+        self._idle.put(pooled)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection. Blocks, so call it from a thread."""
+        pooled = self._acquire()
+        try:
+            yield pooled.conn
+        finally:
+            self._release(pooled)
+
+    def run_query(
+        self, sql: str, settings: Optional[WarehouseSettings] = None
+    ) -> QueryResult:
+        """Run a query on a pooled connection. Blocks, so call it from a thread.
+
+        The result is streamed as Arrow batches within the row and memory
+        budget of ``settings`` instead of being fetched all at once.
+        """
+        from snowflake.connector.errors import NotSupportedError
+
+        collector = ResultCollector(
+            sql, settings or config.warehouse_config, name=self.profile
+        )
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(sql)
+                columns = (
+                    [col[0] for col in cursor.description] if cursor.description else []
+                )
+                try:
+                    for batch in cursor.fetch_arrow_batches():
+                        if not collector.add(batch):
+                            break
+                except NotSupportedError:
+                    # Statements such as SHOW return JSON instead of Arrow
+                    while True:
+                        rows = cursor.fetchmany(10_000)
+                        if not rows or not collector.add_rows(columns, rows):
+                            break
+            finally:
+                cursor.close()
+        return collector.finish(columns)
+
+    async def execute(
+        self, sql: str, settings: Optional[WarehouseSettings] = None
+    ) -> QueryResult:
+        """Run a query in a worker thread without blocking the event loop."""
+        return await asyncio.to_thread(self.run_query, sql, settings)
+
+    async def ping(self) -> None:
+        """Make sure the pool can hand out a working connection."""
+
+        def _check():
+            with self.connection():
+                pass
+
+        await asyncio.to_thread(_check)
+
+    def close(self) -> None:
+        """Close the pool and every idle connection."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(pooled)
+
+
+atexit.register(SnowflakeConnectionPool.close_all)
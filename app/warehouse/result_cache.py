@@ -0,0 +1,248 @@
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import pyarrow.parquet as pq
+
+from app.config import WarehouseSettings, config
+from app.logger import logger
+from app.warehouse.results import (
+    QueryResult,
+    ResultCollector,
+    prune_spill_dir,
+    spill_path,
+)
+
+
+# Quoted literals and identifiers are case-sensitive and kept as written
+_QUOTED_RE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+
+
+def canonicalize_sql(sql: str) -> str:
+    """Normalize whitespace, case and trailing semicolons outside quotes."""
+    parts = _QUOTED_RE.split(sql.strip().rstrip(";").strip())
+    canonical = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            canonical.append(part)
+        else:
+            canonical.append(re.sub(r"\s+", " ", part).upper())
+    return "".join(canonical).strip()
+
+
+class ResultCache:
+    """On-disk cache of query results, stored as Parquet files.
+
+    Results are keyed on the canonical SQL text and the connection profile.
+    Entries expire after ``ttl`` seconds, and the least recently used ones
+    are evicted once the cache grows past ``max_entries`` or ``max_bytes``.
+    A hit is read back through a ``ResultCollector``, so it honours the same
+    row and memory budget as a fresh query, and rows beyond that budget are
+    served from the cached file rather than spilled again.
+    """
+
+    _instances: Dict[str, "ResultCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(
+        self,
+        directory: Path,
+        ttl: float = 3600,
+        max_entries: int = 256,
+        max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.directory / "index.db"), check_same_thread=False
+        )
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS result_cache (
+                    key TEXT PRIMARY KEY,
+                    profile TEXT NOT NULL,
+                    sql TEXT NOT NULL,
+                    truncated INTEGER NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+
+    @classmethod
+    def get_instance(cls, directory: Path, **kwargs) -> "ResultCache":
+        """Get the process-wide cache for a directory."""
+        key = str(Path(directory).resolve())
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(directory, **kwargs)
+            return cls._instances[key]
+
+    @staticmethod
+    def cache_key(profile: str, sql: str) -> str:
+        return hashlib.sha256(
+            f"{profile}\n{canonicalize_sql(sql)}".encode()
+        ).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.parquet"
+
+    def get(
+        self, profile: str, sql: str, settings: Optional[WarehouseSettings] = None
+    ) -> Optional[QueryResult]:
+        """Return the cached result of a query, or None on a miss.
+
+        Blocks on disk I/O, so call it from a thread.
+        """
+        settings = settings or config.warehouse_config
+        key = self.cache_key(profile, sql)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT truncated, created_at FROM result_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row and self.ttl and now - row[1] > self.ttl:
+                self._remove(key)
+                row = None
+            path = self._path(key)
+            if row and not path.exists():
+                self._remove(key)
+                row = None
+            if row is None:
+                self.misses += 1
+                logger.info(
+                    f"Result cache miss for {profile} (hits={self.hits}, misses={self.misses})"
+                )
+                return None
+            with self._conn:
+                self._conn.execute(
+                    "UPDATE result_cache SET last_used = ? WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+            # Read under the lock, so eviction cannot unlink the file meanwhile
+            result = self._read(path, sql, profile, bool(row[0]), settings)
+
+        logger.info(
+            f"Result cache hit for {profile} (hits={self.hits}, misses={self.misses})"
+        )
+        return result
+
+    @staticmethod
+    def _read(
+        path: Path, sql: str, profile: str, truncated: bool, settings: WarehouseSettings
+    ) -> QueryResult:
+        """Load the head of a cached result within the row and memory budget.
+
+        When the rows do not all fit in memory and spilling is enabled, the
+        result points at a hard link to the cached file instead of a new
+        copy, so it stays readable after the entry is evicted. Links count
+        towards the spill directory's limits like any spilled result.
+        """
+        name = profile.split(":")[0]
+        parquet_file = pq.ParquetFile(path)
+        collector = ResultCollector(
+            sql, settings.model_copy(update={"spill_to_parquet": False}), name=name
+        )
+        for batch in parquet_file.iter_batches():
+            if not collector.add(batch):
+                break
+        result = collector.finish()
+
+        stored_rows = parquet_file.metadata.num_rows
+        fetched_rows = min(stored_rows, settings.max_rows)
+        if settings.spill_to_parquet and result.table.num_rows < fetched_rows:
+            link = spill_path(settings, name)
+            try:
+                os.link(path, link)
+            except OSError:
+                # No hard links across file systems, so fall back to a copy
+                shutil.copyfile(path, link)
+            # A link keeps the cached file's age, so name it as the file to keep
+            prune_spill_dir(
+                link.parent,
+                settings.spill_max_files,
+                settings.spill_max_bytes,
+                keep=link,
+            )
+            result.parquet_path = link
+            result.total_rows = fetched_rows
+            result.truncated = truncated or stored_rows > settings.max_rows
+        else:
+            result.truncated = result.truncated or truncated
+        return result
+
+    def put(self, profile: str, result: QueryResult) -> None:
+        """Store a query result. Blocks on disk I/O, so call it from a thread."""
+        key = self.cache_key(profile, result.sql)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        # The spilled file holds every fetched row, the table only the head
+        if result.parquet_path and Path(result.parquet_path).exists():
+            shutil.copyfile(result.parquet_path, tmp_path)
+            truncated = result.truncated
+        else:
+            pq.write_table(result.table, tmp_path)
+            truncated = result.truncated or result.table.num_rows < result.total_rows
+        tmp_path.replace(path)
+
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    profile,
+                    result.sql,
+                    int(truncated),
+                    path.stat().st_size,
+                    now,
+                    now,
+                ),
+            )
+            self._evict()
+
+    def _remove(self, key: str) -> None:
+        with self._conn:
+            self._conn.execute("DELETE FROM result_cache WHERE key = ?", (key,))
+        self._path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop expired entries, then least recently used ones over the limits."""
+        if self.ttl:
+            expired = self._conn.execute(
+                "SELECT key FROM result_cache WHERE created_at < ?",
+                (time.time() - self.ttl,),
+            ).fetchall()
+            for (key,) in expired:
+                self._remove(key)
+
+        entries = self._conn.execute(
+            "SELECT key, size_bytes FROM result_cache ORDER BY last_used DESC"
+        ).fetchall()
+        total_bytes = 0
+        for index, (key, size_bytes) in enumerate(entries):
+            total_bytes += size_bytes
+            if index >= self.max_entries or total_bytes > self.max_bytes:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every cached result."""
+        with self._lock:
+            keys = self._conn.execute("SELECT key FROM result_cache").fetchall()
+            for (key,) in keys:
+                self._remove(key)
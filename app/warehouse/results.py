@@ -0,0 +1,236 @@
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Optional, Union
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pydantic import BaseModel, ConfigDict, Field
+
+from app.config import WarehouseSettings, config
+from app.logger import logger
+
+
+class QueryResult(BaseModel):
+    """Columnar result of a warehouse query.
+
+    Holds the rows that fit the in-memory budget as an Arrow table. When the
+    result outgrew that budget it was spilled, and the Parquet file holds
+    every fetched row, so the full data stays reachable from
+    ``python_execute`` without entering the prompt.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    sql: str = Field(..., description="Query that produced the result")
+    table: pa.Table = Field(..., description="Rows kept in memory")
+    total_rows: int = Field(0, description="Rows fetched from the warehouse")
+    truncated: bool = Field(
+        False, description="Whether fetching stopped before the end of the result"
+    )
+    parquet_path: Optional[Path] = Field(
+        None, description="Parquet file holding every fetched row"
+    )
+    summary_rows: int = Field(10, description="Sample rows shown in the summary")
+
+    @property
+    def columns(self) -> List[str]:
+        return self.table.column_names
+
+    @property
+    def data(self) -> List[tuple]:
+        """Rows kept in memory as tuples."""
+        columns = self.table.to_pydict()
+        return list(zip(*columns.values())) if columns else []
+
+    def summary(self, max_rows: Optional[int] = None) -> str:
+        """Render a compact description: schema, row count and a head sample."""
+        max_rows = self.summary_rows if max_rows is None else max_rows
+        count = f"{self.total_rows:,}{'+' if self.truncated else ''}"
+        lines = [
+            f"Query returned {count} rows x {self.table.num_columns} columns"
+            + (f" (showing first {max_rows})" if self.total_rows > max_rows else "")
+        ]
+        if self.truncated:
+            lines.append(
+                "Fetching stopped early at the configured row or memory limit."
+            )
+
+        lines.append("Schema:")
+        lines.extend(f"  {field.name}: {field.type}" for field in self.table.schema)
+
+        if self.table.num_rows and max_rows:
+            sample = self.table.slice(0, max_rows).to_pandas()
+            lines.append("Sample:")
+            lines.append(sample.to_string(index=False, max_colwidth=60))
+
+        if self.parquet_path:
+            lines.append(
+                f"Full result saved to {self.parquet_path} "
+                "(load it with pandas.read_parquet)"
+            )
+        elif self.table.num_rows < self.total_rows:
+            lines.append(f"Only the first {self.table.num_rows:,} rows are kept.")
+        return "\n".join(lines)
+
+    def __str__(self) -> str:
+        return self.summary()
+
+
+def spill_path(settings: WarehouseSettings, name: str) -> Path:
+    """Get a new, unique path for a result in the spill directory."""
+    spill_dir = config.workspace_root / settings.spill_dir
+    spill_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return spill_dir / f"{name}_{timestamp}_{uuid.uuid4().hex[:8]}.parquet"
+
+
+def prune_spill_dir(
+    directory: Path, max_files: int, max_bytes: int, keep: Optional[Path] = None
+) -> None:
+    """Delete the oldest Parquet results beyond a file count or total size.
+
+    Args:
+        directory: Directory holding spilled results.
+        max_files: Files to keep at most (0 for no limit).
+        max_bytes: Total size to keep at most (0 for no limit).
+        keep: Result just written, kept even when it is not the newest file.
+    """
+    files = []
+    for path in directory.glob("*.parquet"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        files.append((stat.st_mtime, stat.st_size, path))
+    files.sort(reverse=True)
+    if keep is not None:
+        files.sort(key=lambda file: file[2] != keep)
+
+    total_bytes = 0
+    for index, (_, size, path) in enumerate(files):
+        total_bytes += size
+        # The first file is the result just written, so it is always kept
+        if index and (
+            (max_files and index >= max_files)
+            or (max_bytes and total_bytes > max_bytes)
+        ):
+            path.unlink(missing_ok=True)
+            logger.info(f"Removed old query result {path}")
+
+
+class ResultCollector:
+    """Accumulates streamed Arrow batches under a row and memory budget.
+
+    Batches are kept in memory until ``max_memory_bytes`` is reached. Only a
+    result that outgrows the budget is spilled: when spilling is enabled, the
+    rows kept so far and every later batch are written to a Parquet file.
+    Fetching stops once ``max_rows`` rows were seen, or once the memory
+    budget is full and there is nowhere to spill the rest. Spilled files
+    beyond ``spill_max_files`` or ``spill_max_bytes`` are pruned, oldest
+    first.
+    """
+
+    def __init__(
+        self,
+        sql: str,
+        settings: Optional[WarehouseSettings] = None,
+        name: str = "query",
+    ):
+        self.sql = sql
+        self.settings = settings or WarehouseSettings()
+        self.name = name
+
+        self._batches: List[pa.Table] = []
+        self._schema: Optional[pa.Schema] = None
+        self._memory_bytes = 0
+        self._memory_full = False
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._path: Optional[Path] = None
+        self.total_rows = 0
+        self.truncated = False
+
+    def _spill(self, batch: pa.Table) -> None:
+        if self._writer is None:
+            self._path = spill_path(self.settings, self.name)
+            self._writer = pq.ParquetWriter(self._path, batch.schema)
+        self._writer.write_table(batch)
+
+    def add(self, batch: Union[pa.Table, pa.RecordBatch]) -> bool:
+        """Add a batch, returning False once no more rows should be fetched."""
+        if isinstance(batch, pa.RecordBatch):
+            batch = pa.Table.from_batches([batch])
+        if self._schema is None:
+            self._schema = batch.schema
+        elif batch.schema != self._schema:
+            batch = batch.cast(self._schema)
+
+        remaining = self.settings.max_rows - self.total_rows
+        if batch.num_rows > remaining:
+            batch = batch.slice(0, remaining)
+            self.truncated = True
+        self.total_rows += batch.num_rows
+
+        if self._memory_full:
+            if self.settings.spill_to_parquet:
+                self._spill(batch)
+        else:
+            room = self.settings.max_memory_bytes - self._memory_bytes
+            if batch.nbytes > room and batch.num_rows:
+                self._memory_full = True
+                if self.settings.spill_to_parquet:
+                    # Everything fetched so far is still in memory
+                    for kept in self._batches:
+                        self._spill(kept)
+                    self._spill(batch)
+                # Keep the share of the batch that fits, estimated per row
+                keep = int(room / (batch.nbytes / batch.num_rows))
+                batch = batch.slice(0, max(0, keep))
+            self._batches.append(batch)
+            self._memory_bytes += batch.nbytes
+
+        if self._memory_full and not self.settings.spill_to_parquet:
+            self.truncated = True
+        return not self.truncated
+
+    def add_rows(self, columns: List[str], rows: Iterable[tuple]) -> bool:
+        """Add plain rows, for results the connector cannot return as Arrow."""
+        rows = list(rows)
+        table = pa.table(
+            {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+        )
+        return self.add(table)
+
+    def finish(
+        self,
+        columns: Optional[List[str]] = None,
+        schema: Optional[pa.Schema] = None,
+    ) -> QueryResult:
+        """Close the spill file and build the result.
+
+        ``schema``, or else ``columns``, describes results without any rows.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            logger.info(f"Saved {self.total_rows} result rows to {self._path}")
+            prune_spill_dir(
+                self._path.parent,
+                self.settings.spill_max_files,
+                self.settings.spill_max_bytes,
+            )
+
+        if self._batches:
+            table = pa.concat_tables(self._batches)
+        elif self._schema is not None or schema is not None:
+            table = (self._schema or schema).empty_table()
+        else:
+            table = pa.table({name: pa.array([], pa.null()) for name in columns or []})
+
+        return QueryResult(
+            sql=self.sql,
+            table=table,
+            total_rows=self.total_rows,
+            truncated=self.truncated,
+            parquet_path=self._path,
+            summary_rows=self.settings.summary_rows,
+        )
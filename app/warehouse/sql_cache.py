@@ -0,0 +1,192 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.logger import logger
+
+
+# Words, plus comparison operators and signs, which change what a question asks
+_WORD_RE = re.compile(r"\w+|<=|>=|!=|<>|[<>=≠≤≥+%-]")
+_QUOTED_RE = re.compile(r"'([^']*)'|\"([^\"]*)\"|“([^”]*)”|‘([^’]*)’")
+# A sign is part of a number only when it does not join two words, as in "2020-2023"
+_NUMBER_RE = re.compile(r"(?:(?<!\w)[-+])?\d+(?:[.,]\d+)*")
+_COMPARISON_RE = re.compile(r"<=|>=|!=|<>|[<>=≠≤≥]")
+# A capitalised word that does not start the question or a sentence
+_NAME_RE = re.compile(r"(?<![.?!]\s)(?<!^)\b[^\W\d_a-z][\w'-]*", re.MULTILINE)
+
+
+def normalize_question(text: str) -> str:
+    """Casefold a question and reduce it to its words, in order.
+
+    Words are Unicode-aware, so questions in any script keep their content.
+    Comparison operators and signs are kept as words of their own.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return " ".join(_WORD_RE.findall(text))
+
+
+def question_literals(text: str) -> List[str]:
+    """Quoted strings, signed numbers, comparisons and capitalised names of a question.
+
+    A fuzzy cache hit requires these to match exactly, since they usually
+    end up as literals in the generated SQL.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    literals = set()
+    for match in _QUOTED_RE.finditer(text):
+        literals.add(next(group for group in match.groups() if group is not None))
+    unquoted = _QUOTED_RE.sub(" ", text)
+    literals.update(_NUMBER_RE.findall(unquoted))
+    literals.update(_COMPARISON_RE.findall(unquoted))
+    literals.update(_NAME_RE.findall(unquoted))
+    return sorted(literal.casefold() for literal in literals)
+
+
+def schema_hash(schema_prompt: str) -> str:
+    """Short, stable fingerprint of a schema prompt."""
+    return hashlib.sha256(schema_prompt.encode()).hexdigest()[:16]
+
+
+def _token_set_similarity(a: str, b: str) -> float:
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+class SQLCache:
+    """Persistent natural-language to SQL cache backed by SQLite.
+
+    Entries are keyed on the normalized question, the agent type and a hash
+    of the schema prompt, so editing a schema invalidates its entries. When
+    ``similarity`` is below 1, a lookup that misses exactly falls back to the
+    most similar cached question by token-set similarity, provided both
+    questions name the same quoted strings, numbers and proper nouns.
+    """
+
+    _instances: Dict[str, "SQLCache"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, path: Path, ttl: float = 7 * 24 * 3600, similarity=1.0):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.similarity = similarity
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS nl_sql_cache (
+                    question TEXT NOT NULL,
+                    agent_type TEXT NOT NULL,
+                    schema_hash TEXT NOT NULL,
+                    sql TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    literals TEXT,
+                    PRIMARY KEY (question, agent_type, schema_hash)
+                )
+                """
+            )
+
+    @classmethod
+    def get_instance(cls, path: Path, **kwargs) -> "SQLCache":
+        """Get the process-wide cache for a database file."""
+        key = str(Path(path).resolve())
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(path, **kwargs)
+            return cls._instances[key]
+
+    def get(self, question: str, agent_type: str, schema: str) -> Optional[str]:
+        """Look up the SQL cached for a question, or None on a miss."""
+        normalized = normalize_question(question)
+        match = None
+        if normalized:
+            match = self._lookup(
+                normalized, question_literals(question), agent_type, schema
+            )
+        if match is None:
+            self.misses += 1
+            logger.info(
+                f"NL→SQL cache miss for {agent_type} (hits={self.hits}, misses={self.misses})"
+            )
+            return None
+
+        sql, score = match
+        self.hits += 1
+        kind = "exact" if score == 1.0 else f"fuzzy {score:.2f}"
+        logger.info(
+            f"NL→SQL cache hit ({kind}) for {agent_type} (hits={self.hits}, misses={self.misses})"
+        )
+        return sql
+
+    def _lookup(
+        self, normalized: str, literals: List[str], agent_type: str, schema: str
+    ) -> Optional[Tuple[str, float]]:
+        oldest = time.time() - self.ttl if self.ttl else 0
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sql FROM nl_sql_cache WHERE question = ? AND agent_type = ? "
+                "AND schema_hash = ? AND created_at >= ?",
+                (normalized, agent_type, schema, oldest),
+            ).fetchone()
+            if row:
+                return row[0], 1.0
+            if self.similarity >= 1:
+                return None
+            candidates = self._conn.execute(
+                "SELECT question, sql FROM nl_sql_cache WHERE agent_type = ? "
+                "AND schema_hash = ? AND created_at >= ? AND literals = ?",
+                (agent_type, schema, oldest, json.dumps(literals)),
+            ).fetchall()
+
+        best = None
+        for question, sql in candidates:
+            score = _token_set_similarity(normalized, question)
+            if score >= self.similarity and (best is None or score > best[1]):
+                best = (sql, score)
+        return best
+
+    def put(self, question: str, agent_type: str, schema: str, sql: str) -> None:
+        """Store the SQL answering a question, replacing any older entry."""
+        normalized = normalize_question(question)
+        if not normalized:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO nl_sql_cache "
+                "(question, agent_type, schema_hash, sql, created_at, literals) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    normalized,
+                    agent_type,
+                    schema,
+                    sql,
+                    time.time(),
+                    json.dumps(question_literals(question)),
+                ),
+            )
+            if self.ttl:
+                self._conn.execute(
+                    "DELETE FROM nl_sql_cache WHERE created_at < ?",
+                    (time.time() - self.ttl,),
+                )
+
+    def invalidate(self, question: str, agent_type: str, schema: str) -> None:
+        """Drop the entry of a question whose cached SQL turned out to fail."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM nl_sql_cache WHERE question = ? AND agent_type = ? "
+                "AND schema_hash = ?",
+                (normalize_question(question), agent_type, schema),
+            )
@@ -0,0 +1,179 @@
+import difflib
+from typing import Dict, List, Optional, Set
+
+import sqlglot
+from sqlglot import exp
+from sqlglot.errors import ParseError
+
+from app.warehouse.catalog import SchemaCatalog
+
+
+# Statements that change data or schema are never sent to the warehouse
+_WRITE_NODES = tuple(
+    getattr(exp, name)
+    for name in (
+        "Insert",
+        "Update",
+        "Delete",
+        "Merge",
+        "Create",
+        "Drop",
+        "Alter",
+        "TruncateTable",
+        "Grant",
+        "Copy",
+    )
+    if hasattr(exp, name)
+)
+_READ_ROOTS = (exp.Select, exp.SetOperation)
+# Read-only metadata statements, run as they are without schema checks
+_METADATA_ROOTS = (exp.Show, exp.Describe)
+_METADATA_COMMANDS = {"SHOW", "DESC", "DESCRIBE"}
+
+
+class SQLValidationError(Exception):
+    """Raised when generated SQL fails validation before execution.
+
+    Attributes:
+        errors: One readable problem per entry, fed back to the LLM on retry.
+        fatal: Whether the statement must be refused rather than repaired.
+    """
+
+    def __init__(self, errors: List[str], fatal: bool = False):
+        self.errors = errors
+        self.fatal = fatal
+        super().__init__(str(self))
+
+    def __str__(self) -> str:
+        return "SQL failed validation:\n" + "\n".join(f"- {e}" for e in self.errors)
+
+
+class SQLValidator:
+    """Parses SQL locally and checks it against the schema catalog.
+
+    Only single, read-only SELECT statements and metadata statements such as
+    SHOW and DESCRIBE pass. USE is refused, since it would switch the context
+    of a pooled connection for every later borrower. Referenced tables and
+    qualified columns must exist in the catalog; unqualified columns must
+    exist in some catalog table or be defined by the query itself. A catalog
+    without tables only gets the statement checks.
+    """
+
+    def __init__(self, catalog: Optional[SchemaCatalog] = None, dialect="snowflake"):
+        self.dialect = dialect
+        self._columns: Dict[str, Set[str]] = {}
+        self._names: Dict[str, str] = {}
+        for table in catalog.tables if catalog else []:
+            key = table.name.lower()
+            self._names[key] = table.name
+            self._columns[key] = {c.name.strip('"').lower() for c in table.columns}
+        self._all_columns = set().union(*self._columns.values())
+
+    def validate(self, sql: str, check_schema: bool = True) -> exp.Expression:
+        """Validate a query, returning its parsed tree.
+
+        Raises:
+            SQLValidationError: If the query cannot run or is not allowed to.
+        """
+        try:
+            statements = [s for s in sqlglot.parse(sql, read=self.dialect) if s]
+        except ParseError as e:
+            raise SQLValidationError(_parse_errors(e)) from None
+
+        if len(statements) != 1:
+            raise SQLValidationError(
+                [f"Expected a single SQL statement, got {len(statements)}"]
+            )
+        tree = statements[0]
+        if isinstance(tree, exp.Use):
+            raise SQLValidationError(
+                [
+                    "USE statements are not allowed on shared connections; "
+                    "qualify table names with their database and schema instead"
+                ],
+                fatal=True,
+            )
+        if _is_metadata(tree):
+            return tree
+        if not isinstance(tree, _READ_ROOTS) or tree.find(*_WRITE_NODES):
+            raise SQLValidationError(
+                [
+                    "SQL statement is a DDL/DML which may modify database schema, "
+                    "so we will not be executing the statement at this time"
+                ],
+                fatal=True,
+            )
+
+        if check_schema and self._names:
+            errors = self._check_schema(tree)
+            if errors:
+                raise SQLValidationError(errors)
+        return tree
+
+    def _check_schema(self, tree: exp.Expression) -> List[str]:
+        errors = []
+        ctes = {cte.alias_or_name.lower() for cte in tree.find_all(exp.CTE)}
+        # Alias or name used in the query -> catalog table key
+        sources: Dict[str, str] = {}
+        for table in tree.find_all(exp.Table):
+            name = table.name.lower()
+            if not name or name in ctes:
+                continue
+            if name not in self._names:
+                errors.append(
+                    f"Unknown table '{table.name}'{self._suggest(name, self._names)}"
+                )
+                continue
+            sources[table.alias_or_name.lower()] = name
+
+        # Names the query defines itself: select aliases, derived tables, CTE columns
+        defined = {alias.alias.lower() for alias in tree.find_all(exp.Alias)}
+        defined.update(a.alias.lower() for a in tree.find_all(exp.TableAlias))
+        for table_alias in tree.find_all(exp.TableAlias):
+            defined.update(c.name.lower() for c in table_alias.columns)
+
+        for column in tree.find_all(exp.Column):
+            if isinstance(column.this, exp.Star):
+                continue
+            name = column.name.lower()
+            qualifier = column.table.lower()
+            if qualifier:
+                table_key = sources.get(qualifier)
+                if table_key and name not in self._columns[table_key]:
+                    errors.append(
+                        f"Column '{column.name}' does not exist in table "
+                        f"'{self._names[table_key]}'"
+                        f"{self._suggest(name, self._columns[table_key])}"
+                    )
+            elif name not in self._all_columns and name not in defined:
+                errors.append(f"Unknown column '{column.name}'")
+        # Keep the order of first appearance, without repeats
+        return list(dict.fromkeys(errors))
+
+    @staticmethod
+    def _suggest(name: str, candidates) -> str:
+        matches = difflib.get_close_matches(name, list(candidates), n=1)
+        if not matches:
+            return ""
+        # Catalog tables map lowercase keys to their spelling in the schema
+        match = candidates[matches[0]] if isinstance(candidates, dict) else matches[0]
+        return f" (did you mean '{match}'?)"
+
+
+def _is_metadata(tree: exp.Expression) -> bool:
+    if isinstance(tree, exp.Command):
+        # sqlglot parses less common SHOW variants as plain commands
+        return tree.name.upper() in _METADATA_COMMANDS
+    return isinstance(tree, _METADATA_ROOTS) and not tree.find(*_WRITE_NODES)
+
+
+def _parse_errors(error: ParseError) -> List[str]:
+    details = []
+    for item in error.errors or []:
+        highlight = item.get("highlight")
+        near = f" near '{highlight}'" if highlight else ""
+        details.append(
+            f"Syntax error at line {item.get('line')}, column {item.get('col')}: "
+            f"{item.get('description')}{near}"
+        )
+    return details or [f"Syntax error: {error}"]
@@ -0,0 +1,133 @@
+"""
+Cold-start benchmark for the OpenManus entry points.
+
+Imports ``main.py``, ``run_flow.py`` and ``run_mcp_server.py`` in fresh
+interpreters, the way a user launching them pays for it, and reports the
+median import time of each. The run fails when an entry point imports one
+of the heavy packages that are meant to load only on first use, and, given a
+saved baseline, when an entry point gets slower than that baseline.
+
+Usage:
+    python -m examples.benchmarks.startup
+    python -m examples.benchmarks.startup --save-baseline startup_baseline.json
+    python -m examples.benchmarks.startup --baseline startup_baseline.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+ENTRY_POINTS = ["main", "run_flow", "run_mcp_server"]
+
+# Packages that only the tools using them should load
+DEFERRED_MODULES = [
+    "browser_use",
+    "snowflake.connector",
+    "duckdb",
+    "boto3",
+    "pandas",
+    "pyarrow",
+    "sqlglot",
+]
+
+_PROBE = """
+import json, sys
+import {module}
+print(json.dumps([name for name in {deferred!r} if name in sys.modules]))
+"""
+
+
+def measure(module: str, runs: int) -> Dict:
+    """Import a module in ``runs`` fresh interpreters and time each import."""
+    timings: List[float] = []
+    loaded: List[str] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                _PROBE.format(module=module, deferred=DEFERRED_MODULES),
+            ],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        timings.append(time.perf_counter() - started)
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+        loaded = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {
+        "median": statistics.median(timings),
+        "min": min(timings),
+        "max": max(timings),
+        "deferred_loaded": loaded,
+    }
+
+
+def check(results: Dict[str, Dict], baseline: Dict[str, float], tolerance: float):
+    """List the regressions of a run.
+
+    Deferred packages loaded at startup always count; timings only count
+    against a baseline, since they depend on the machine.
+    """
+    failures = []
+    for module, result in results.items():
+        if result["deferred_loaded"]:
+            failures.append(
+                f"{module} imports {', '.join(result['deferred_loaded'])} at startup"
+            )
+        limit = baseline.get(module)
+        if limit is not None and result["median"] > limit * (1 + tolerance):
+            failures.append(
+                f"{module} starts in {result['median']:.2f}s, "
+                f"baseline {limit:.2f}s (+{tolerance:.0%} allowed)"
+            )
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure entry point start-up")
+    parser.add_argument("--runs", type=int, default=5, help="Imports per entry point")
+    parser.add_argument("--baseline", help="JSON file of baseline median seconds")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown over the baseline, as a fraction",
+    )
+    parser.add_argument(
+        "--save-baseline", help="Write this run's medians to a JSON file"
+    )
+    args = parser.parse_args()
+
+    results = {module: measure(module, args.runs) for module in ENTRY_POINTS}
+    for module, result in results.items():
+        print(
+            f"{module:<16} median {result['median']:.2f}s  "
+            f"min {result['min']:.2f}s  max {result['max']:.2f}s"
+        )
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({m: r["median"] for m, r in results.items()}, f, indent=2)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"REGRESSION: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+"""
+Text-to-SQL benchmark for the Snowflake authority agents.
+
+Replays a fixed corpus of natural-language questions through
+``BaseSnowflakeAgent.process_query`` without an LLM or a Snowflake account:
+a replay LLM answers every prompt with the corpus SQL, and queries run on a
+local DuckDB backend loaded with synthetic data. Some questions first answer
+with broken SQL, so the validation and retry path is measured too.
+
+Usage:
+    python -m examples.benchmarks.text_to_sql --rounds 5 --rows 10000
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+
+from app.agent.base_snowflake import BaseSnowflakeAgent
+from app.agent.org_authority import OrgAuthorityAgent
+from app.agent.person_authority import PersonAuthorityAgent
+from app.config import config
+from app.logger import define_log_level
+from app.warehouse import DuckDBBackend
+
+
+class BenchmarkQuestion(BaseModel):
+    """A question of the corpus with the SQL that answers it."""
+
+    agent_type: str
+    question: str
+    sql: str
+    broken_sql: Optional[str] = None
+
+
+CORPUS: List[BenchmarkQuestion] = [
+    BenchmarkQuestion(
+        agent_type="org",
+        question="Find the bestvalue address for goodwill industries of greater detroit",
+        sql="""
+            SELECT DISTINCT n.name, a.street1, a.street2, a.city, a.state_province, a.postal, a.country
+            FROM CORE.organization_name_latest n
+            JOIN CORE.organization_address_latest a
+                ON a.partition = n.partition AND a.partition_id = n.partition_id AND a.troaid = n.troaid
+            WHERE GET(a.metadata_flags, 'BESTVALUE') = true
+            AND n.name_type = 'Official'
+            AND lower(n.name) ILIKE '%goodwill industries of greater detroit%'
+            LIMIT 100
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="org",
+        question="How many active organizations are there per filing country",
+        sql="""
+            SELECT c.filing_country, COUNT(DISTINCT c.troaid) AS organizations
+            FROM CORE.organization_core_latest c
+            JOIN CORE.organization_activestatus_latest s ON s.troaid = c.troaid
+            WHERE s.active = TRUE
+            GROUP BY c.filing_country
+            ORDER BY organizations DESC
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="org",
+        question="List the ticker symbols and exchanges of Arch Coal",
+        broken_sql="""
+            SELECT n.name, t.ticker, t.exchange
+            FROM CORE.organization_name_latest n
+            JOIN CORE.organization_ticker_latest t ON t.troaid = n.troaid
+            WHERE lower(n.name) ILIKE '%arch coal%'
+        """,
+        sql="""
+            SELECT n.name, t.ticker_symbol, t.exchange_code
+            FROM CORE.organization_name_latest n
+            JOIN CORE.organization_ticker_latest t ON t.troaid = n.troaid
+            WHERE lower(n.name) ILIKE '%arch coal%'
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="org",
+        question="Which organizations have more than 5000 employees",
+        sql="""
+            SELECT n.name, e.num_employee, e.associated_year
+            FROM CORE.organization_name_latest n
+            JOIN CORE.organization_employee_latest e ON e.troaid = n.troaid
+            WHERE n.name_type = 'Official' AND e.num_employee > 5000
+            ORDER BY e.num_employee DESC
+            LIMIT 100
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="org",
+        question="Show the primary SIC and NAICS codes of every organization",
+        sql="""
+            SELECT n.name, s.sic_id, s.sic_name, x.naics_id, x.naics_name
+            FROM CORE.organization_name_latest n
+            JOIN CORE.organization_sic_latest s ON s.troaid = n.troaid AND s.primary_flag = TRUE
+            JOIN CORE.organization_naics_latest x ON x.troaid = n.troaid AND x.primary_flag = TRUE
+            WHERE n.name_type = 'Official'
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="org",
+        question="What is the total financial value reported per fiscal year",
+        sql="""
+            SELECT f.fiscal_period_year, SUM(f.financial_value) AS total_value, COUNT(*) AS filings
+            FROM CORE.organization_financials_latest f
+            GROUP BY f.fiscal_period_year
+            ORDER BY f.fiscal_period_year
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="org",
+        question="Find the organizations in Michigan that are not their own ultimate parent",
+        # Passes validation but fails in the warehouse: booleans are not strings
+        broken_sql="""
+            SELECT n.name, h.ultimate_id
+            FROM CORE.organization_name_latest n
+            JOIN CORE.organization_address_latest a ON a.troaid = n.troaid
+            JOIN CORE.organization_hierarchy_latest h ON h.troaid = n.troaid
+            WHERE a.state_province = 'Michigan' AND h.is_ultimate = 'not ultimate'
+        """,
+        sql="""
+            SELECT n.name, h.ultimate_id
+            FROM CORE.organization_name_latest n
+            JOIN CORE.organization_address_latest a ON a.troaid = n.troaid
+            JOIN CORE.organization_hierarchy_latest h ON h.troaid = n.troaid
+            WHERE a.state_province = 'Michigan' AND h.is_ultimate = FALSE
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="org",
+        question="List every identifier of every organization",
+        sql="SELECT i.troaid, i.id_type, i.id_value FROM CORE.organization_id_latest i",
+    ),
+    BenchmarkQuestion(
+        agent_type="person",
+        question="Find the current addresses for john doe",
+        sql="""
+            SELECT DISTINCT t.trpaid, concat(n.first_name, ' ', n.last_name) AS full_name,
+                a.house_number, a.street_name, a.city, a.state_province, a.postal_code
+            FROM PERSON_NAME n
+            JOIN PERSON_TRPAID t ON t.partition = n.partition AND t.partition_id = n.partition_id
+            JOIN PERSON_ADDRESS a ON a.partition = n.partition AND a.partition_id = n.partition_id
+            WHERE n.is_deleted = FALSE AND a.is_deleted = FALSE AND a.is_current = TRUE
+            AND lower(n.first_name) ILIKE '%john%' AND lower(n.last_name) ILIKE '%doe%'
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="person",
+        question="How many people are there of each gender",
+        sql="""
+            SELECT g.gender, COUNT(DISTINCT g.partition_id) AS people
+            FROM PERSON_GENDER g
+            WHERE g.is_deleted = FALSE
+            GROUP BY g.gender
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="person",
+        question="List the current primary phone numbers of people named Smith",
+        sql="""
+            SELECT n.first_name, n.last_name, p.phone, p.phone_type
+            FROM PERSON_NAME n
+            JOIN PERSON_PHONE p ON p.partition = n.partition AND p.partition_id = n.partition_id
+            WHERE lower(n.last_name) ILIKE '%smith%'
+            AND p.is_current = TRUE AND p.is_primary = TRUE AND p.is_deleted = FALSE
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="person",
+        question="Find the driver's license details for individuals born in 1985",
+        broken_sql="""
+            SELECT n.first_name, n.last_name d.date_of_birth, dl.license_number
+            FROM PERSON_NAME n
+            JOIN PERSON_DOB d ON d.partition = n.partition AND d.partition_id = n.partition_id
+            JOIN PERSON_DL dl ON dl.partition = n.partition AND dl.partition_id = n.partition_id
+            WHERE d.date_of_birth ILIKE '%1985%'
+        """,
+        sql="""
+            SELECT n.first_name, n.last_name, d.date_of_birth, dl.license_number, dl.issue_state
+            FROM PERSON_NAME n
+            JOIN PERSON_DOB d ON d.partition = n.partition AND d.partition_id = n.partition_id
+            JOIN PERSON_DL dl ON dl.partition = n.partition AND dl.partition_id = n.partition_id
+            WHERE d.date_of_birth ILIKE '%1985%'
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="person",
+        question="Which people have a match score above 0.9",
+        sql="""
+            SELECT t.trpaid, m.match_score
+            FROM PERSON_TRPAID t
+            JOIN PERSON_MATCH_SCORE m ON m.trpaid = t.trpaid
+            WHERE m.match_score > 0.9 AND m.is_deleted = FALSE
+            ORDER BY m.match_score DESC
+        """,
+    ),
+    BenchmarkQuestion(
+        agent_type="person",
+        question="How many people are in each released batch",
+        sql="""
+            SELECT w.batch_number, w.sub_batch_number, COUNT(t.trpaid) AS people
+            FROM PERSON_TRPAID t
+            JOIN WORKFLOW_RUN_RECORD w
+                ON t.batch_number = w.batch_number AND t.sub_batch_number = w.sub_batch_number
+            WHERE w.released IN ('INGESTED', 'RELEASED')
+            GROUP BY w.batch_number, w.sub_batch_number
+        """,
+    ),
+]
+
+
+class ReplayLLM:
+    """Stands in for the LLM, answering prompts with the corpus SQL.
+
+    The first prompt of a question gets its ``broken_sql`` when it has one;
+    a retry prompt quoting that SQL gets the working version.
+    """
+
+    def __init__(self, questions: List[BenchmarkQuestion], latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+        self._by_question = {q.question: q for q in questions}
+
+    async def ask(self, messages: List[Dict], **kwargs) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = messages[-1]["content"]
+        for question in self._by_question.values():
+            if question.broken_sql and question.broken_sql.strip() in prompt:
+                return f"```sql\n{question.sql.strip()}\n```"
+
+        match = re.search(r"#Query:\s*(.*?)\s*$", prompt, re.DOTALL)
+        question = self._by_question.get(match.group(1) if match else "")
+        if question is None:
+            raise ValueError("Prompt does not match a benchmark question")
+        return f"```sql\n{(question.broken_sql or question.sql).strip()}\n```"
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+async def run_benchmark(
+    rounds: int = 3,
+    rows_per_table: int = 1000,
+    llm_latency: float = 0.0,
+    use_cache: bool = False,
+) -> Dict:
+    """Replay the corpus through the authority agents and collect timings.
+
+    Args:
+        rounds: Times the whole corpus is replayed.
+        rows_per_table: Synthetic rows loaded into each DuckDB table.
+        llm_latency: Seconds each replayed LLM call sleeps, to model the API.
+        use_cache: Keep the SQL and result caches configured for the agents.
+
+    Returns:
+        Dict: Latency percentiles in milliseconds, throughput and retries.
+    """
+    llm = ReplayLLM(CORPUS, latency=llm_latency)
+    agents: Dict[str, BaseSnowflakeAgent] = {}
+    for agent_cls in (OrgAuthorityAgent, PersonAuthorityAgent):
+        agent = agent_cls(config=config)
+        agent.llm = llm
+        agent.backend = DuckDBBackend.from_catalog(
+            agent.catalog, rows_per_table=rows_per_table, name=agent.agent_type
+        )
+        if not use_cache:
+            agent.sql_cache = None
+            agent.result_cache = None
+        agents[agent.agent_type] = agent
+
+    latencies, failures = [], []
+    total_rows = retries = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for question in CORPUS:
+            calls_before = llm.calls
+            query_started = time.perf_counter()
+            try:
+                result = await agents[question.agent_type].process_query(
+                    question.question, use_cache=use_cache
+                )
+                total_rows += result.total_rows
+            except Exception as e:
+                failures.append(f"{question.question}: {e}")
+            latencies.append(time.perf_counter() - query_started)
+            retries += max(0, llm.calls - calls_before - 1)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "queries": len(latencies),
+        "failures": len(failures),
+        "failure_details": failures,
+        "retries": retries,
+        "llm_calls": llm.calls,
+        "rows": total_rows,
+        "rows_per_sec": total_rows / elapsed if elapsed else 0.0,
+        "elapsed_sec": elapsed,
+        "latency_ms": {
+            "p50": _percentile(latencies, 50) * 1000,
+            "p90": _percentile(latencies, 90) * 1000,
+            "p99": _percentile(latencies, 99) * 1000,
+            "mean": sum(latencies) / len(latencies) * 1000 if latencies else 0.0,
+        },
+    }
+
+
+def _print_report(report: Dict) -> None:
+    latency = report["latency_ms"]
+    print(f"Queries:      {report['queries']} ({report['failures']} failed)")
+    print(f"LLM calls:    {report['llm_calls']} ({report['retries']} retries)")
+    print(
+        f"Latency (ms): p50 {latency['p50']:.1f}  p90 {latency['p90']:.1f}  "
+        f"p99 {latency['p99']:.1f}  mean {latency['mean']:.1f}"
+    )
+    print(f"Rows:         {report['rows']:,} ({report['rows_per_sec']:,.0f} rows/sec)")
+    for failure in report["failure_details"]:
+        print(f"  FAILED {failure}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the text-to-SQL benchmark")
+    parser.add_argument("--rounds", type=int, default=3, help="Corpus replays")
+    parser.add_argument(
+        "--rows", type=int, default=1000, help="Synthetic rows per table"
+    )
+    parser.add_argument(
+        "--llm-latency",
+        type=float,
+        default=0.0,
+        help="Simulated seconds per LLM call",
+    )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Keep the SQL and result caches enabled",
+    )
+    parser.add_argument("--output", help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    # Logging every query would dominate the timings, and the retried
+    # questions fail on purpose; real failures are listed in the report
+    define_log_level(print_level="CRITICAL", logfile_level="WARNING")
+    report = asyncio.run(
+        run_benchmark(args.rounds, args.rows, args.llm_latency, args.use_cache)
+    )
+    _print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from app.agent.base_snowflake import BaseSnowflakeAgent
+from app.config import WarehouseSettings
+from app.warehouse import SchemaCatalog, SQLValidator
+
+
+SCHEMA = """You write Snowflake SQL.
+Tables:
+    1. `person`
+        - person_id INT,
+        - full_name VARCHAR
+    2. `phone`
+        - person_id INT,
+        - phone_number VARCHAR
+    3. `employer`
+        - employer_id INT,
+        - company_name VARCHAR
+Answer with SQL only.
+"""
+
+FIXED_SQL = "SELECT phone_number FROM phone"
+
+
+class FakeLLM:
+    """Answers every prompt with the fixed SQL and records the prompts."""
+
+    def __init__(self):
+        self.prompts: List[str] = []
+
+    async def ask(self, messages) -> str:
+        self.prompts.append(messages[0]["content"])
+        return f"```sql\n{FIXED_SQL}\n```"
+
+
+class FakeBackend:
+    """Runs every statement successfully."""
+
+    key = "fake"
+
+    async def execute(self, sql: str) -> SimpleNamespace:
+        return SimpleNamespace(sql=sql, total_rows=1)
+
+
+def make_agent() -> BaseSnowflakeAgent:
+    catalog = SchemaCatalog.from_prompt(SCHEMA)
+    # Built without validation, so no language model or warehouse is set up
+    return BaseSnowflakeAgent.model_construct(
+        name="test",
+        llm=FakeLLM(),
+        config=SimpleNamespace(
+            warehouse_config=WarehouseSettings(schema_top_k_tables=1)
+        ),
+        schema_prompt=SCHEMA,
+        catalog=catalog,
+        validator=SQLValidator(catalog),
+        backend=FakeBackend(),
+        sql_cache=None,
+        result_cache=None,
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_prunes_schema_for_the_question():
+    """Tests that a repair prompt keeps the tables the question is about."""
+    agent = make_agent()
+    result = await agent.execute_query(
+        "SELECT number FROM person", question="List every phone number"
+    )
+
+    assert result.sql == FIXED_SQL
+    assert len(agent.llm.prompts) == 1
+    assert "`phone`" in agent.llm.prompts[0]
+    assert "`employer`" not in agent.llm.prompts[0]
@@ -0,0 +1,74 @@
+from app.schema import Memory, Message
+
+
+class CountingTokenizer:
+    """Counts one token per character and records which messages it saw."""
+
+    def __init__(self):
+        self.seen = []
+
+    def __call__(self, message: Message) -> int:
+        self.seen.append(message)
+        return len(message.content)
+
+
+def test_only_new_messages_are_counted():
+    """Tests that counts of earlier messages are reused."""
+    memory = Memory()
+    tokenizer = CountingTokenizer()
+    memory.add_messages([Message.user_message("hello"), Message.user_message("ab")])
+    assert memory.count_tokens(tokenizer) == 7
+
+    memory.add_message(Message.assistant_message("xyz"))
+    assert memory.count_tokens(tokenizer) == 10
+    assert [m.content for m in tokenizer.seen] == ["hello", "ab", "xyz"]
+
+
+def test_trim_evicts_counts_of_identical_messages_separately():
+    """Tests that equal messages keep their own counts when one is trimmed."""
+    memory = Memory(max_messages=2)
+    tokenizer = CountingTokenizer()
+    memory.add_messages([Message.user_message("hi"), Message.user_message("hi")])
+    assert memory.count_tokens(tokenizer) == 4
+
+    memory.add_message(Message.user_message("x"))
+    assert [m.content for m in memory.messages] == ["hi", "x"]
+    assert memory.count_tokens(tokenizer) == 3
+    assert len(tokenizer.seen) == 3
+
+
+def test_trim_before_counting():
+    """Tests that messages trimmed before they were counted are not counted."""
+    memory = Memory(max_messages=2)
+    tokenizer = CountingTokenizer()
+    memory.add_message(Message.user_message("aaaa"))
+    assert memory.count_tokens(tokenizer) == 4
+
+    memory.add_messages([Message.user_message("b"), Message.user_message("cc")])
+    assert memory.count_tokens(tokenizer) == 3
+    assert [m.content for m in tokenizer.seen] == ["aaaa", "b", "cc"]
+
+
+def test_replaced_messages_are_recounted():
+    """Tests that invalidating after replacing the list recounts it."""
+    memory = Memory()
+    tokenizer = CountingTokenizer()
+    memory.add_messages([Message.user_message("one"), Message.user_message("two")])
+    assert memory.count_tokens(tokenizer) == 6
+
+    memory.messages = [Message.user_message("three")]
+    memory.invalidate_token_counts()
+    assert memory.count_tokens(tokenizer) == 5
+
+
+def test_clear_resets_counts():
+    """Tests that clearing memory drops every count."""
+    memory = Memory()
+    tokenizer = CountingTokenizer()
+    memory.add_message(Message.user_message("abc"))
+    memory.count_tokens(tokenizer)
+
+    memory.clear()
+    assert memory.count_tokens(tokenizer) == 0
+    memory.add_message(Message.user_message("z"))
+    assert memory.count_tokens(tokenizer) == 1
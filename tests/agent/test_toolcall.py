@@ -0,0 +1,144 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+from openai.types.chat import ChatCompletionMessage
+
+from app.agent.toolcall import ToolCallAgent
+from app.llm import LLM, TokenCounter
+from app.schema import Function, Message, ToolCall
+from app.tool import ToolCollection
+from app.tool.base import BaseTool
+
+
+EVENTS: List[str] = []
+
+
+class RecordingTool(BaseTool):
+    """Records when each call starts and ends, finishing calls in reverse order."""
+
+    description: str = "Records its calls"
+
+    async def execute(self, label: str) -> str:
+        EVENTS.append(f"start {label}")
+        await asyncio.sleep(0.1 / int(label))
+        EVENTS.append(f"end {label}")
+        return label
+
+
+def make_agent(**kwargs) -> ToolCallAgent:
+    EVENTS.clear()
+    tools = ToolCollection(
+        RecordingTool(name="safe", parallel_safe=True),
+        RecordingTool(name="unsafe"),
+    )
+    # Built without validation, so no language model is set up
+    return ToolCallAgent.model_construct(llm=None, available_tools=tools, **kwargs)
+
+
+def calls(*names: str) -> List[ToolCall]:
+    return [
+        ToolCall(
+            id=str(index),
+            function=Function(name=name, arguments=f'{{"label": "{index}"}}'),
+        )
+        for index, name in enumerate(names, start=1)
+    ]
+
+
+class RecordingTokenizer:
+    """Counts one token per character and records every text it encodes."""
+
+    def __init__(self):
+        self.encoded: List[str] = []
+
+    def encode(self, text: str) -> List[int]:
+        self.encoded.append(text)
+        return [0] * len(text)
+
+
+def offline_llm(tokenizer: RecordingTokenizer) -> LLM:
+    """Builds an LLM whose completions answer "ok" without any network access."""
+    llm = object.__new__(LLM)
+    llm.model = "gpt-4o"
+    llm.max_tokens = 100
+    llm.temperature = 0.0
+    llm.max_input_tokens = None
+    llm.total_input_tokens = llm.total_completion_tokens = 0
+    llm.tokenizer = tokenizer
+    llm.token_counter = TokenCounter(tokenizer)
+
+    async def create(**params):
+        message = ChatCompletionMessage(role="assistant", content="ok")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            usage=SimpleNamespace(prompt_tokens=1, completion_tokens=1),
+        )
+
+    llm.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=create))
+    )
+    return llm
+
+
+@pytest.mark.asyncio
+async def test_think_encodes_only_new_messages():
+    """Tests that each step encodes the messages added since the last one."""
+    tokenizer = RecordingTokenizer()
+    agent = ToolCallAgent.model_construct(
+        llm=offline_llm(tokenizer),
+        available_tools=ToolCollection(),
+        system_prompt=None,
+        next_step_prompt="next step",
+    )
+    agent.memory.add_message(Message.user_message("task"))
+
+    await agent.think()
+    assert [text for text in tokenizer.encoded if text in ("task", "ok")] == ["task"]
+
+    tokenizer.encoded.clear()
+    await agent.think()
+    assert "task" not in tokenizer.encoded
+    assert tokenizer.encoded.count("next step") == 1
+    assert tokenizer.encoded.count("ok") == 1
+
+
+@pytest.mark.asyncio
+async def test_parallel_safe_calls_run_concurrently():
+    """Tests that consecutive parallel-safe calls overlap and an unsafe one waits."""
+    agent = make_agent(parallel_tool_calls=True)
+    agent.tool_calls = calls("safe", "safe", "unsafe", "safe")
+
+    await agent.act()
+    assert EVENTS == [
+        "start 1",
+        "start 2",
+        "end 2",
+        "end 1",
+        "start 3",
+        "end 3",
+        "start 4",
+        "end 4",
+    ]
+    assert [m.tool_call_id for m in agent.memory.messages] == ["1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_calls_run_one_by_one_by_default():
+    """Tests that calls stay sequential unless the agent opts in."""
+    agent = make_agent()
+    agent.tool_calls = calls("safe", "safe")
+
+    await agent.act()
+    assert EVENTS == ["start 1", "end 1", "start 2", "end 2"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_capped():
+    """Tests that no more than max_parallel_tool_calls run at once."""
+    agent = make_agent(parallel_tool_calls=True, max_parallel_tool_calls=1)
+    agent.tool_calls = calls("safe", "safe")
+
+    await agent.act()
+    assert EVENTS == ["start 1", "end 1", "start 2", "end 2"]
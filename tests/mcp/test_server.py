@@ -0,0 +1,126 @@
+import asyncio
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+import app.mcp.server as server_module
+from app.config import MCPSettings
+from app.mcp.server import MCPServer
+from app.tool.base import BaseTool
+
+
+EVENTS: List[str] = []
+
+
+class SlowTool(BaseTool):
+    """Records when calls start and end, and whether it was cleaned up."""
+
+    name: str = "slow"
+    description: str = "Sleeps briefly"
+    cleaned_up: bool = False
+
+    async def execute(self, label: str) -> str:
+        EVENTS.append(f"start {label}")
+        await asyncio.sleep(0.05)
+        EVENTS.append(f"end {label}")
+        return str(id(self))
+
+    async def cleanup(self) -> None:
+        await asyncio.sleep(0)
+        self.cleaned_up = True
+
+
+def use_settings(monkeypatch, **kwargs) -> None:
+    settings = MCPSettings(tool_concurrency={}, **kwargs)
+    monkeypatch.setattr(server_module, "config", SimpleNamespace(mcp_config=settings))
+    # The real browser sets up a language model when it is built
+    monkeypatch.setattr(server_module, "BrowserUseTool", SlowTool)
+
+
+@pytest.fixture(scope="function")
+def server(monkeypatch) -> MCPServer:
+    """Creates a server without per-tool limits."""
+    EVENTS.clear()
+    use_settings(monkeypatch)
+    return MCPServer()
+
+
+async def call(server: MCPServer, session: str, label: str) -> str:
+    return await server._execute_for_client(
+        session, "slow", SlowTool(), {"label": label}
+    )
+
+
+@pytest.mark.asyncio
+async def test_each_client_gets_its_own_tool(server):
+    """Tests that clients run on separate instances, each reused across calls."""
+    first = await call(server, "a", "1")
+    assert await call(server, "a", "2") == first
+    assert await call(server, "b", "3") != first
+    assert sorted(server.clients) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_clients_run_concurrently_but_each_in_order(server):
+    """Tests that one client's calls queue while other clients proceed."""
+    await asyncio.gather(call(server, "a", "a1"), call(server, "a", "a2"))
+    assert EVENTS == ["start a1", "end a1", "start a2", "end a2"]
+
+    EVENTS.clear()
+    await asyncio.gather(call(server, "a", "a1"), call(server, "b", "b1"))
+    assert EVENTS[:2] == ["start a1", "start b1"]
+
+
+@pytest.mark.asyncio
+async def test_tool_concurrency_limit(server):
+    """Tests that a per-tool limit bounds calls across all clients."""
+    server.limits["slow"] = asyncio.Semaphore(1)
+    await asyncio.gather(call(server, "a", "a1"), call(server, "b", "b1"))
+    assert EVENTS == ["start a1", "end a1", "start b1", "end b1"]
+
+
+@pytest.mark.asyncio
+async def test_least_recent_client_is_evicted(monkeypatch):
+    """Tests that a new client replaces an idle one once the limit is reached."""
+    use_settings(monkeypatch, max_clients=1)
+    server = MCPServer()
+    await call(server, "a", "1")
+    tool = server.clients["a"].tools["slow"]
+
+    await call(server, "b", "2")
+    assert list(server.clients) == ["b"]
+    assert tool.cleaned_up
+
+    busy = asyncio.create_task(call(server, "b", "3"))
+    await asyncio.sleep(0)
+    with pytest.raises(RuntimeError, match="Maximum number of MCP clients"):
+        await call(server, "c", "4")
+    await busy
+
+
+@pytest.mark.asyncio
+async def test_idle_clients_are_closed(monkeypatch):
+    """Tests that clients idle longer than the timeout lose their tools."""
+    use_settings(monkeypatch, client_idle_timeout=0)
+    server = MCPServer()
+    await call(server, "a", "1")
+    tool = server.clients["a"].tools["slow"]
+
+    await call(server, "b", "2")
+    assert "a" not in server.clients
+    assert tool.cleaned_up
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_evict_each_client_once(monkeypatch):
+    """Tests that calls evicting the same idle clients side by side all succeed."""
+    use_settings(monkeypatch, client_idle_timeout=0)
+    server = MCPServer()
+    await asyncio.gather(call(server, "a", "1"), call(server, "b", "2"))
+    tools = [client.tools["slow"] for client in server.clients.values()]
+    assert len(tools) == 2
+
+    await asyncio.gather(call(server, "c", "3"), call(server, "d", "4"))
+    assert all(tool.cleaned_up for tool in tools)
+    assert "a" not in server.clients and "b" not in server.clients
@@ -1,12 +1,15 @@
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from typing import AsyncGenerator
 
 import pytest
 import pytest_asyncio
 
+import app.sandbox.core.sandbox as sandbox_module
 from app.config import SandboxSettings
 from app.sandbox.client import LocalSandboxClient, create_sandbox_client
+from app.sandbox.core.sandbox import DockerSandbox
 
 
 @pytest_asyncio.fixture(scope="function")
@@ -16,7 +19,7 @@ async def local_client() -> AsyncGenerator[LocalSandboxClient, None]:
     try:
         yield client
     finally:
-        await client.cleanup()
+        await client.shutdown()
 
 
 @pytest.fixture(scope="function")
@@ -106,5 +109,44 @@ async def test_local_error_handling(local_client: LocalSandboxClient):
     assert "not found" in str(exc.value).lower()
 
 
+@pytest.mark.asyncio
+async def test_local_batch_file_operations(local_client: LocalSandboxClient):
+    """Tests reading, writing and checking several files at once."""
+    await local_client.create()
+
+    await local_client.write_files(
+        {"/workspace/a.txt": "first", "/workspace/sub/b.txt": "second"}
+    )
+    assert await local_client.read_files(
+        ["/workspace/a.txt", "/workspace/sub/b.txt"]
+    ) == {"/workspace/a.txt": "first", "/workspace/sub/b.txt": "second"}
+    assert await local_client.stat_files(
+        ["/workspace/a.txt", "/workspace/sub", "/workspace/missing"]
+    ) == {
+        "/workspace/a.txt": "file",
+        "/workspace/sub": "directory",
+        "/workspace/missing": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_stat_files_with_missing_output_lines(monkeypatch):
+    """Tests that paths the stat command gave no line for count as missing."""
+    monkeypatch.setattr(sandbox_module.docker, "from_env", lambda: SimpleNamespace())
+    sandbox = DockerSandbox()
+
+    async def cut_off(cmd, timeout=None):
+        return "f\nd\n"
+
+    monkeypatch.setattr(sandbox, "run_command", cut_off)
+
+    assert await sandbox.stat_files(["/a", "/b", "/c"]) == {
+        "/a": "file",
+        "/b": "directory",
+        "/c": None,
+    }
+    assert await sandbox.stat_files([]) == {}
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
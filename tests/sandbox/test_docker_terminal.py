@@ -1,10 +1,14 @@
 """Tests for the AsyncDockerizedTerminal implementation."""
 
+import socket
+import subprocess
+
 import docker
 import pytest
 import pytest_asyncio
 
-from app.sandbox.core.terminal import AsyncDockerizedTerminal
+import app.sandbox.core.terminal as terminal_module
+from app.sandbox.core.terminal import AsyncDockerizedTerminal, DockerSession
 
 
 @pytest.fixture(scope="module")
@@ -93,6 +97,58 @@ class TestAsyncDockerizedTerminal:
         assert terminal.session is not None
 
 
+@pytest.fixture
+def local_session(monkeypatch):
+    """Fixture providing a session whose socket is wired to a local bash."""
+    monkeypatch.setattr(terminal_module, "APIClient", lambda: None)
+    ours, theirs = socket.socketpair()
+    process = subprocess.Popen(
+        ["bash", "--norc", "--noprofile"],
+        stdin=theirs,
+        stdout=theirs,
+        stderr=subprocess.STDOUT,
+    )
+    theirs.close()
+    ours.setblocking(False)
+    session = DockerSession("local")
+    session.socket = ours
+    yield session
+    process.kill()
+    process.wait()
+    ours.close()
+
+
+class TestDockerSession:
+    """Test cases for reading the exec socket through the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_marker_split_across_reads(self, local_session):
+        """Test that output and markers arriving in small pieces are joined."""
+        local_session._read_size = 7
+        assert await local_session.execute("echo first; echo second") == (
+            "first\nsecond"
+        )
+
+    @pytest.mark.asyncio
+    async def test_large_output(self, local_session):
+        """Test that output larger than one read arrives whole."""
+        result = await local_session.execute("seq 1 50000", timeout=10)
+        assert result.splitlines() == [str(i) for i in range(1, 50001)]
+
+    @pytest.mark.asyncio
+    async def test_output_of_timed_out_command_is_dropped(self, local_session):
+        """Test that a late finishing command does not leak into the next one."""
+        with pytest.raises(TimeoutError):
+            await local_session.execute("sleep 0.5; echo late", timeout=0.1)
+        assert await local_session.execute("echo next", timeout=5) == "next"
+
+    @pytest.mark.asyncio
+    async def test_closed_session_raises(self, local_session):
+        """Test that a shell exiting before the marker fails the command."""
+        with pytest.raises(RuntimeError, match="Failed to execute command"):
+            await local_session.execute("exit", timeout=5)
+
+
 # Configure pytest-asyncio
 def pytest_configure(config):
     """Configure pytest-asyncio."""
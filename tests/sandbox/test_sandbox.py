@@ -1,7 +1,11 @@
+import io
+import os
+import tarfile
+
 import pytest
 import pytest_asyncio
 
-from app.sandbox.core.sandbox import DockerSandbox, SandboxSettings
+from app.sandbox.core.sandbox import DockerSandbox, SandboxSettings, _stream_tar
 
 
 @pytest.fixture(scope="module")
@@ -148,5 +152,26 @@ async def test_sandbox_error_handling():
         await sandbox.create()
 
 
+def test_stream_tar_keeps_symlinks(tmp_path):
+    """Tests that streamed archives hold links as links, broken ones included."""
+    (tmp_path / "data.txt").write_text("content")
+    os.symlink("data.txt", tmp_path / "link.txt")
+    os.symlink("missing.txt", tmp_path / "broken.txt")
+    entries = [
+        (str(tmp_path / name), f"dst/{name}")
+        for name in ("data.txt", "link.txt", "broken.txt")
+    ]
+
+    archive = b"".join(_stream_tar(entries, chunk_size=3))
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        members = {member.name: member for member in tar}
+        assert tar.extractfile(members["dst/data.txt"]).read() == b"content"
+
+    assert members["dst/link.txt"].issym()
+    assert members["dst/link.txt"].linkname == "data.txt"
+    assert members["dst/broken.txt"].issym()
+    assert members["dst/broken.txt"].linkname == "missing.txt"
+
+
 if __name__ == "__main__":
     pytest.main(["-v", __file__])
@@ -0,0 +1,249 @@
+import asyncio
+from types import SimpleNamespace
+from typing import AsyncGenerator, List
+
+import pytest
+import pytest_asyncio
+from docker.errors import ImageNotFound
+from pydantic import ValidationError
+
+import app.sandbox.core.manager as manager_module
+from app.config import SandboxSettings
+from app.sandbox.client import LocalSandboxClient
+from app.sandbox.core.manager import SandboxManager
+
+
+class FakeSandbox:
+    """Records the lifecycle calls a pooled sandbox receives."""
+
+    created: List["FakeSandbox"] = []
+
+    def __init__(self, config=None, volume_bindings=None):
+        self.config = config
+        self.volume_bindings = volume_bindings
+        self.resets = 0
+        self.cleaned_up = False
+        self.fail_reset = False
+
+    async def create(self) -> "FakeSandbox":
+        FakeSandbox.created.append(self)
+        return self
+
+    async def reset(self) -> None:
+        if self.fail_reset:
+            raise RuntimeError("reset failed")
+        self.resets += 1
+
+    async def cleanup(self) -> None:
+        self.cleaned_up = True
+
+    async def run_command(self, cmd: str, timeout=None) -> str:
+        await asyncio.sleep(float(cmd))
+        return cmd
+
+
+class FakeContainer:
+    """A container that runs the template install with a given exit status."""
+
+    def __init__(self, docker: "FakeDocker", status: int):
+        self.docker = docker
+        self.status = status
+        self.removed = False
+
+    def wait(self):
+        return {"StatusCode": self.status}
+
+    def logs(self, tail=None):
+        return b"No matching distribution"
+
+    def commit(self, repository, tag, changes):
+        self.docker.images.add(f"{repository}:{tag}")
+
+    def remove(self, force=False):
+        self.removed = force
+
+
+class FakeDocker:
+    """Knows every base image; template images exist only once committed."""
+
+    def __init__(self):
+        self.images = set()
+        self.containers: List[FakeContainer] = []
+        self.install_status = 0
+
+    def get_image(self, image):
+        if image.startswith(SandboxManager.template_repository) and (
+            image not in self.images
+        ):
+            raise ImageNotFound(image)
+        return image
+
+    def run(self, image, command, detach=False):
+        container = FakeContainer(self, self.install_status)
+        self.containers.append(container)
+        return container
+
+
+@pytest.fixture(autouse=True)
+def fake_docker(monkeypatch) -> FakeDocker:
+    """Replaces Docker and its containers with in-memory fakes."""
+    FakeSandbox.created = []
+    docker = FakeDocker()
+    client = SimpleNamespace(
+        images=SimpleNamespace(get=docker.get_image),
+        containers=SimpleNamespace(run=docker.run),
+    )
+    monkeypatch.setattr(manager_module.docker, "from_env", lambda: client)
+    monkeypatch.setattr(manager_module, "DockerSandbox", FakeSandbox)
+    return docker
+
+
+def pool_config(**kwargs) -> SandboxSettings:
+    return SandboxSettings(pool_size=2, **kwargs)
+
+
+async def warmed(manager: SandboxManager) -> None:
+    await asyncio.gather(*manager._refill_tasks.values())
+
+
+@pytest_asyncio.fixture(scope="function")
+async def manager() -> AsyncGenerator[SandboxManager, None]:
+    """Creates a manager for at most three sandboxes that warms its pool at once."""
+    manager = SandboxManager(max_sandboxes=3, config=pool_config())
+    try:
+        yield manager
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_pool_is_warmed_on_construction(manager):
+    """Tests that containers start before the first sandbox is requested."""
+    await warmed(manager)
+    assert len(FakeSandbox.created) == 2
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_reset_sandbox(manager):
+    """Tests that a sandbox released by the client is reset and handed out again."""
+    client = LocalSandboxClient(manager)
+    await warmed(manager)
+
+    await client.create(pool_config())
+    first = client.sandbox
+    assert first in FakeSandbox.created
+    await client.cleanup()
+    assert first.resets == 1
+    assert not first.cleaned_up
+
+    await warmed(manager)
+    await client.create(pool_config())
+    assert client.sandbox is first
+
+
+@pytest.mark.asyncio
+async def test_sandbox_in_use_is_not_closed_as_idle():
+    """Tests that client calls keep their sandbox from being closed as idle."""
+    manager = SandboxManager(idle_timeout=0.1, config=pool_config())
+    client = LocalSandboxClient(manager)
+    try:
+        await client.create(pool_config())
+        busy = asyncio.create_task(client.run_command("0.2"))
+        await asyncio.sleep(0.15)
+        await manager._cleanup_idle_sandboxes()
+        assert client.sandbox_id in manager._sandboxes
+
+        await busy
+        await manager._cleanup_idle_sandboxes()
+        assert client.sandbox_id in manager._sandboxes
+
+        await asyncio.sleep(0.15)
+        await manager._cleanup_idle_sandboxes()
+        with pytest.raises(KeyError):
+            await client.run_command("0")
+    finally:
+        await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_destroy_policy_and_failed_reset_destroy_sandbox(manager):
+    """Tests that released sandboxes are destroyed when they must not be reused."""
+    await warmed(manager)
+    sandbox_id = await manager.create_sandbox(pool_config(pool_policy="destroy"))
+    sandbox = manager._sandboxes[sandbox_id]
+    await manager.delete_sandbox(sandbox_id)
+    assert sandbox.cleaned_up and not sandbox.resets
+
+    await warmed(manager)
+    sandbox_id = await manager.create_sandbox(pool_config())
+    sandbox = manager._sandboxes[sandbox_id]
+    sandbox.fail_reset = True
+    await manager.delete_sandbox(sandbox_id)
+    assert sandbox.cleaned_up
+    assert sandbox not in manager._pools[manager._pool_key(pool_config())]
+
+
+def test_unknown_pool_policy_is_rejected():
+    """Tests that a misspelt pool policy fails validation instead of destroying."""
+    with pytest.raises(ValidationError):
+        pool_config(pool_policy="rest")
+
+
+@pytest.mark.asyncio
+async def test_warm_sandboxes_count_against_limit(manager):
+    """Tests that unpooled sandboxes give up warm containers, then hit the limit."""
+    await warmed(manager)
+    await manager.create_sandbox(pool_config(), volume_bindings={"/a": "/a"})
+    await manager.create_sandbox(pool_config(), volume_bindings={"/b": "/b"})
+    assert sum(sandbox.cleaned_up for sandbox in FakeSandbox.created) == 1
+
+    await manager.create_sandbox(pool_config(), volume_bindings={"/c": "/c"})
+    assert sum(sandbox.cleaned_up for sandbox in FakeSandbox.created) == 2
+    with pytest.raises(RuntimeError, match="Maximum number of sandboxes"):
+        await manager.create_sandbox(pool_config(), volume_bindings={"/d": "/d"})
+
+
+@pytest.mark.asyncio
+async def test_template_is_built_once(manager, fake_docker):
+    """Tests that a template is installed once and its tagged image reused."""
+    tags = await asyncio.gather(
+        manager.ensure_template("python:3.12-slim", ["pandas"]),
+        manager.ensure_template("python:3.12-slim", ["pandas"]),
+    )
+    assert tags[0] == tags[1]
+    assert tags[0] in fake_docker.images
+    assert len(fake_docker.containers) == 1
+    assert fake_docker.containers[0].removed
+
+    assert await manager.ensure_template("python:3.12-slim", ["pandas"]) == tags[0]
+    assert len(fake_docker.containers) == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_template_build_removes_container(manager, fake_docker):
+    """Tests that a failed install raises and leaves no container or image."""
+    fake_docker.install_status = 1
+    with pytest.raises(RuntimeError, match="No matching distribution"):
+        await manager.ensure_template("python:3.12-slim", ["missing-package"])
+    assert fake_docker.containers[0].removed
+    assert not fake_docker.images
+
+
+@pytest.mark.asyncio
+async def test_configured_template_starts_sandboxes(fake_docker):
+    """Tests that config.template picks the image for warm and new sandboxes."""
+    config = SandboxSettings(
+        pool_size=1, templates={"data": ["pandas"]}, template="data"
+    )
+    manager = SandboxManager(max_sandboxes=3, config=config)
+    try:
+        await warmed(manager)
+        (tag,) = fake_docker.images
+        assert [sandbox.config.image for sandbox in FakeSandbox.created] == [tag]
+
+        client = LocalSandboxClient(manager)
+        await client.create(config)
+        assert client.sandbox is FakeSandbox.created[0]
+        assert len(fake_docker.containers) == 1
+    finally:
+        await manager.cleanup()
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import signal
+from types import SimpleNamespace
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+import app.tool.bash as bash
+from app.config import BashSettings
+from app.tool.bash import _BashSession, _OutputCapture
+
+
+@pytest.fixture(autouse=True)
+def workspace(tmp_path, monkeypatch):
+    """Captures up to 100 bytes per stream and spills to a temporary workspace."""
+    settings = BashSettings(output_head_bytes=50, output_tail_bytes=50)
+    monkeypatch.setattr(
+        bash, "config", SimpleNamespace(bash_config=settings, workspace_root=tmp_path)
+    )
+    return tmp_path
+
+
+@pytest_asyncio.fixture(scope="function")
+async def session() -> AsyncGenerator[_BashSession, None]:
+    """Creates a started bash session."""
+    session = _BashSession()
+    await session.start()
+    try:
+        yield session
+    finally:
+        # bash runs under a /bin/sh parent, so the whole group is stopped
+        os.killpg(session._process.pid, signal.SIGKILL)
+        await session._process.wait()
+
+
+@pytest.mark.asyncio
+async def test_output_and_exit_code(session):
+    """Tests that both streams and a failing exit code are reported."""
+    result = await session.run("echo out; echo err >&2; false")
+    assert result.output == "out"
+    assert result.error == "err"
+    assert result.system == "exit code 1"
+
+    result = await session.run("cd /tmp && pwd")
+    assert result.output == "/tmp"
+    assert result.system is None
+
+
+@pytest.mark.asyncio
+async def test_output_naming_a_sentinel_does_not_end_the_read(session):
+    """Tests that printing a sentinel-like marker keeps the command's output."""
+    result = await session.run("echo '<<exit>>0'; echo after")
+    assert result.output == "<<exit>>0\nafter"
+
+
+@pytest.mark.asyncio
+async def test_sentinel_split_across_reads(session):
+    """Tests that a sentinel arriving in several small reads is still found."""
+    marker = session._sentinel.encode()
+    stream = asyncio.StreamReader()
+    data = b"line one\nline two\n" + marker + b"3\n"
+    for i in range(0, len(data), 3):
+        stream.feed_data(data[i : i + 3])
+    session._read_size = 3
+
+    received = bytearray()
+    exit_code = await session._read_until_sentinel(stream, received.extend)
+    assert exit_code == "3"
+    assert bytes(received) == b"line one\nline two\n"
+
+
+@pytest.mark.asyncio
+async def test_long_output_keeps_head_and_tail_and_spills(session, workspace):
+    """Tests that long output is cut in the middle and saved in full."""
+    result = await session.run("seq 1 1000")
+    lines = result.output.splitlines()
+    assert lines[0] == "1"
+    assert lines[-1] == "1000"
+    assert "bytes omitted of 3893 bytes, 1000 lines" in result.output
+
+    spilled = list((workspace / "bash_output").glob("*.stdout.log"))
+    assert len(spilled) == 1
+    assert spilled[0].read_text() == "\n".join(map(str, range(1, 1001))) + "\n"
+    assert str(spilled[0]) in result.output
+
+
+@pytest.mark.asyncio
+async def test_old_output_files_are_pruned(session, workspace):
+    """Tests that only the newest spill_max_files output files are kept."""
+    bash.config.bash_config.spill_max_files = 2
+    for _ in range(3):
+        result = await session.run("seq 1 1000")
+
+    spilled = list((workspace / "bash_output").glob("*.log"))
+    assert len(spilled) == 2
+    assert any(str(path) in result.output for path in spilled)
+
+
+@pytest.mark.asyncio
+async def test_short_output_is_not_spilled(session, workspace):
+    """Tests that output within the budget is returned whole without a file."""
+    result = await session.run("seq 1 10")
+    assert result.output == "\n".join(map(str, range(1, 11)))
+    assert not (workspace / "bash_output").exists()
+
+
+def test_capture_without_spill_file():
+    """Tests that the omitted byte count is reported when nothing is saved."""
+    capture = _OutputCapture(head_bytes=4, tail_bytes=4, spill_path=None)
+    for _ in range(5):
+        capture.write(b"abcdef\n")
+    capture.close()
+    assert (
+        capture.text() == "abcd\n[... 27 bytes omitted of 35 bytes, 5 lines ...]\ndef\n"
+    )
@@ -0,0 +1,75 @@
+from typing import List
+
+import pytest
+
+from app.tool.base import BaseTool
+from app.tool.lazy import LazyTool
+from app.tool.snowflake_tool import SnowflakeTool
+
+
+BUILT: List["CountingTool"] = []
+
+
+class CountingTool(BaseTool):
+    """Records every instance built and every cleanup."""
+
+    name: str = "counting"
+    description: str = "Counts its constructions"
+    parameters: dict = {"type": "object", "properties": {"x": {"type": "integer"}}}
+    parallel_safe: bool = True
+    prefix: str = ""
+    cleaned_up: bool = False
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        BUILT.append(self)
+
+    async def execute(self, x: int) -> str:
+        return f"{self.prefix}{x}"
+
+    async def cleanup(self) -> None:
+        self.cleaned_up = True
+
+
+@pytest.fixture(autouse=True)
+def built():
+    """Forgets the tools built by earlier tests."""
+    BUILT.clear()
+    return BUILT
+
+
+def test_schema_is_read_without_building():
+    """Tests that the wrapper lists the tool's schema without constructing it."""
+    tool = LazyTool.of(CountingTool)
+    assert tool.to_param() == CountingTool().to_param()
+    assert tool.parallel_safe
+    assert len(BUILT) == 1 and not tool.is_loaded
+
+
+def test_snowflake_tool_schema_is_available_lazily():
+    """Tests that the Snowflake tool can be listed without creating its agents."""
+    tool = LazyTool.of(SnowflakeTool)
+    assert tool.name == "snowflake"
+    assert tool.parameters["required"] == ["query"]
+    assert not tool.is_loaded
+
+
+@pytest.mark.asyncio
+async def test_tool_is_built_once_on_first_use():
+    """Tests that the first call builds the tool with the given arguments."""
+    tool = LazyTool.of(CountingTool, prefix="#")
+    assert await tool.execute(x=1) == "#1"
+    assert await tool.execute(x=2) == "#2"
+    assert len(BUILT) == 1 and tool.is_loaded
+
+
+@pytest.mark.asyncio
+async def test_cleanup_only_touches_built_tool():
+    """Tests that cleaning up an unused wrapper builds nothing."""
+    tool = LazyTool.of(CountingTool)
+    await tool.cleanup()
+    assert not BUILT
+
+    await tool.execute(x=1)
+    await tool.cleanup()
+    assert BUILT[0].cleaned_up
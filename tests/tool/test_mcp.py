@@ -0,0 +1,179 @@
+import asyncio
+import sys
+import textwrap
+import time
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+
+from app.tool.mcp import MCPClients
+
+
+SERVER = textwrap.dedent(
+    """
+    import os
+    import sys
+
+    import anyio
+    import mcp.types as types
+    from mcp.server.lowlevel import NotificationOptions, Server
+    from mcp.server.stdio import stdio_server
+
+    marker = sys.argv[1]
+    server = Server("test")
+    names = ["echo", "grow", "crash_once"]
+    with open(marker + ".lists", "a"):
+        pass
+
+
+    @server.list_tools()
+    async def list_tools():
+        with open(marker + ".lists", "a") as f:
+            f.write("x")
+        return [
+            types.Tool(name=name, description=name, inputSchema={"type": "object"})
+            for name in names
+        ]
+
+
+    @server.call_tool()
+    async def call_tool(name, arguments):
+        if name == "grow":
+            names.append(f"tool{len(names)}")
+            await server.request_context.session.send_tool_list_changed()
+        elif name == "crash_once" and not os.path.exists(marker):
+            open(marker, "w").close()
+            os._exit(1)
+        return [types.TextContent(type="text", text=f"{name} {arguments}")]
+
+
+    async def main():
+        async with stdio_server() as (read, write):
+            options = server.create_initialization_options(
+                NotificationOptions(tools_changed=True)
+            )
+            await server.run(read, write, options)
+
+
+    anyio.run(main)
+    """
+)
+
+
+@pytest.fixture(scope="function")
+def server_args(tmp_path):
+    """Writes the test MCP server and returns its command line arguments."""
+    script = tmp_path / "server.py"
+    script.write_text(SERVER)
+    return [str(script), str(tmp_path / "crashed")]
+
+
+def list_calls(server_args) -> int:
+    with open(server_args[1] + ".lists") as f:
+        return len(f.read())
+
+
+@pytest_asyncio.fixture(scope="function")
+async def clients(server_args) -> AsyncGenerator[MCPClients, None]:
+    """Creates MCP clients connected to one test server with fast reconnects."""
+    clients = MCPClients()
+    clients.health_check_interval = 0.5
+    clients.ping_timeout = 1.0
+    clients.reconnect_delay = 0.1
+    await clients.connect_stdio(sys.executable, server_args, "test", timeout=30)
+    try:
+        yield clients
+    finally:
+        await clients.disconnect()
+
+
+async def wait_for_reconnect(clients: MCPClients, session, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while clients.sessions.get("test") in (None, session):
+        assert time.monotonic() < deadline, "MCP server did not reconnect"
+        await asyncio.sleep(0.1)
+
+
+@pytest.mark.asyncio
+async def test_connects_to_servers_concurrently(server_args, tmp_path):
+    """Tests that several servers connect at once and a failing one is dropped."""
+    clients = MCPClients()
+    try:
+        results = await asyncio.gather(
+            clients.connect_stdio(sys.executable, server_args, "a", timeout=30),
+            clients.connect_stdio(
+                sys.executable,
+                [str(tmp_path / "server.py"), server_args[1]],
+                "b",
+                timeout=30,
+            ),
+            clients.connect_stdio(
+                sys.executable, ["-c", "import sys; sys.exit(1)"], "broken", timeout=2
+            ),
+            return_exceptions=True,
+        )
+        assert results[:2] == [None, None]
+        assert isinstance(results[2], Exception)
+        assert sorted(clients.connections) == ["a", "b"]
+        assert "mcp_a_echo" in clients.tool_map and "mcp_b_echo" in clients.tool_map
+    finally:
+        await clients.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_listing_is_cached_until_server_reports_change(clients, server_args):
+    """Tests that tools are listed again only after tools/list_changed."""
+    await clients.list_tools()
+    await clients.list_tools()
+    assert list_calls(server_args) == 1
+
+    await clients.execute(name="mcp_test_grow", tool_input={})
+    for _ in range(50):
+        if clients.listings["test"].stale:
+            break
+        await asyncio.sleep(0.1)
+    result = await clients.list_tools()
+    assert "tool3" in [tool.name for tool in result.tools]
+    assert "mcp_test_tool3" in clients.tool_map
+    assert list_calls(server_args) == 2
+
+
+@pytest.mark.asyncio
+async def test_reconnects_after_server_exit(clients):
+    """Tests that a dropped server is reconnected and its tools keep working."""
+    tool = clients.tool_map["mcp_test_echo"]
+    session = clients.sessions["test"]
+
+    result = await clients.execute(name="mcp_test_crash_once", tool_input={})
+    assert result.error
+
+    await wait_for_reconnect(clients, session)
+    assert clients.tool_map["mcp_test_echo"] is tool
+    result = await clients.execute(name="mcp_test_echo", tool_input={"a": 1})
+    assert result.output == "echo {'a': 1}"
+
+
+@pytest.mark.asyncio
+async def test_idempotent_call_is_retried_after_reconnect(clients):
+    """Tests that an idempotent call cut off by a drop runs again on the new session."""
+    clients.tool_map["mcp_test_crash_once"].idempotent = True
+
+    result = await clients.execute(name="mcp_test_crash_once", tool_input={})
+    assert result.output == "crash_once {}"
+
+
+@pytest.mark.asyncio
+async def test_tool_errors_are_not_retried(clients, monkeypatch):
+    """Tests that an error other than a lost connection is reported at once."""
+    tool = clients.tool_map["mcp_test_echo"]
+    tool.idempotent = True
+
+    async def fail(name, arguments):
+        raise ValueError("bad arguments")
+
+    monkeypatch.setattr(tool.session, "call_tool", fail)
+    started = time.monotonic()
+    result = await tool.execute()
+    assert result.error == "Error executing tool: bad arguments"
+    assert time.monotonic() - started < 1
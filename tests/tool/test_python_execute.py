@@ -0,0 +1,98 @@
+import threading
+import time
+
+import pytest
+
+from app.config import PythonExecuteSettings
+from app.tool.python_execute import PythonWorkerPool
+
+
+@pytest.fixture(scope="function")
+def pool():
+    """Creates a one-worker pool without preloaded modules."""
+    pool = PythonWorkerPool(
+        PythonExecuteSettings(
+            pool_size=1,
+            preload_modules=[],
+            acquire_timeout=1.0,
+            session_idle_timeout=0,
+        )
+    )
+    try:
+        yield pool
+    finally:
+        pool.shutdown()
+
+
+def test_run_reuses_worker(pool):
+    """Tests that snippets run on a pooled worker."""
+    assert pool.run("print(1 + 1)", timeout=10) == {
+        "observation": "2\n",
+        "success": True,
+    }
+    assert pool.run("print('again')", timeout=10)["observation"] == "again\n"
+    assert len(pool._workers) == 1
+
+
+def test_acquire_times_out_when_all_workers_busy(pool):
+    """Tests that a caller gives up when no worker frees up in time."""
+    busy = threading.Thread(target=pool.run, args=("import time; time.sleep(3)", 10))
+    busy.start()
+    try:
+        time.sleep(0.5)
+        started = time.monotonic()
+        with pytest.raises(TimeoutError):
+            pool.run("print(1)", timeout=10)
+        assert time.monotonic() - started < 2.5
+    finally:
+        busy.join()
+
+
+def test_acquire_takes_over_freed_slot(pool):
+    """Tests that a slot freed by a failed replacement is not waited on forever."""
+    assert pool._reserve_slot()
+    # Frees the slot as a replacement that failed to start would
+    timer = threading.Timer(0.2, lambda: setattr(pool, "_size", 0))
+    timer.start()
+    try:
+        assert pool.run("print('ok')", timeout=10)["observation"] == "ok\n"
+    finally:
+        timer.cancel()
+
+
+def test_acquire_fails_after_shutdown(pool):
+    """Tests that waiting callers stop waiting when the pool shuts down."""
+    assert pool._reserve_slot()
+    threading.Timer(0.2, pool.shutdown).start()
+    with pytest.raises(RuntimeError):
+        pool.run("print(1)", timeout=10)
+
+
+def test_session_keeps_state(pool):
+    """Tests that globals persist within a session."""
+    pool.settings.session_idle_timeout = 1800
+    pool.run_in_session("s", "x = 41", timeout=10)
+    result = pool.run_in_session("s", "print(x + 1)", timeout=10)
+    assert result["observation"] == "42\n"
+
+
+def test_idle_session_in_use_is_not_evicted(pool):
+    """Tests that eviction skips a session whose worker is busy."""
+    worker = pool._get_session("s")
+    with worker.lock:
+        worker.last_used = 0
+        pool._evict_idle_sessions()
+    assert pool._sessions.get("s") is worker
+
+
+def test_evicted_session_is_restarted(pool):
+    """Tests that a session evicted while idle starts afresh on next use."""
+    pool.run_in_session("s", "x = 1", timeout=10)
+    worker = pool._sessions["s"]
+    worker.last_used = 0
+    pool._evict_idle_sessions()
+    assert "s" not in pool._sessions
+    assert not worker.process.is_alive()
+
+    result = pool.run_in_session("s", "print('x' in globals())", timeout=10)
+    assert result["observation"] == "False\n"
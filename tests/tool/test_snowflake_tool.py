@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from app.tool.snowflake_tool import SnowflakeTool
+
+
+class FakeResult:
+    def __init__(self, sql: str):
+        self.sql = sql
+
+    def __str__(self) -> str:
+        return "1 row"
+
+
+class FakeAgent:
+    """Answers once every agent sharing its barrier has started."""
+
+    def __init__(self, sql: str, barrier: asyncio.Barrier, error: bool = False):
+        self.sql = sql
+        self.barrier = barrier
+        self.error = error
+
+    async def process_query(self, query: str, use_cache: bool = True) -> FakeResult:
+        await asyncio.wait_for(self.barrier.wait(), timeout=5)
+        if self.error:
+            raise RuntimeError(f"{self.sql} failed")
+        return FakeResult(self.sql)
+
+
+def both_tool(org_error: bool = False, person_error: bool = False) -> SnowflakeTool:
+    barrier = asyncio.Barrier(2)
+    tool = SnowflakeTool()
+    tool.org_agent = FakeAgent("SELECT org", barrier, org_error)
+    tool.person_agent = FakeAgent("SELECT person", barrier, person_error)
+    return tool
+
+
+@pytest.mark.asyncio
+async def test_both_authorities_are_queried_concurrently():
+    """Tests that both agents run at once and their answers are merged in order."""
+    result = await both_tool().execute("find acme", agent_type="both")
+    assert result == (
+        "Organization authority results:\nSQL: SELECT org\n1 row\n\n"
+        "Person authority results:\nSQL: SELECT person\n1 row"
+    )
+
+
+@pytest.mark.asyncio
+async def test_one_failed_authority_is_reported_with_the_other():
+    """Tests that one failure is shown next to the other authority's results."""
+    result = await both_tool(person_error=True).execute("find acme", agent_type="both")
+    assert "SQL: SELECT org" in result
+    assert "Person authority results:\nError: SELECT person failed" in result
+
+    with pytest.raises(Exception, match="Both authorities failed"):
+        await both_tool(True, True).execute("find acme", agent_type="both")
@@ -0,0 +1,22 @@
+import pytest
+
+from examples.benchmarks.startup import check, measure
+
+
+@pytest.mark.parametrize(
+    "module", ["app.tool.snowflake_tool", "app.agent.org_authority"]
+)
+def test_import_defers_warehouse_packages(module):
+    """Tests that importing the Snowflake tool loads no warehouse packages."""
+    result = measure(module, runs=1)
+    assert result["deferred_loaded"] == []
+
+
+def test_deferred_packages_fail_without_baseline():
+    """Tests that a deferred package loaded at startup fails the run on its own."""
+    results = {"main": {"median": 1.0, "deferred_loaded": ["pyarrow"]}}
+    assert check(results, baseline={}, tolerance=0.25) == [
+        "main imports pyarrow at startup"
+    ]
+    results["main"]["deferred_loaded"] = []
+    assert check(results, baseline={}, tolerance=0.25) == []
@@ -0,0 +1,109 @@
+from typing import List
+
+import pytest
+
+from app.exceptions import ToolError
+from app.tool.file_operators import LocalFileOperator
+from app.tool.str_replace_editor import StrReplaceEditor
+
+
+class RecordingOperator(LocalFileOperator):
+    """Records which operator calls the editor makes."""
+
+    def __init__(self):
+        self.calls: List[str] = []
+
+    async def read_file(self, path):
+        self.calls.append("read_file")
+        return await super().read_file(path)
+
+    async def write_file(self, path, content):
+        self.calls.append("write_file")
+        return await super().write_file(path, content)
+
+    async def read_files(self, paths):
+        self.calls.append("read_files")
+        contents = {}
+        for path in paths:
+            contents[str(path)] = await super().read_file(path)
+        return contents
+
+    async def write_files(self, files):
+        self.calls.append("write_files")
+        for path, content in files.items():
+            await super().write_file(path, content)
+
+    async def stat_files(self, paths):
+        self.calls.append("stat_files")
+        return await super().stat_files(paths)
+
+
+@pytest.fixture(scope="function")
+def operator(monkeypatch) -> RecordingOperator:
+    """Makes the editor use a recording local operator."""
+    operator = RecordingOperator()
+    monkeypatch.setattr(StrReplaceEditor, "_get_operator", lambda self: operator)
+    return operator
+
+
+@pytest.mark.asyncio
+async def test_edits_read_and_write_once(operator, tmp_path):
+    """Tests that a successful edit is one batch read and one batch write."""
+    path = tmp_path / "a.py"
+    path.write_text("x = 1\ny = 2\n")
+    editor = StrReplaceEditor()
+
+    await editor.execute(
+        command="str_replace", path=str(path), old_str="x = 1", new_str="x = 3"
+    )
+    assert operator.calls == ["read_files", "write_files"]
+
+    operator.calls.clear()
+    await editor.execute(command="insert", path=str(path), insert_line=0, new_str="#")
+    assert operator.calls == ["read_files", "write_files"]
+    assert path.read_text() == "#\nx = 3\ny = 2\n"
+
+    operator.calls.clear()
+    result = await editor.execute(command="view", path=str(path))
+    assert operator.calls == ["read_files"]
+    assert "x = 3" in result
+
+    operator.calls.clear()
+    await editor.execute(command="undo_edit", path=str(path))
+    assert operator.calls == ["stat_files", "write_files"]
+    assert path.read_text() == "x = 3\ny = 2\n"
+
+
+@pytest.mark.asyncio
+async def test_failed_read_reports_path_errors(operator, tmp_path):
+    """Tests that missing paths and directories still get their own errors."""
+    editor = StrReplaceEditor()
+
+    with pytest.raises(ToolError, match="does not exist"):
+        await editor.execute(
+            command="str_replace", path=str(tmp_path / "missing"), old_str="x"
+        )
+    with pytest.raises(ToolError, match="only the `view` command"):
+        await editor.execute(command="str_replace", path=str(tmp_path), old_str="x")
+    with pytest.raises(ToolError, match="not an absolute path"):
+        await editor.execute(command="view", path="relative.txt")
+
+    (tmp_path / "a.txt").write_text("a")
+    operator.calls.clear()
+    result = await editor.execute(command="view", path=str(tmp_path))
+    assert operator.calls == ["read_files", "stat_files"]
+    assert "a.txt" in result
+
+
+@pytest.mark.asyncio
+async def test_create_checks_then_writes(operator, tmp_path):
+    """Tests that create refuses existing files and writes new ones in one call."""
+    path = tmp_path / "new.txt"
+    editor = StrReplaceEditor()
+
+    await editor.execute(command="create", path=str(path), file_text="hello")
+    assert operator.calls == ["stat_files", "write_files"]
+    assert path.read_text() == "hello"
+
+    with pytest.raises(ToolError, match="already exists"):
+        await editor.execute(command="create", path=str(path), file_text="again")
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.config import WarehouseSettings
+from app.warehouse.backends import DuckDBBackend
+from app.warehouse.catalog import SchemaCatalog
+
+
+SCHEMA = """
+Tables:
+    1. `org`
+        - TROAID VARCHAR,
+        - name VARCHAR,
+        - revenue NUMERIC,
+        - is_deleted BOOLEAN
+    2. `org_address`
+        - TROAID VARCHAR,
+        - city VARCHAR
+"""
+
+
+@pytest.fixture(scope="module")
+def backend() -> DuckDBBackend:
+    """Loads the two test tables with 100 synthetic rows each."""
+    backend = DuckDBBackend.from_catalog(
+        SchemaCatalog.from_prompt(SCHEMA), rows_per_table=100
+    )
+    try:
+        yield backend
+    finally:
+        backend.close()
+
+
+@pytest.mark.asyncio
+async def test_snowflake_query_runs_on_local_tables(backend):
+    """Tests that qualified Snowflake SQL runs against the synthetic tables."""
+    result = await backend.execute(
+        "SELECT COUNT(*) AS n FROM PROD_DB.PUBLIC.org WHERE NOT is_deleted",
+        WarehouseSettings(),
+    )
+    assert result.columns == ["n"]
+    assert result.table.column("n").to_pylist() == [90]
+
+
+@pytest.mark.asyncio
+async def test_tables_join_on_shared_ids(backend):
+    """Tests that rows of different tables describe the same entities."""
+    result = await backend.execute(
+        "SELECT o.TROAID FROM org o JOIN org_address a ON a.TROAID = o.TROAID",
+        WarehouseSettings(),
+    )
+    assert result.table.num_rows == 100
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries(backend):
+    """Tests that queries from several threads run side by side."""
+    results = await asyncio.gather(
+        *(
+            backend.execute(f"SELECT {i} AS v FROM org LIMIT 1", WarehouseSettings())
+            for i in range(8)
+        )
+    )
+    assert [r.table.column("v").to_pylist() for r in results] == [[i] for i in range(8)]
+
+
+def test_data_is_reproducible():
+    """Tests that the same seed loads the same rows and key."""
+    catalog = SchemaCatalog.from_prompt(SCHEMA)
+    first = DuckDBBackend.from_catalog(catalog, rows_per_table=10, seed=1)
+    second = DuckDBBackend.from_catalog(catalog, rows_per_table=10, seed=1)
+    other = DuckDBBackend.from_catalog(catalog, rows_per_table=10, seed=2)
+
+    sql = "SELECT revenue FROM org"
+    assert first.run_query(sql).table == second.run_query(sql).table
+    assert first.run_query(sql).table != other.run_query(sql).table
+    assert first.key == second.key != other.key
+
+
+def test_get_backend_is_shared():
+    """Tests that one backend is loaded per catalog and options."""
+    catalog = SchemaCatalog.from_prompt(SCHEMA)
+    backend = DuckDBBackend.get_backend(catalog, name="shared", rows_per_table=5)
+    assert DuckDBBackend.get_backend(catalog, name="shared", rows_per_table=5) is (
+        backend
+    )
+    assert DuckDBBackend.get_backend(catalog, name="shared", rows_per_table=6) is not (
+        backend
+    )
@@ -0,0 +1,99 @@
+import pytest
+
+from app.warehouse.catalog import SchemaCatalog, tokenize
+
+
+SCHEMA = """You write Snowflake SQL.
+Tables:
+    1. `person`
+        - person_id INT,
+        - full_name VARCHAR
+    2. `address`
+        - person_id INT,
+        - city VARCHAR,
+        - street VARCHAR
+    3. `phone`
+        - person_id INT,
+        - phone_number VARCHAR
+    4. `employer`
+        - employer_id INT,
+        - company_name VARCHAR
+Relationships:
+    - `address`.person_id references `person`.person_id
+    - `phone`.person_id references `person`.person_id
+Here are some critical rules:
+    - Only use the tables above.
+Examples:
+    SQL1: Find the city of a person
+        SELECT a.city FROM person p JOIN address a ON a.person_id = p.person_id
+    SQL2: Find the employer of a company
+        SELECT company_name FROM employer
+Answer with SQL only.
+"""
+
+
+@pytest.fixture(scope="function")
+def catalog() -> SchemaCatalog:
+    """Parses the test schema with `person` always kept."""
+    return SchemaCatalog.from_prompt(SCHEMA, pinned_tables=["person"])
+
+
+def test_prompt_is_parsed_into_sections(catalog):
+    """Tests that tables, relationships, examples and the epilogue are split out."""
+    assert [table.name for table in catalog.tables] == [
+        "person",
+        "address",
+        "phone",
+        "employer",
+    ]
+    assert [column.name for column in catalog.tables[1].columns] == [
+        "person_id",
+        "city",
+        "street",
+    ]
+    assert catalog.relationships[0].tables == {"address", "person"}
+    assert catalog.examples[0].tables == {"person", "address"}
+    assert catalog.epilogue == ["Answer with SQL only."]
+
+
+def test_prompt_keeps_only_relevant_tables(catalog):
+    """Tests that the pruned prompt holds matching and pinned tables only."""
+    prompt = catalog.build_prompt("What city does the person live in?", 1, 1)
+
+    assert "`address`" in prompt and "`person`" in prompt
+    assert "3. `phone`" not in prompt and "`employer`" not in prompt
+    assert "`address`.person_id references" in prompt
+    assert "SQL1: Find the city" in prompt and "SQL2" not in prompt
+    assert prompt.startswith("You write Snowflake SQL.\nTables:")
+    assert prompt.endswith("Answer with SQL only.")
+
+
+def test_tables_of_chosen_examples_are_kept():
+    """Tests that an example's tables are added so the example stays valid."""
+    catalog = SchemaCatalog.from_prompt(SCHEMA)
+    assert [t.name for t in catalog.select_tables("Show the city", 1)] == ["address"]
+
+    prompt = catalog.build_prompt("Show the city", top_k_tables=1, top_k_examples=1)
+    assert "1. `person`" in prompt and "2. `address`" in prompt
+
+
+def test_unmatched_question_uses_full_prompt(catalog):
+    """Tests that a question matching no table gets the whole prompt."""
+    assert catalog.build_prompt("How is the weather?", 1, 1) == SCHEMA
+
+
+def test_unstructured_prompt_is_used_whole():
+    """Tests that a prompt without a Tables section is never pruned."""
+    catalog = SchemaCatalog.from_prompt("Query the warehouse.")
+    assert not catalog.is_structured
+    assert catalog.build_prompt("city of a person") == "Query the warehouse."
+
+
+def test_tokenize_reduces_plurals():
+    """Tests that plural words match their singular table names."""
+    assert tokenize("Addresses, cities and phones") == [
+        "address",
+        "city",
+        "and",
+        "phone",
+    ]
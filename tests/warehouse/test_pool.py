@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from app.warehouse.pool import SnowflakeConnectionPool, _PooledConnection
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(scope="function")
+def pool(monkeypatch) -> SnowflakeConnectionPool:
+    """Creates a one-connection pool that opens fake connections."""
+    pool = SnowflakeConnectionPool("test", {}, max_size=1, acquire_timeout=10)
+    monkeypatch.setattr(pool, "_open", lambda: _PooledConnection(FakeConnection()))
+    try:
+        yield pool
+    finally:
+        pool.close()
+
+
+def test_idle_connection_is_reused(pool):
+    """Tests that a released connection is handed out again."""
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+
+def test_waiter_takes_slot_of_discarded_connection(pool):
+    """Tests that a caller waiting on a full pool opens a connection once one is dropped."""
+    acquired = []
+
+    with pool.connection() as conn:
+        waiter = threading.Thread(target=lambda: acquired.append(pool._acquire().conn))
+        waiter.start()
+        time.sleep(0.2)
+        # A closed connection is discarded on release instead of going back idle
+        conn.close()
+        released = time.monotonic()
+
+    waiter.join(timeout=10)
+    assert acquired and acquired[0] is not conn
+    assert time.monotonic() - released < 2
+
+
+def test_acquire_times_out_when_pool_is_full(pool):
+    """Tests that a caller gives up once acquire_timeout passes."""
+    pool.acquire_timeout = 0.3
+    with pool.connection():
+        with pytest.raises(TimeoutError):
+            pool._acquire()
+
+
+def test_waiter_fails_when_pool_closes(pool):
+    """Tests that waiting callers stop waiting when the pool is closed."""
+    with pool.connection():
+        threading.Timer(0.2, pool.close).start()
+        with pytest.raises(RuntimeError, match="is closed"):
+            pool._acquire()
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import app.warehouse.result_cache as result_cache
+import app.warehouse.results as results
+from app.config import WarehouseSettings
+from app.warehouse.result_cache import ResultCache
+from app.warehouse.results import QueryResult
+
+
+SQL = "SELECT id FROM t"
+
+
+@pytest.fixture(scope="function")
+def cache(tmp_path, monkeypatch) -> ResultCache:
+    """Creates a cache holding a 1000-row result, with a temporary workspace."""
+    settings = WarehouseSettings(max_memory_bytes=1000)
+    monkeypatch.setattr(results, "config", SimpleNamespace(workspace_root=tmp_path))
+    monkeypatch.setattr(
+        result_cache, "config", SimpleNamespace(warehouse_config=settings)
+    )
+    cache = ResultCache(tmp_path / "results")
+    table = pa.table({"id": list(range(1000))})
+    cache.put("org", QueryResult(sql=SQL, table=table, total_rows=1000))
+    return cache
+
+
+def spilled_files(tmp_path):
+    return list((tmp_path / "query_results").glob("*.parquet"))
+
+
+def test_hit_uses_configured_settings(cache):
+    """Tests that a hit without explicit settings uses the configured budget."""
+    result = cache.get("org", SQL)
+
+    assert result.table.num_rows < 1000
+    assert result.total_rows == 1000
+    assert not result.truncated
+
+
+def test_hit_links_cached_file_instead_of_spilling(cache, tmp_path):
+    """Tests that rows beyond the memory budget are served from the cached file."""
+    result = cache.get("org", SQL)
+
+    assert spilled_files(tmp_path) == [result.parquet_path]
+    assert (
+        result.parquet_path.stat().st_ino
+        == cache._path(cache.cache_key("org", SQL)).stat().st_ino
+    )
+    assert pq.read_table(result.parquet_path).num_rows == 1000
+
+
+def test_hit_links_are_pruned(cache, tmp_path):
+    """Tests that repeated hits keep at most spill_max_files links."""
+    settings = WarehouseSettings(max_memory_bytes=1000, spill_max_files=2)
+    paths = [cache.get("org", SQL, settings).parquet_path for _ in range(4)]
+
+    assert len(spilled_files(tmp_path)) == 2
+    assert paths[-1] in spilled_files(tmp_path)
+
+
+def test_hit_survives_eviction(cache):
+    """Tests that the result of a hit stays readable after its entry is evicted."""
+    result = cache.get("org", SQL)
+    cache.clear()
+
+    assert pq.read_table(result.parquet_path).num_rows == 1000
+
+
+def test_hit_honours_explicit_settings(cache, tmp_path):
+    """Tests that explicit settings override the configured budget."""
+    result = cache.get("org", SQL, WarehouseSettings(max_rows=100))
+    assert result.table.num_rows == 100
+    assert result.truncated
+    assert result.parquet_path is None
+
+    result = cache.get(
+        "org", SQL, WarehouseSettings(max_memory_bytes=1000, spill_to_parquet=False)
+    )
+    assert result.truncated
+    assert result.parquet_path is None
+    assert not spilled_files(tmp_path)
+
+
+def test_miss_and_canonical_hit(cache):
+    """Tests that keys ignore case and whitespace but not the profile."""
+    assert cache.get("org", "select  id from T;") is not None
+    assert cache.get("person", SQL) is None
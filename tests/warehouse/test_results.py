@@ -0,0 +1,75 @@
+import os
+from types import SimpleNamespace
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+import app.warehouse.results as results
+from app.config import WarehouseSettings
+from app.warehouse.results import ResultCollector, prune_spill_dir
+
+
+@pytest.fixture(autouse=True)
+def workspace(tmp_path, monkeypatch):
+    """Points spilled results at a temporary workspace."""
+    monkeypatch.setattr(results, "config", SimpleNamespace(workspace_root=tmp_path))
+    return tmp_path
+
+
+def batch(start: int, rows: int) -> pa.Table:
+    return pa.table({"id": list(range(start, start + rows))})
+
+
+def test_small_result_is_not_spilled(workspace):
+    """Tests that a result within the memory budget writes no file."""
+    collector = ResultCollector("SELECT 1", WarehouseSettings())
+    collector.add(batch(0, 1))
+    result = collector.finish()
+
+    assert result.parquet_path is None
+    assert result.table.num_rows == 1
+    assert not (workspace / "query_results").exists()
+
+
+def test_large_result_spills_every_row(workspace):
+    """Tests that outgrowing the memory budget spills all fetched rows."""
+    settings = WarehouseSettings(max_memory_bytes=1000)
+    collector = ResultCollector("SELECT id", settings)
+    for start in range(0, 1000, 100):
+        assert collector.add(batch(start, 100))
+    result = collector.finish()
+
+    assert result.total_rows == 1000
+    assert result.table.num_rows < 1000
+    assert not result.truncated
+    spilled = pq.read_table(result.parquet_path)
+    assert spilled.column("id").to_pylist() == list(range(1000))
+
+
+def test_large_result_without_spill_is_truncated(workspace):
+    """Tests that fetching stops at the memory budget when spilling is off."""
+    settings = WarehouseSettings(max_memory_bytes=1000, spill_to_parquet=False)
+    collector = ResultCollector("SELECT id", settings)
+    assert not collector.add(batch(0, 1000))
+    result = collector.finish()
+
+    assert result.truncated
+    assert result.parquet_path is None
+
+
+def test_prune_keeps_newest_files(tmp_path):
+    """Tests that the oldest spilled results are removed first."""
+    for index in range(5):
+        path = tmp_path / f"query_{index}.parquet"
+        path.write_bytes(b"x" * 10)
+        os.utime(path, (index, index))
+
+    prune_spill_dir(tmp_path, max_files=2, max_bytes=0)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "query_3.parquet",
+        "query_4.parquet",
+    ]
+
+    prune_spill_dir(tmp_path, max_files=0, max_bytes=5)
+    assert [p.name for p in tmp_path.iterdir()] == ["query_4.parquet"]
@@ -0,0 +1,84 @@
+import pytest
+
+from app.warehouse.sql_cache import SQLCache, normalize_question, question_literals
+
+
+@pytest.fixture(scope="function")
+def cache(tmp_path) -> SQLCache:
+    """Creates an exact-match cache in a temporary directory."""
+    return SQLCache(tmp_path / "sql_cache.db")
+
+
+def test_non_ascii_questions_keep_distinct_keys(cache):
+    """Tests that questions in other scripts do not collapse to one key."""
+    assert normalize_question("查找张三的地址") != normalize_question("查找李四的电话")
+
+    cache.put("查找张三的地址", "person", "schema", "SELECT address")
+    assert cache.get("查找李四的电话", "person", "schema") is None
+    assert cache.get("查找张三的地址", "person", "schema") == "SELECT address"
+
+
+def test_normalization_folds_case_and_width(cache):
+    """Tests that case and full-width forms map to the same key."""
+    assert normalize_question("Ｓｈｏｗ  ORDERS!") == normalize_question("show orders")
+
+
+def test_empty_key_is_never_stored_or_looked_up(cache):
+    """Tests that questions without words neither hit nor get cached."""
+    cache.put("???", "person", "schema", "SELECT 1")
+    assert cache.get("!!!", "person", "schema") is None
+    assert cache._conn.execute("SELECT COUNT(*) FROM nl_sql_cache").fetchone()[0] == 0
+
+
+def test_fuzzy_matching_is_off_by_default(cache):
+    """Tests that a near-identical question misses without opting in."""
+    cache.put("list the orders of john from last week", "org", "schema", "SELECT a")
+    assert cache.get("list the orders of jane from last week", "org", "schema") is None
+
+
+def test_fuzzy_hit_requires_same_literals(tmp_path):
+    """Tests that fuzzy hits never swap names, numbers or quoted strings."""
+    words = " ".join(f"word{i}" for i in range(18))
+    cache = SQLCache(tmp_path / "sql_cache.db", similarity=0.8)
+    cache.put(f"show {words} for John in 2023", "org", "schema", "SELECT john")
+
+    assert cache.get(f"show {words} for Jane in 2023", "org", "schema") is None
+    assert cache.get(f"show {words} for John in 2024", "org", "schema") is None
+    assert (
+        cache.get(f"please show {words} for John in 2023", "org", "schema")
+        == "SELECT john"
+    )
+
+
+def test_question_literals():
+    """Tests extraction of quoted strings, numbers and proper nouns."""
+    assert question_literals("Which orders did 'ACME Corp' place in 2023?") == [
+        "2023",
+        "acme corp",
+    ]
+    assert question_literals("Show the address of John Smith") == ["john", "smith"]
+    assert question_literals("List all orders. Sort by date") == []
+
+
+def test_operators_and_signs_keep_distinct_keys(cache):
+    """Tests that questions differing only in a comparison or sign do not collide."""
+    assert normalize_question("amount > 100") != normalize_question("amount < 100")
+    assert normalize_question("balance of -5") != normalize_question("balance of 5")
+
+    cache.put("orders with amount > 100", "org", "schema", "SELECT gt")
+    assert cache.get("orders with amount < 100", "org", "schema") is None
+    assert cache.get("orders with amount > 100", "org", "schema") == "SELECT gt"
+
+
+def test_fuzzy_hit_requires_same_comparison(tmp_path):
+    """Tests that a fuzzy hit never swaps a comparison or the sign of a number."""
+    words = " ".join(f"word{i}" for i in range(18))
+    cache = SQLCache(tmp_path / "sql_cache.db", similarity=0.8)
+    cache.put(f"show {words} with amount >= 100", "org", "schema", "SELECT ge")
+
+    assert cache.get(f"show {words} with amount <= 100", "org", "schema") is None
+    assert cache.get(f"show {words} with amount >= -100", "org", "schema") is None
+    assert (
+        cache.get(f"please show {words} with amount >= 100", "org", "schema")
+        == "SELECT ge"
+    )
@@ -0,0 +1,63 @@
+import pytest
+
+from app.warehouse.catalog import SchemaCatalog
+from app.warehouse.validation import SQLValidationError, SQLValidator
+
+
+SCHEMA = """
+Tables:
+    1. `orders`
+        - id INT,
+        - customer_id INT,
+        - amount DECIMAL
+    2. `customers`
+        - id INT,
+        - name VARCHAR
+"""
+
+
+@pytest.fixture(scope="module")
+def validator() -> SQLValidator:
+    """Creates a validator for a two-table catalog."""
+    return SQLValidator(SchemaCatalog.from_prompt(SCHEMA))
+
+
+def test_select_passes(validator):
+    """Tests that a read-only query over known tables passes."""
+    validator.validate(
+        "SELECT c.name, SUM(o.amount) AS total FROM orders o "
+        "JOIN customers c ON c.id = o.customer_id GROUP BY c.name"
+    )
+
+
+@pytest.mark.parametrize(
+    "sql",
+    ["SHOW TABLES", "SHOW TABLES IN SCHEMA db.other", "DESCRIBE TABLE orders"],
+)
+def test_metadata_statements_pass(validator, sql):
+    """Tests that read-only metadata statements are allowed."""
+    validator.validate(sql)
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "DELETE FROM orders",
+        "DROP TABLE orders",
+        "USE DATABASE other",
+        "DESCRIBE INSERT INTO orders VALUES (1, 1, 1)",
+    ],
+)
+def test_writes_and_context_switches_are_fatal(validator, sql):
+    """Tests that statements changing data or session context are refused."""
+    with pytest.raises(SQLValidationError) as error:
+        validator.validate(sql)
+    assert error.value.fatal
+
+
+def test_unknown_names_are_repairable(validator):
+    """Tests that schema errors suggest fixes instead of refusing the query."""
+    with pytest.raises(SQLValidationError) as error:
+        validator.validate("SELECT amout FROM order")
+    assert not error.value.fatal
+    assert error.value.errors[0] == "Unknown table 'order' (did you mean 'orders'?)"